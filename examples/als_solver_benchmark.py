@@ -0,0 +1,90 @@
+"""Compare convergence and wall time of the ALS solvers on implicit feedback.
+
+usage: python als_solver_benchmark.py --embed_size 256 --n_threads 4
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from libreco.algorithms._als import als_update
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_users", type=int, default=20000)
+    parser.add_argument("--n_items", type=int, default=5000)
+    parser.add_argument("--nnz", type=int, default=500000)
+    parser.add_argument("--embed_size", type=int, default=256)
+    parser.add_argument("--block_size", type=int, default=32)
+    parser.add_argument("--n_epochs", type=int, default=8)
+    parser.add_argument("--reg", type=float, default=5.0)
+    parser.add_argument("--alpha", type=float, default=10.0)
+    parser.add_argument("--n_threads", type=int, default=1)
+    return parser.parse_args()
+
+
+def implicit_loss(interaction, X, Y, reg):
+    """Weighted squared loss over all the user-item pairs plus regularization."""
+    coo = interaction.tocoo()
+    preds = np.einsum("ij,ij->i", X[coo.row], Y[coo.col])
+    confidence = coo.data
+    # loss of all pairs as negatives, then correct the observed pairs
+    loss = np.sum((X.T @ X) * (Y.T @ Y))
+    loss += np.sum(confidence * (1 - preds) ** 2 - preds**2)
+    loss += reg * (np.sum(X**2) + np.sum(Y**2))
+    return loss / interaction.shape[0]
+
+
+def run(name, solver_kwargs, user_interaction, item_interaction, args):
+    np_rng = np.random.default_rng(42)
+    X = np_rng.normal(0.0, 0.01, (args.n_users, args.embed_size)).astype(np.float32)
+    Y = np_rng.normal(0.0, 0.01, (args.n_items, args.embed_size)).astype(np.float32)
+    elapsed = 0.0
+    for epoch in range(1, args.n_epochs + 1):
+        start = time.perf_counter()
+        als_update(
+            user_interaction,
+            X,
+            Y,
+            args.reg,
+            "ranking",
+            num_threads=args.n_threads,
+            **solver_kwargs,
+        )
+        als_update(
+            item_interaction,
+            Y,
+            X,
+            args.reg,
+            "ranking",
+            num_threads=args.n_threads,
+            **solver_kwargs,
+        )
+        elapsed += time.perf_counter() - start
+        loss = implicit_loss(user_interaction, X, Y, args.reg)
+        print(f"{name:<12} epoch {epoch:>2}  time {elapsed:8.2f}s  loss {loss:.4f}")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    rng = np.random.default_rng(0)
+    users = rng.integers(0, args.n_users, args.nnz)
+    # popular items are sampled more often
+    items = np.minimum(rng.zipf(1.2, args.nnz) - 1, args.n_items - 1)
+    user_interaction = csr_matrix(
+        (np.ones(args.nnz, dtype=np.float32), (users, items)),
+        shape=(args.n_users, args.n_items),
+        dtype=np.float32,
+    )
+    user_interaction.data = user_interaction.data * args.alpha + 1
+    item_interaction = user_interaction.T.tocsr()
+
+    solvers = {
+        "exact": {"use_cg": False},
+        "cg": {"use_cg": True},
+        "subspace": {"block_size": args.block_size},
+    }
+    for solver_name, kwargs in solvers.items():
+        run(solver_name, kwargs, user_interaction, item_interaction, args)
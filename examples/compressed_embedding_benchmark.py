@@ -0,0 +1,88 @@
+"""Compare memory and quality of full and compressed embedding tables.
+
+usage: python compressed_embedding_benchmark.py --model DeepFM --n_epochs 5
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+from libreco.algorithms import DIN, DeepFM, WideDeep
+from libreco.data import DatasetFeat, split_by_ratio_chrono
+from libreco.evaluation import evaluate
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--model", default="DeepFM", choices=["DeepFM", "WideDeep", "DIN"]
+    )
+    parser.add_argument(
+        "--data", default="../tests/sample_data/sample_movielens_merged.csv"
+    )
+    parser.add_argument("--embed_size", type=int, default=16)
+    parser.add_argument("--n_epochs", type=int, default=5)
+    parser.add_argument("--ratio", type=int, default=4, help="table compression ratio")
+    return parser.parse_args()
+
+
+def embedding_bytes(model):
+    """Bytes of all the embedding variables and their two Adam slots."""
+    n_params = sum(
+        np.prod(v.get_shape().as_list())
+        for v in tf.compat.v1.trainable_variables("embedding")
+    )
+    return n_params * 4 * 3
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    data = pd.read_csv(args.data, sep=",", header=0)
+    train_data, eval_data = split_by_ratio_chrono(data, test_size=0.2)
+    train_data, data_info = DatasetFeat.build_trainset(
+        train_data,
+        user_col=["sex", "age", "occupation"],
+        item_col=["genre1", "genre2", "genre3"],
+        sparse_col=["sex", "occupation", "genre1", "genre2", "genre3"],
+        dense_col=["age"],
+    )
+    eval_data = DatasetFeat.build_testset(eval_data)
+    n_users, n_items = data_info.n_users, data_info.n_items
+
+    settings = {
+        "full": None,
+        "hash": {
+            "user": {"method": "hash", "num_buckets": n_users // args.ratio},
+            "item": {"method": "hash", "num_buckets": n_items // args.ratio},
+        },
+        "qr": {
+            "user": {"method": "qr", "num_buckets": n_users // args.ratio},
+            "item": {"method": "qr", "num_buckets": n_items // args.ratio},
+        },
+    }
+    model_cls = {"DeepFM": DeepFM, "WideDeep": WideDeep, "DIN": DIN}[args.model]
+    for name, embed_compression in settings.items():
+        tf.compat.v1.reset_default_graph()
+        model = model_cls(
+            "ranking",
+            data_info,
+            embed_size=args.embed_size,
+            n_epochs=args.n_epochs,
+            lr=1e-3,
+            batch_size=2048,
+            embed_compression=embed_compression,
+        )
+        model.fit(train_data, neg_sampling=True, verbose=0)
+        result = evaluate(
+            model,
+            eval_data,
+            neg_sampling=True,
+            metrics=["roc_auc", "recall", "ndcg"],
+            k=10,
+            seed=2222,
+        )
+        metrics = "  ".join(f"{k} {v:.4f}" for k, v in result.items())
+        print(
+            f"{name:<5} embedding memory {embedding_bytes(model) / 1e6:6.2f}MB  {metrics}"
+        )
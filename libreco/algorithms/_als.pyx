@@ -44,55 +44,86 @@ cdef inline void scal(int *n, float *sa, float *sx, int *incx) nogil:
     cython_blas.sscal(n, sa, sx, incx)
 
 
-def als_update(interaction, X, Y, reg, task, use_cg=True, num_threads=1, cg_steps=3):
-    if task == "rating" and use_cg:
-        _least_squares_cg(
-            interaction.indices,
-            interaction.indptr,
-            interaction.data,
-            X,
-            Y,
-            reg,
-            num_threads,
-            0,
-            cg_steps,
-        )
-    elif task == "rating" and not use_cg:
-        _least_squares(
+def als_update(
+    interaction,
+    X,
+    Y,
+    reg,
+    task,
+    use_cg=True,
+    num_threads=1,
+    cg_steps=3,
+    gram=None,
+    rows=None,
+    block_size=None,
+):
+    """Solve every row of ``X`` with ``Y`` fixed.
+
+    ``gram`` is the precomputed ``Y.T @ Y`` for the ranking task, which can be
+    reused when ``Y`` doesn't change, e.g. folding in new users.
+    ``rows`` restricts the update to these row indices, and the other rows of
+    ``X`` are left untouched.
+    If ``block_size`` is given, each row makes one pass of block coordinate descent
+    over its dimensions instead, and ``use_cg`` is ignored.
+    """
+    implicit = 1 if task == "ranking" else 0
+    initialA = _initial_A(Y, reg, implicit, gram)
+    if rows is None:
+        rows = np.arange(X.shape[0], dtype=np.intc)
+    else:
+        rows = np.ascontiguousarray(rows, dtype=np.intc)
+    if block_size is not None:
+        row_lens = np.diff(interaction.indptr)[rows]
+        max_len = row_lens.max() if len(row_lens) > 0 else 0
+        _least_squares_subspace(
             interaction.indices,
             interaction.indptr,
             interaction.data,
             X,
             Y,
-            reg,
+            initialA,
+            rows,
             num_threads,
-            0,
+            implicit,
+            min(block_size, X.shape[1]),
+            max(max_len, 1),
         )
-    elif task == "ranking" and use_cg:
+    elif use_cg:
         _least_squares_cg(
             interaction.indices,
             interaction.indptr,
             interaction.data,
             X,
             Y,
-            reg,
+            initialA,
+            rows,
             num_threads,
-            1,
+            implicit,
             cg_steps,
         )
-    elif task == "ranking" and not use_cg:
+    else:
         _least_squares(
             interaction.indices,
             interaction.indptr,
             interaction.data,
             X,
             Y,
-            reg,
+            initialA,
+            rows,
             num_threads,
-            1,
+            implicit,
         )
 
 
+def _initial_A(Y, reg, implicit, gram):
+    embed_size = Y.shape[1]
+    if not implicit:
+        return reg * np.eye(embed_size, dtype=np.single)
+    if gram is None:
+        gram = np.dot(np.transpose(Y), Y)
+    return (gram + reg * np.eye(embed_size, dtype=np.single)).astype(np.single)
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.cdivision(True)
@@ -102,19 +133,15 @@ cdef void _least_squares(
     const float[:] data,
     float[:, ::1] X,
     float[:, ::1] Y,
-    double reg,
+    float[:, ::1] initialA,
+    const int[:] rows,
     int num_threads,
     int implicit,
 ):
-    cdef int n_x = X.shape[0], embed_size = X.shape[1]
-    cdef int m, i, j, index, err, one = 1
+    cdef int n_rows = rows.shape[0], embed_size = X.shape[1]
+    cdef int t, m, i, j, index, err, one = 1
     cdef float rating, confidence, temp
 
-    cdef float[:, ::1] initialA
-    if implicit > 0:
-        initialA = np.dot(np.transpose(Y), Y) + reg * np.eye(embed_size, dtype=np.single)
-    else:
-        initialA = reg * np.eye(embed_size, dtype=np.single)
     cdef float[:] initialB = np.zeros(embed_size, dtype=np.single)
     cdef float *A
     cdef float *b
@@ -123,7 +150,8 @@ cdef void _least_squares(
         A = <float *> malloc(sizeof(float) * embed_size * embed_size)
         b = <float *> malloc(sizeof(float) * embed_size)
         try:
-            for m in prange(n_x, schedule="guided"):
+            for t in prange(n_rows, schedule="guided"):
+                m = rows[t]
                 memcpy(A, &initialA[0, 0], sizeof(float) * embed_size * embed_size)
                 memcpy(b, &initialB[0], sizeof(float) * embed_size)
 
@@ -173,22 +201,17 @@ cdef void _least_squares_cg(
     const float[:] data,
     float[:, ::1] X,
     float[:, ::1] Y,
-    double reg,
+    float[:, ::1] initialA,
+    const int[:] rows,
     int num_threads,
     int implicit,
     int cg_steps,
 ):
-    cdef int n_x = X.shape[0], embed_size = X.shape[1]
-    cdef int m, i, j, index, err, one = 1
+    cdef int n_rows = rows.shape[0], embed_size = X.shape[1]
+    cdef int t, m, i, j, index, err, one = 1
     cdef float rating, confidence, temp, rsold, rsnew, ak
     cdef float zero = 0.0
 
-    cdef float[:, ::1] initialA
-    if implicit > 0:
-        initialA = YtY = np.dot(np.transpose(Y), Y) + reg * np.eye(embed_size, dtype=np.single)
-    else:
-        initialA = reg * np.eye(embed_size, dtype=np.single)
-
     cdef float *x
     cdef float *p
     cdef float *r
@@ -199,7 +222,8 @@ cdef void _least_squares_cg(
         p = <float *> malloc(sizeof(float) * embed_size)
         r = <float *> malloc(sizeof(float) * embed_size)
         try:
-            for m in prange(n_x, schedule="guided"):
+            for t in prange(n_rows, schedule="guided"):
+                m = rows[t]
                 x = &X[m, 0]
 
                 temp = -1.0
@@ -266,3 +290,94 @@ cdef void _least_squares_cg(
             free(Ap)
             free(p)
             free(r)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _least_squares_subspace(
+    const int[:] indices,
+    const int[:] indptr,
+    const float[:] data,
+    float[:, ::1] X,
+    float[:, ::1] Y,
+    float[:, ::1] initialA,
+    const int[:] rows,
+    int num_threads,
+    int implicit,
+    int block_size,
+    int max_len,
+):
+    """Update the dimensions of each row block by block, as in iALS++.
+
+    Every block solves a ``block_size`` x ``block_size`` system with the other
+    dimensions fixed, and the predictions of interacted items are cached and updated
+    after each block, so a pass costs O(nnz * d * block_size) instead of O(nnz * d^2).
+    """
+    cdef int n_rows = rows.shape[0], embed_size = X.shape[1]
+    cdef int t, m, i, j, k, s, bs, index, err, one = 1
+    cdef float confidence, weight, temp
+
+    cdef float *A
+    cdef float *r
+    cdef float *preds
+    cdef float *x
+
+    with nogil, parallel(num_threads=num_threads):
+        A = <float *> malloc(sizeof(float) * block_size * block_size)
+        r = <float *> malloc(sizeof(float) * block_size)
+        preds = <float *> malloc(sizeof(float) * max_len)
+        try:
+            for t in prange(n_rows, schedule="guided"):
+                m = rows[t]
+                x = &X[m, 0]
+                for index in range(indptr[m], indptr[m+1]):
+                    i = indices[index]
+                    preds[index - indptr[m]] = dot(&embed_size, &Y[i, 0], &one, x, &one)
+
+                s = 0
+                while s < embed_size:
+                    bs = block_size if s + block_size <= embed_size else embed_size - s
+                    # A_bb = (YtY + lambdaI)_bb  or  (lambdaI)_bb
+                    for j in range(bs):
+                        memcpy(A + j * bs, &initialA[s + j, s], sizeof(float) * bs)
+                    # r_b = -(YtY + lambdaI)_b @ x  or  -(lambdaI)_b @ x
+                    for j in range(bs):
+                        r[j] = -dot(&embed_size, &initialA[s + j, 0], &one, x, &one)
+
+                    for index in range(indptr[m], indptr[m+1]):
+                        i = indices[index]
+                        k = index - indptr[m]
+                        if implicit > 0:
+                            confidence = data[index]
+                            # r_b += (c - (c-1)y @ x) * y_b
+                            temp = confidence - (confidence - 1) * preds[k]
+                            weight = confidence - 1
+                        else:
+                            # r_b += (rating - y @ x) * y_b
+                            temp = data[index] - preds[k]
+                            weight = 1.0
+                        axpy(&bs, &temp, &Y[i, s], &one, r, &one)
+                        # A_bb += (c-1) * y_b @ y_b^T  or  y_b @ y_b^T
+                        for j in range(bs):
+                            temp = weight * Y[i, s + j]
+                            axpy(&bs, &temp, &Y[i, s], &one, A + j * bs, &one)
+
+                    err = 0
+                    # solve A_bb @ delta = r_b, then x_b += delta
+                    posv("U", &bs, &one, A, &bs, r, &bs, &err)
+                    if err:
+                        with gil:
+                            raise ValueError(f"cython_lapack.posv failed (err={err}) on row {m}. "
+                                              "Try increasing the regularization parameter.")
+                    temp = 1.0
+                    axpy(&bs, &temp, r, &one, x + s, &one)
+                    for index in range(indptr[m], indptr[m+1]):
+                        i = indices[index]
+                        preds[index - indptr[m]] += dot(&bs, &Y[i, s], &one, r, &one)
+                    s = s + bs
+
+        finally:
+            free(A)
+            free(r)
+            free(preds)
@@ -2,7 +2,8 @@
 cimport cython
 
 from cython.parallel import parallel, prange
-from libc.math cimport exp as cexp, pow as cpow, sqrt as csqrt
+from cython.parallel cimport threadid
+from libc.math cimport exp as cexp, log as clog, pow as cpow, sqrt as csqrt
 from libcpp cimport bool
 from libcpp.algorithm cimport binary_search
 from libcpp.vector cimport vector
@@ -24,6 +25,74 @@ cdef bool check_consumed(const int[:] indices, const int[:] indptr,  int user, i
     return binary_search(&indices[indptr[user]], &indices[indptr[user+1]], item_neg)
 
 
+cdef struct NegSample:
+    long item
+    float weight
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef inline float score(float[:, ::1] user_embed, float[:, ::1] item_embed, long user, long item) nogil:
+    cdef Py_ssize_t j
+    cdef float res = 0
+    for j in range(user_embed.shape[1]):
+        res = res + user_embed[user, j] * item_embed[item, j]
+    return res
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef NegSample sample_negative(
+    const int[:] sparse_indices,
+    const int[:] sparse_indptr,
+    float[:, ::1] user_embed,
+    float[:, ::1] item_embed,
+    long user,
+    long item_pos,
+    int num_candidates,
+    int warp,
+    int n_items,
+    mt19937 *rng,
+    uniform_int_distribution[long] *dist,
+) nogil:
+    """Sample an unconsumed negative item for a positive pair.
+
+    In `warp` mode, candidates are sampled until one violates the margin, and the
+    weight approximates the log rank of the positive item. If no violating item is
+    found after ``num_candidates`` trials, the returned item is -1.
+    Otherwise the highest scored one of ``num_candidates`` candidates is returned.
+    """
+    cdef NegSample neg
+    cdef long item
+    cdef int trial
+    cdef float item_score, best_score = 0, pos_score = 0
+    neg.item = -1
+    neg.weight = 1.0
+    if warp > 0:
+        pos_score = score(user_embed, item_embed, user, item_pos)
+
+    for trial in range(num_candidates):
+        item = dist[0](rng[0])
+        while check_consumed(sparse_indices, sparse_indptr, user, item):
+            item = dist[0](rng[0])
+        if num_candidates == 1 and warp == 0:
+            neg.item = item
+            break
+
+        item_score = score(user_embed, item_embed, user, item)
+        if warp > 0:
+            if item_score > pos_score - 1.0:
+                neg.item = item
+                neg.weight = clog(max(1.0, <float>((n_items - 1) / (trial + 1))))
+                break
+        elif neg.item < 0 or item_score > best_score:
+            neg.item = item
+            best_score = item_score
+    return neg
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.cdivision(True)
@@ -50,6 +119,8 @@ cpdef bpr_update(
     i_2nd_mom=None,
     rho1=0.9,
     rho2=0.999,
+    num_candidates=1,
+    warp=False,
 ):
     sparse_indices = sparse_interaction.indices
     sparse_indptr = sparse_interaction.indptr
@@ -67,6 +138,8 @@ cpdef bpr_update(
             n_items,
             num_threads,
             seed,
+            num_candidates,
+            warp,
         )
     elif optimizer == "momentum":
         _bpr_update_momentum(
@@ -85,6 +158,8 @@ cpdef bpr_update(
             momentum,
             num_threads,
             seed,
+            num_candidates,
+            warp,
         )
     elif optimizer == "adam":
         _bpr_update_adam(
@@ -126,6 +201,8 @@ cdef void _bpr_update_sgd(
     int n_items,
     int num_threads,
     int seed,
+    int num_candidates,
+    int warp,
 ):
     cdef Py_ssize_t i, j, t, random_seed, user, item_pos, item_neg
     cdef int length = len(user_indices), embed_size = user_embed.shape[1] - 1
@@ -139,6 +216,7 @@ cdef void _bpr_update_sgd(
     
     cdef vector[mt19937] rng
     cdef vector[uniform_int_distribution[long]] dist
+    cdef NegSample neg
 
     for i in range(num_threads):
         random_seed = (seed + i * 11) % 7
@@ -147,12 +225,25 @@ cdef void _bpr_update_sgd(
 
     with nogil, parallel(num_threads=num_threads):
         for i in prange(length):
-            t = i % num_threads
+            t = threadid()
             user = user_indices[i]
             item_pos = item_indices[i]
-            item_neg = dist[t](rng[t])
-            while check_consumed(sparse_indices, sparse_indptr, user, item_neg):
-                item_neg = dist[t](rng[t])
+            neg = sample_negative(
+                sparse_indices,
+                sparse_indptr,
+                user_embed,
+                item_embed,
+                user,
+                item_pos,
+                num_candidates,
+                warp,
+                n_items,
+                &rng[t],
+                &dist[t],
+            )
+            if neg.item < 0:
+                continue
+            item_neg = neg.item
 
             user_embed_ptr = &user_embed[user, 0]
             item_pos_embed_ptr = &item_embed[item_pos, 0]
@@ -163,7 +254,11 @@ cdef void _bpr_update_sgd(
                 item_diff = item_diff + user_embed_ptr[j] * (
                     item_pos_embed_ptr[j] - item_neg_embed_ptr[j]
                 )
-            log_sigmoid_grad = 1.0 / (1.0 + cexp(item_diff))
+            if warp > 0:
+                # gradient of the margin loss, weighted by the approximate rank
+                log_sigmoid_grad = neg.weight
+            else:
+                log_sigmoid_grad = 1.0 / (1.0 + cexp(item_diff))
 
             for j in range(embed_size):
                 user_grad = log_sigmoid_grad * (
@@ -209,6 +304,8 @@ cdef void _bpr_update_momentum(
     double momentum,
     int num_threads,
     int seed,
+    int num_candidates,
+    int warp,
 ):
     cdef Py_ssize_t i, j, t, random_seed, user, item_pos, item_neg
     cdef int length = len(user_indices), embed_size = user_embed.shape[1] - 1
@@ -226,6 +323,7 @@ cdef void _bpr_update_momentum(
     
     cdef vector[mt19937] rng
     cdef vector[uniform_int_distribution[long]] dist
+    cdef NegSample neg
 
     for i in range(num_threads):
         random_seed = (seed + i * 11) % 7
@@ -234,12 +332,25 @@ cdef void _bpr_update_momentum(
 
     with nogil, parallel(num_threads=num_threads):
         for i in prange(length):
-            t = i % num_threads
+            t = threadid()
             user = user_indices[i]
             item_pos = item_indices[i]
-            item_neg = dist[t](rng[t])
-            while check_consumed(sparse_indices, sparse_indptr, user, item_neg):
-                item_neg = dist[t](rng[t])
+            neg = sample_negative(
+                sparse_indices,
+                sparse_indptr,
+                user_embed,
+                item_embed,
+                user,
+                item_pos,
+                num_candidates,
+                warp,
+                n_items,
+                &rng[t],
+                &dist[t],
+            )
+            if neg.item < 0:
+                continue
+            item_neg = neg.item
 
             user_embed_ptr = &user_embed[user, 0]
             item_pos_embed_ptr = &item_embed[item_pos, 0]
@@ -254,7 +365,11 @@ cdef void _bpr_update_momentum(
                 item_diff = item_diff + user_embed_ptr[j] * (
                     item_pos_embed_ptr[j] - item_neg_embed_ptr[j]
                 )
-            log_sigmoid_grad = 1.0 / (1.0 + cexp(item_diff))
+            if warp > 0:
+                # gradient of the margin loss, weighted by the approximate rank
+                log_sigmoid_grad = neg.weight
+            else:
+                log_sigmoid_grad = 1.0 / (1.0 + cexp(item_diff))
 
             for j in range(embed_size + 1):
                 if j < embed_size:
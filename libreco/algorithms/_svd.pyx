@@ -0,0 +1,246 @@
+# cython: language_level=3
+cimport cython
+
+from cython.parallel import parallel, prange
+from cython.parallel cimport threadid
+from libc.math cimport exp as cexp, log as clog, pow as cpow, sqrt as csqrt
+from libc.stdlib cimport free, malloc
+from libc.string cimport memset
+from libcpp cimport bool
+from libcpp.algorithm cimport binary_search
+from libcpp.vector cimport vector
+
+import numpy as np
+
+
+cdef extern from "<random>" namespace "std" nogil:
+    cdef cppclass mt19937:
+        mt19937(unsigned int)
+
+    cdef cppclass uniform_int_distribution[T]:
+        uniform_int_distribution(T, T)
+        T operator()(mt19937)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef bool check_consumed(const int[:] indices, const int[:] indptr, int user, int item) nogil:
+    return binary_search(&indices[indptr[user]], &indices[indptr[user+1]], item)
+
+
+def svd_update(
+    sparse_interaction,
+    user_order,
+    user_bias,
+    item_bias,
+    user_factors,
+    item_factors,
+    lr,
+    reg,
+    task,
+    num_neg,
+    num_threads,
+    seed,
+    implicit_interaction=None,
+    implicit_factors=None,
+):
+    """Run one epoch of Hogwild SGD over the rows of ``sparse_interaction``.
+
+    Users are visited in ``user_order``, and each thread updates all the ratings of
+    one user at a time. In `ranking` task, ``num_neg`` unconsumed items are sampled
+    for every interaction as negative samples.
+
+    If ``implicit_interaction`` is provided, the model is SVD++. The implicit sum
+    ``|N(u)|^-0.5 * sum(y_j)`` of a user is computed once when visiting the user and
+    maintained after each rating, while the updates of ``y_j`` are accumulated and
+    applied at the end of the row.
+
+    Returns
+    -------
+    loss : float
+        Average training loss of the epoch.
+    """
+    if not sparse_interaction.has_sorted_indices:
+        sparse_interaction = sparse_interaction.sorted_indices()
+    svdpp = implicit_interaction is not None
+    if not svdpp:
+        implicit_interaction = sparse_interaction
+        implicit_factors = np.zeros((1, user_factors.shape[1]), dtype=np.float32)
+
+    loss = _sgd_update(
+        sparse_interaction.indices,
+        sparse_interaction.indptr,
+        sparse_interaction.data,
+        np.ascontiguousarray(user_order, dtype=np.intc),
+        user_bias,
+        item_bias,
+        user_factors,
+        item_factors,
+        implicit_interaction.indices,
+        implicit_interaction.indptr,
+        implicit_factors,
+        lr,
+        reg,
+        1 if task == "ranking" else 0,
+        num_neg,
+        1 if svdpp else 0,
+        num_threads,
+        seed,
+    )
+    n_samples = sparse_interaction.nnz * (1 + num_neg)
+    return loss / max(n_samples, 1)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef inline float sgd_step(
+    float label,
+    int ranking,
+    long user,
+    long item,
+    float[::1] user_bias,
+    float[::1] item_bias,
+    float[:, ::1] user_factors,
+    float[:, ::1] item_factors,
+    float *implicit_sum,
+    float *implicit_grad,
+    int svdpp,
+    float lr,
+    float reg,
+    float decay,
+    float *loss,
+) nogil:
+    """Update the parameters with one sample and return the error."""
+    cdef int k, embed_size = user_factors.shape[1]
+    cdef float pred, err, p, q, u
+    pred = user_bias[user] + item_bias[item]
+    for k in range(embed_size):
+        u = user_factors[user, k]
+        if svdpp > 0:
+            u = u + implicit_sum[k]
+        pred = pred + u * item_factors[item, k]
+
+    if ranking > 0:
+        # gradient of cross entropy loss with respect to the logit
+        p = 1.0 / (1.0 + cexp(-pred))
+        err = label - p
+        loss[0] = -clog(p + 1e-7) if label > 0 else -clog(1.0 - p + 1e-7)
+    else:
+        err = label - pred
+        loss[0] = err * err
+
+    user_bias[user] += lr * (err - reg * user_bias[user])
+    item_bias[item] += lr * (err - reg * item_bias[item])
+    for k in range(embed_size):
+        p = user_factors[user, k]
+        q = item_factors[item, k]
+        u = p
+        if svdpp > 0:
+            u = p + implicit_sum[k]
+            # y_j += lr * (err * norm * q - reg * y_j) for all j in N(u), which
+            # changes the implicit sum by decay * sum + lr * err * q
+            implicit_grad[k] = decay * implicit_grad[k] + lr * err * q
+            implicit_sum[k] = decay * implicit_sum[k] + lr * err * q
+        user_factors[user, k] += lr * (err * q - reg * p)
+        item_factors[item, k] += lr * (err * u - reg * q)
+    return err
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef double _sgd_update(
+    const int[:] indices,
+    const int[:] indptr,
+    const float[:] data,
+    const int[:] user_order,
+    float[::1] user_bias,
+    float[::1] item_bias,
+    float[:, ::1] user_factors,
+    float[:, ::1] item_factors,
+    const int[:] implicit_indices,
+    const int[:] implicit_indptr,
+    float[:, ::1] implicit_factors,
+    float lr,
+    float reg,
+    int ranking,
+    int num_neg,
+    int svdpp,
+    int num_threads,
+    int seed,
+):
+    cdef int n_users = user_order.shape[0], n_items = item_factors.shape[0]
+    cdef int embed_size = user_factors.shape[1]
+    cdef int i, t, n, k, index, user, item, item_neg, n_implicit, n_steps, use_implicit
+    cdef float norm, scale, step_loss
+    cdef float decay = 1.0 - lr * reg
+    cdef double total_loss = 0.0
+    cdef float *implicit_sum
+    cdef float *implicit_grad
+
+    cdef vector[mt19937] rng
+    cdef vector[uniform_int_distribution[long]] dist
+    for i in range(num_threads):
+        rng.push_back(mt19937(seed * 1000 + i))
+        dist.push_back(uniform_int_distribution[long](0, n_items - 1))
+
+    with nogil, parallel(num_threads=num_threads):
+        implicit_sum = <float *> malloc(sizeof(float) * embed_size)
+        implicit_grad = <float *> malloc(sizeof(float) * embed_size)
+        step_loss = 0.0
+        try:
+            for i in prange(n_users, schedule="dynamic", chunksize=64):
+                t = threadid()
+                user = user_order[i]
+                if indptr[user] == indptr[user+1]:
+                    continue
+
+                n_steps = 0
+                use_implicit = 0
+                n_implicit = implicit_indptr[user+1] - implicit_indptr[user]
+                if svdpp > 0 and n_implicit > 0:
+                    use_implicit = 1
+                    memset(implicit_sum, 0, sizeof(float) * embed_size)
+                    memset(implicit_grad, 0, sizeof(float) * embed_size)
+                    norm = 1.0 / csqrt(n_implicit)
+                    for index in range(implicit_indptr[user], implicit_indptr[user+1]):
+                        item = implicit_indices[index]
+                        for k in range(embed_size):
+                            implicit_sum[k] += norm * implicit_factors[item, k]
+
+                for index in range(indptr[user], indptr[user+1]):
+                    sgd_step(
+                        data[index], ranking, user, indices[index],
+                        user_bias, item_bias, user_factors, item_factors,
+                        implicit_sum, implicit_grad, use_implicit, lr, reg, decay, &step_loss,
+                    )
+                    total_loss += step_loss
+                    n_steps = n_steps + 1
+                    for n in range(num_neg):
+                        item_neg = dist[t](rng[t])
+                        while check_consumed(indices, indptr, user, item_neg):
+                            item_neg = dist[t](rng[t])
+                        sgd_step(
+                            0.0, ranking, user, item_neg,
+                            user_bias, item_bias, user_factors, item_factors,
+                            implicit_sum, implicit_grad, use_implicit, lr, reg, decay, &step_loss,
+                        )
+                        total_loss += step_loss
+                        n_steps = n_steps + 1
+
+                if use_implicit > 0:
+                    # apply the accumulated updates of y_j, whose regularization
+                    # decays y_j once in every step
+                    scale = cpow(decay, n_steps)
+                    for index in range(implicit_indptr[user], implicit_indptr[user+1]):
+                        item = implicit_indices[index]
+                        for k in range(embed_size):
+                            implicit_factors[item, k] = (
+                                scale * implicit_factors[item, k] + norm * implicit_grad[k]
+                            )
+        finally:
+            free(implicit_sum)
+            free(implicit_grad)
+
+    return total_loss
@@ -4,10 +4,12 @@ import os
 from functools import partial
 
 import numpy as np
+from scipy.sparse import csr_matrix, diags
 
 from ..bases import EmbedBase
 from ..evaluation import print_metrics
 from ..recommendation import recommend_from_embedding
+from ..sampling.negatives import build_consumed_csr
 from ..utils.initializers import truncated_normal
 from ..utils.misc import time_block
 from ..utils.save_load import save_default_recs, save_params
@@ -45,6 +47,18 @@ class ALS(EmbedBase):
         Random seed.
     lower_upper_bound : tuple or None, default: None
         Lower and upper score bound for `rating` task.
+    solver : {'subspace'} or None, default: None
+        Set to 'subspace' to update the embedding dimensions block by block as in
+        *iALS++*, which avoids solving a full `embed_size` system for every row and
+        is much faster for large `embed_size`. None means using *conjugate gradient*
+        or the exact solver according to `use_cg`.
+
+        .. versionadded:: 1.6.0
+
+    block_size : int, default: 32
+        Number of dimensions in each block, only used when `solver` is 'subspace'.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
@@ -56,6 +70,9 @@ class ALS(EmbedBase):
 
     [3] *Gábor Takács et al.* `Applications of the Conjugate Gradient Method for Implicit Feedback Collaborative Filtering
     <http://citeseerx.ist.psu.edu/viewdoc/download?doi=10.1.1.379.6473&rep=rep1&type=pdf>`_.
+
+    [4] *Steffen Rendle et al.* `iALS++: Speeding up Matrix Factorization with Subspace Optimization
+    <https://arxiv.org/abs/2110.14044>`_.
     """
 
     def __init__(
@@ -70,6 +87,8 @@ class ALS(EmbedBase):
         n_threads=1,
         seed=42,
         lower_upper_bound=None,
+        solver=None,
+        block_size=32,
     ):
         super().__init__(task, data_info, embed_size, lower_upper_bound)
 
@@ -80,6 +99,8 @@ class ALS(EmbedBase):
         self.use_cg = use_cg
         self.n_threads = n_threads
         self.seed = seed
+        self.block_size = self._check_solver(solver, block_size)
+        self._fold_in_grams = dict()
 
     def build_model(self):
         np_rng = np.random.default_rng(self.seed)
@@ -101,6 +122,8 @@ class ALS(EmbedBase):
         k=10,
         eval_batch_size=8192,
         eval_user_num=None,
+        incremental=False,
+        update_neighbors=False,
         **kwargs,
     ):
         """Fit ALS model on the training data.
@@ -130,6 +153,32 @@ class ALS(EmbedBase):
         eval_user_num : int or None, default: None
             Number of users for evaluating. Setting it to a positive number will sample
             users randomly from eval data.
+        incremental : bool, default: False
+            Whether to only update the users and items that appear in ``train_data``,
+            which is typically the new data from
+            :func:`~libreco.data.DatasetPure.merge_trainset` after
+            :meth:`rebuild_model`. The other embeddings keep their old values, and
+            each of the `n_epochs` sweeps only solves these dirty rows.
+
+            In `ranking` task, the dirty rows are solved with all their consumed
+            records in ``data_info``, where the old records have label 1. In `rating`
+            task, old ratings are not kept in ``data_info``, so the dirty rows are
+            only solved with the ratings in ``train_data``.
+
+            .. versionadded:: 1.6.0
+
+        update_neighbors : bool, default: False
+            Whether to also update the one-hop neighbors of the dirty rows in
+            incremental mode, i.e. the items consumed by dirty users and the users who
+            consumed dirty items in ``data_info``. The neighbors are solved with all
+            their consumed records, so this is only supported in `ranking` task.
+
+            .. versionadded:: 1.6.0
+
+        Raises
+        ------
+        ValueError
+            If `update_neighbors` is used in `rating` task.
         """
         try:
             from ._als import als_update
@@ -143,13 +192,27 @@ class ALS(EmbedBase):
             self.build_model()
             self.model_built = True
 
+        self._fold_in_grams.clear()
         user_interaction = train_data.sparse_interaction  # sparse.csr_matrix
-        item_interaction = user_interaction.T.tocsr()
+        user_rows = item_rows = None
+        if incremental:
+            user_interaction, item_interaction, user_rows, item_rows = (
+                self._incremental_interaction(user_interaction, update_neighbors)
+            )
+        else:
+            # avoid modifying the data of `train_data` in place
+            user_interaction = user_interaction.copy()
+            item_interaction = user_interaction.T.tocsr()
         if self.task == "ranking":
             user_interaction.data = user_interaction.data * self.alpha + 1
             item_interaction.data = item_interaction.data * self.alpha + 1
 
-        trainer = partial(als_update, task=self.task, use_cg=self.use_cg)
+        trainer = partial(
+            als_update,
+            task=self.task,
+            use_cg=self.use_cg,
+            block_size=self.block_size,
+        )
         for epoch in range(1, self.n_epochs + 1):
             with time_block(f"Epoch {epoch}", verbose):
                 trainer(
@@ -158,6 +221,7 @@ class ALS(EmbedBase):
                     Y=self.item_embeds_np,
                     reg=self.reg,
                     num_threads=self.n_threads,
+                    rows=user_rows,
                 )
                 trainer(
                     interaction=item_interaction,
@@ -165,6 +229,7 @@ class ALS(EmbedBase):
                     Y=self.user_embeds_np,
                     reg=self.reg,
                     num_threads=self.n_threads,
+                    rows=item_rows,
                 )
 
             if verbose > 1:
@@ -191,12 +256,206 @@ class ALS(EmbedBase):
             random_rec=False,
         ).flatten()
 
+    def _incremental_interaction(self, interaction, update_neighbors):
+        if update_neighbors and self.task == "rating":
+            raise ValueError("`update_neighbors` is only supported in ranking task")
+        # the merged data may not contain the last users or items
+        shape = (self.n_users, self.n_items)
+        interaction = interaction.tocoo()
+        user_interaction = csr_matrix(
+            (interaction.data, (interaction.row, interaction.col)),
+            shape=shape,
+            dtype=np.float32,
+        )
+        item_interaction = user_interaction.T.tocsr()
+        user_rows = np.flatnonzero(np.diff(user_interaction.indptr))
+        item_rows = np.flatnonzero(np.diff(item_interaction.indptr))
+        if self.task == "rating":
+            # old ratings are not kept in `data_info`, so only new ratings are used
+            return user_interaction, item_interaction, user_rows, item_rows
+
+        indptr, indices = build_consumed_csr(
+            self.user_consumed, self.n_users, self.n_items
+        )
+        consumed = csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr),
+            shape=shape,
+        )
+        if update_neighbors:
+            consumed_t = consumed.T.tocsr()
+            neighbor_users = np.setdiff1d(consumed_t[item_rows].indices, user_rows)
+            neighbor_items = np.setdiff1d(consumed[user_rows].indices, item_rows)
+            user_rows = np.union1d(user_rows, neighbor_users)
+            item_rows = np.union1d(item_rows, neighbor_items)
+
+        # all the rows are solved with their consumed records,
+        # and labels in the new data replace the old ones
+        new_mask = user_interaction.copy()
+        new_mask.data = np.ones_like(new_mask.data)
+        merged = (consumed - consumed.multiply(new_mask) + user_interaction).tocsr()
+        user_interaction = _select_rows(merged, user_rows)
+        item_interaction = _select_rows(merged.T.tocsr(), item_rows)
+        return user_interaction, item_interaction, user_rows, item_rows
+
+    def fold_in_users(self, user_ids, interactions, labels=None):
+        """Solve embeddings of users from their interactions with item embeddings fixed.
+
+        Each user is solved independently by least squares against the trained item
+        embeddings, so embeddings of new or active users can be refreshed without
+        retraining. The results are written into ``user_embeds_np`` in place.
+        Unknown users are appended to ``data_info`` and the embedding table.
+
+        .. versionadded:: 1.6.0
+
+        Parameters
+        ----------
+        user_ids : list
+            Original user ids.
+        interactions : list of list
+            All the consumed items of each user in ``user_ids``. Unknown items are ignored.
+            The interactions are also added to ``user_consumed`` and ``item_consumed``
+            in ``data_info``.
+        labels : list of list or None, default: None
+            Labels of each interaction, which are required in `rating` task.
+            None means all the labels are 1 in `ranking` task.
+
+        Raises
+        ------
+        RuntimeError
+            If the model hasn't been trained.
+        """
+        self._fold_in(user_ids, interactions, labels, is_user=True)
+
+    def fold_in_items(self, item_ids, interactions, labels=None):
+        """Solve embeddings of items from their interactions with user embeddings fixed.
+
+        .. versionadded:: 1.6.0
+
+        Parameters
+        ----------
+        item_ids : list
+            Original item ids.
+        interactions : list of list
+            All the users who consumed each item in ``item_ids``. Unknown users are ignored.
+            The interactions are also added to ``item_consumed`` and ``user_consumed``
+            in ``data_info``.
+        labels : list of list or None, default: None
+            Labels of each interaction, which are required in `rating` task.
+            None means all the labels are 1 in `ranking` task.
+
+        Raises
+        ------
+        RuntimeError
+            If the model hasn't been trained.
+
+        See Also
+        --------
+        fold_in_users
+        """
+        self._fold_in(item_ids, interactions, labels, is_user=False)
+
+    def _fold_in(self, ids, interactions, labels, is_user):
+        from ._als import als_update
+
+        if self.user_embeds_np is None:
+            raise RuntimeError("ALS model must be trained before folding in")
+        if len(ids) != len(interactions):
+            raise ValueError(
+                f"Length of ids and interactions don't match: "
+                f"{len(ids)} != {len(interactions)}"
+            )
+        if labels is None:
+            if self.task == "rating":
+                raise ValueError("`labels` must be provided in rating task")
+            labels = [np.ones(len(inter)) for inter in interactions]
+
+        data_info = self.data_info
+        if is_user:
+            new_rows = data_info.add_users(ids)
+            self.n_users = data_info.n_users
+            id2index, consumed = data_info.user2id, data_info.user_consumed
+            other2index, other_consumed = data_info.item2id, data_info.item_consumed
+        else:
+            new_rows = data_info.add_items(ids)
+            self.n_items = data_info.n_items
+            id2index, consumed = data_info.item2id, data_info.item_consumed
+            other2index, other_consumed = data_info.user2id, data_info.user_consumed
+        embeds = self.user_embeds_np if is_user else self.item_embeds_np
+        other_embeds = self.item_embeds_np if is_user else self.user_embeds_np
+        if len(new_rows) > 0:
+            # keep the oov embedding in the last row
+            init_embeds = np.zeros((len(new_rows), self.embed_size), embeds.dtype)
+            embeds = np.vstack([embeds[:-1], init_embeds, embeds[-1:]])
+            setattr(self, "user_embeds_np" if is_user else "item_embeds_np", embeds)
+
+        rows = np.array([id2index[i] for i in ids])
+        lens = np.array([len(inter) for inter in interactions])
+        row_indices = np.repeat(np.arange(len(rows)), lens)
+        cols = np.fromiter(
+            (other2index.get(i, -1) for inter in interactions for i in inter),
+            dtype=np.int64,
+            count=lens.sum(),
+        )
+        values = np.concatenate([np.asarray(label) for label in labels])
+        known = cols != -1
+        row_indices, cols = row_indices[known], cols[known]
+        values = values[known].astype(np.float32)
+        if self.task == "ranking":
+            values = values * self.alpha + 1
+        # exclude the oov row of the fixed embeddings
+        n_others = len(other_embeds) - 1
+        interaction = csr_matrix(
+            (values, (row_indices, cols)), shape=(len(rows), n_others), dtype=np.float32
+        )
+        X = np.ascontiguousarray(embeds[rows])
+        Y = other_embeds[:n_others]
+        gram_key = "item" if is_user else "user"
+        if self.task == "ranking" and gram_key not in self._fold_in_grams:
+            self._fold_in_grams[gram_key] = Y.T @ Y
+        als_update(
+            interaction,
+            X,
+            Y,
+            reg=self.reg,
+            task=self.task,
+            use_cg=self.use_cg,
+            num_threads=self.n_threads,
+            gram=self._fold_in_grams.get(gram_key),
+            block_size=self.block_size,
+        )
+        embeds[rows] = X
+        # the gram matrix of updated embeddings is outdated
+        self._fold_in_grams.pop("user" if is_user else "item", None)
+
+        consumed_lens = np.bincount(row_indices, minlength=len(rows))
+        splits = np.split(cols, np.cumsum(consumed_lens)[:-1])
+        for r, consumed_cols in zip(rows.tolist(), splits):
+            consumed[r] = list(dict.fromkeys(consumed[r] + consumed_cols.tolist()))
+        # the same interactions from the other side
+        col_order = np.argsort(cols, kind="stable")
+        other_cols, col_starts = np.unique(cols[col_order], return_index=True)
+        other_splits = np.split(rows[row_indices[col_order]], col_starts[1:])
+        for c, consumed_rows in zip(other_cols.tolist(), other_splits):
+            other_consumed[c] = list(
+                dict.fromkeys(other_consumed[c] + consumed_rows.tolist())
+            )
+
     @staticmethod
     def _check_reg(reg):
         if not isinstance(reg, float) or reg <= 0.0:
             raise ValueError(f"`reg` must be float and positive, got {reg}")
         return reg
 
+    @staticmethod
+    def _check_solver(solver, block_size):
+        if solver is None:
+            return
+        if solver != "subspace":
+            raise ValueError(f"`solver` must be 'subspace' or None, got {solver}")
+        if not isinstance(block_size, int) or block_size <= 0:
+            raise ValueError(f"`block_size` must be positive int, got {block_size}")
+        return block_size
+
     def save(self, path, model_name, **kwargs):
         """Save model for inference or retraining.
 
@@ -244,6 +503,12 @@ class ALS(EmbedBase):
         self.item_embeds_np[: len(old_var)] = old_var
 
 
+def _select_rows(matrix, rows):
+    mask = np.zeros(matrix.shape[0], dtype=np.float32)
+    mask[rows] = 1.0
+    return diags(mask).dot(matrix).tocsr()
+
+
 def least_squares(sparse_interaction, X, Y, reg, embed_size, num, mode):
     """Least squares optimization showcase for ALS."""
     indices = sparse_interaction.indices
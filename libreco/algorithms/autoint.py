@@ -73,6 +73,12 @@ class AutoInt(TfBase, metaclass=ModelMeta):
     tf_sess_config : dict or None, default: None
         Optional TensorFlow session config, see `ConfigProto options
         <https://github.com/tensorflow/tensorflow/blob/v2.10.0/tensorflow/core/protobuf/config.proto#L431>`_.
+    embed_compression : dict or None, default: None
+        Compressed embedding tables for ``'user'``, ``'item'`` or sparse columns,
+        which reduce the memory of high-cardinality ids and features.
+        See :class:`~libreco.bases.TfBase` for the options.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
@@ -108,8 +114,11 @@ class AutoInt(TfBase, metaclass=ModelMeta):
         seed=42,
         lower_upper_bound=None,
         tf_sess_config=None,
+        embed_compression=None,
     ):
-        super().__init__(task, data_info, lower_upper_bound, tf_sess_config)
+        super().__init__(
+            task, data_info, lower_upper_bound, tf_sess_config, embed_compression
+        )
 
         self.all_args = locals()
         self.loss_type = loss_type
@@ -176,6 +185,7 @@ class AutoInt(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_users + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["user"],
         )
         item_embeds = embedding_lookup(
             indices=self.item_indices,
@@ -183,6 +193,7 @@ class AutoInt(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_items + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["item"],
         )
         self.concat_embed.extend(
             [user_embeds[:, tf.newaxis, :], item_embeds[:, tf.newaxis, :]]
@@ -201,6 +212,7 @@ class AutoInt(TfBase, metaclass=ModelMeta):
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
             flatten=False,
+            compression=self.compressed_tables["sparse"],
         )
         self.concat_embed.append(sparse_embed)
 
@@ -25,7 +25,7 @@ class BPR(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
 
     .. CAUTION::
         + BPR can only be used in ``ranking`` task.
-        + BPR can only use ``bpr`` loss in ``loss_type``.
+        + BPR can only use ``bpr`` or ``warp`` loss in ``loss_type``.
 
     Parameters
     ----------
@@ -33,8 +33,14 @@ class BPR(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
         Recommendation task. See :ref:`Task`.
     data_info : :class:`~libreco.data.DataInfo` object
         Object that contains useful information for training and inference.
-    loss_type : {'bpr'}
-        Loss for model training.
+    loss_type : {'bpr', 'warp'}
+        Loss for model training. ``'warp'`` is only supported in Cython version with
+        `sgd` or `momentum` optimizer. It keeps sampling negative items until one of
+        them is ranked higher than the positive item minus a margin, and weights the
+        update by the approximate rank of the positive item.
+
+        .. versionadded:: 1.6.0
+           The ``'warp'`` loss.
     embed_size: int, default: 16
         Vector size of embeddings.
     norm_embed : bool, default: False
@@ -80,11 +86,21 @@ class BPR(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
         Optimizer used in Cython version.
     num_threads : int, default: 1
         Number of threads used in Cython version.
+    neg_candidates : int or None, default: None
+        Number of negative candidates sampled for each positive item in Cython version
+        with `sgd` or `momentum` optimizer. For ``'bpr'`` loss, the highest scored
+        candidate is used as the negative item. For ``'warp'`` loss, it is the maximum
+        number of sampling trials. None means 1 for ``'bpr'`` and 10 for ``'warp'``.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
-    *Steffen Rendle et al.* `BPR: Bayesian Personalized Ranking from Implicit Feedback
+    [1] *Steffen Rendle et al.* `BPR: Bayesian Personalized Ranking from Implicit Feedback
     <https://arxiv.org/ftp/arxiv/papers/1205/1205.2618.pdf>`_.
+
+    [2] *Jason Weston et al.* `WSABIE: Scaling Up To Large Vocabulary Image Annotation
+    <https://www.ijcai.org/Proceedings/11/Papers/460.pdf>`_.
     """
 
     user_variables = ("embedding/user_embeds_var",)
@@ -111,11 +127,12 @@ class BPR(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
         tf_sess_config=None,
         optimizer="adam",
         num_threads=1,
+        neg_candidates=None,
     ):
         super().__init__(task, data_info, embed_size)
 
         assert task == "ranking", "BPR is only suitable for ranking"
-        assert loss_type == "bpr", "BPR should use bpr loss"
+        assert loss_type in ("bpr", "warp"), "BPR should use bpr or warp loss"
         self.all_args = locals()
         self.loss_type = loss_type
         self.norm_embed = norm_embed
@@ -131,9 +148,23 @@ class BPR(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
         self.seed = seed
         self.optimizer = optimizer
         self.num_threads = num_threads
+        self.neg_candidates = self._check_neg_candidates(neg_candidates)
         if use_tf:
             self.sess = sess_config(tf_sess_config)
 
+    def _check_neg_candidates(self, neg_candidates):
+        if self.use_tf and self.loss_type == "warp":
+            raise ValueError("`warp` loss is only supported in Cython version")
+        if neg_candidates is None:
+            return 10 if self.loss_type == "warp" else 1
+        if not isinstance(neg_candidates, int) or neg_candidates <= 0:
+            raise ValueError(
+                f"`neg_candidates` must be positive int, got {neg_candidates}"
+            )
+        if self.use_tf and neg_candidates > 1:
+            raise ValueError("`neg_candidates` is only supported in Cython version")
+        return neg_candidates
+
     def build_model(self):
         if self.use_tf:
             self._build_model_tf()
@@ -215,6 +246,7 @@ class BPR(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
         eval_batch_size=8192,
         eval_user_num=None,
         num_workers=0,
+        prefetch_batches=0,
     ):
         """Fit BPR model on the training data.
 
@@ -246,6 +278,11 @@ class BPR(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
         num_workers : int, default: 0
             How many subprocesses to use for data loading.
             0 means that the data will be loaded in the main process.
+        prefetch_batches : int, default: 0
+            Number of batches prepared ahead in a background thread, so that data loading
+            overlaps with training steps. 0 means no prefetching.
+
+            .. versionadded:: 1.6.0
         """
         check_fitting(self, train_data, eval_data, neg_sampling, k)
         self.show_start_time()
@@ -266,6 +303,7 @@ class BPR(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
                 eval_batch_size,
                 eval_user_num,
                 num_workers,
+                prefetch_batches,
             )
             if self.user_embeds_np is None:
                 self.set_embeddings()  # maybe already executed in trainers
@@ -340,6 +378,12 @@ class BPR(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
             raise ValueError(
                 "optimizer must be one of these: (`sgd`, `momentum`, `adam`)"
             )
+        if self.optimizer == "adam" and (
+            self.loss_type == "warp" or self.neg_candidates > 1
+        ):
+            raise ValueError(
+                "`warp` loss and `neg_candidates` only support `sgd` and `momentum`"
+            )
 
         for epoch in range(1, self.n_epochs + 1):
             user_indices = train_data.user_indices.astype(np.int32)
@@ -363,6 +407,8 @@ class BPR(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
                     num_threads=self.num_threads,
                     seed=self.seed,
                     epoch=epoch,
+                    num_candidates=self.neg_candidates,
+                    warp=self.loss_type == "warp",
                 )
 
             if verbose > 1:
@@ -75,6 +75,12 @@ class DeepFM(TfBase, metaclass=ModelMeta):
     tf_sess_config : dict or None, default: None
         Optional TensorFlow session config, see `ConfigProto options
         <https://github.com/tensorflow/tensorflow/blob/v2.10.0/tensorflow/core/protobuf/config.proto#L431>`_.
+    embed_compression : dict or None, default: None
+        Compressed embedding tables for ``'user'``, ``'item'`` or sparse columns,
+        which reduce the memory of high-cardinality ids and features.
+        See :class:`~libreco.bases.TfBase` for the options.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
@@ -108,8 +114,11 @@ class DeepFM(TfBase, metaclass=ModelMeta):
         seed=42,
         lower_upper_bound=None,
         tf_sess_config=None,
+        embed_compression=None,
     ):
-        super().__init__(task, data_info, lower_upper_bound, tf_sess_config)
+        super().__init__(
+            task, data_info, lower_upper_bound, tf_sess_config, embed_compression
+        )
 
         self.all_args = locals()
         self.loss_type = loss_type
@@ -184,6 +193,7 @@ class DeepFM(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_users + 1, 1),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["user"],
         )
         linear_item_embeds = embedding_lookup(
             indices=self.item_indices,
@@ -191,6 +201,7 @@ class DeepFM(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_items + 1, 1),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["item"],
         )
         user_embeds = embedding_lookup(
             indices=self.user_indices,
@@ -198,6 +209,7 @@ class DeepFM(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_users + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["user"],
         )
         item_embeds = embedding_lookup(
             indices=self.item_indices,
@@ -205,6 +217,7 @@ class DeepFM(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_items + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["item"],
         )
 
         self.linear_embed.extend([linear_user_embeds, linear_item_embeds])
@@ -225,6 +238,7 @@ class DeepFM(TfBase, metaclass=ModelMeta):
             var_shape=[self.sparse_feature_size],
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["sparse"],
         )
         pairwise_sparse_embed = compute_sparse_feats(
             self.data_info,
@@ -234,6 +248,7 @@ class DeepFM(TfBase, metaclass=ModelMeta):
             var_shape=(self.sparse_feature_size, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["sparse"],
         )
         deep_sparse_embed = tf.keras.layers.Flatten()(pairwise_sparse_embed)
         self.linear_embed.append(linear_sparse_embed)
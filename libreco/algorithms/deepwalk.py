@@ -1,12 +1,13 @@
 """Implementation of DeepWalk."""
-import random
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 from gensim.models import Word2Vec
 from tqdm import tqdm
 
 from ..bases import GensimBase
+from ..bases.gensim_base import encode_line_sentences
+from ..sampling import build_transition_csr, item_random_walks
 
 
 class DeepWalk(GensimBase):
@@ -39,6 +40,22 @@ class DeepWalk(GensimBase):
         Random seed.
     lower_upper_bound : tuple or None, default: None
         Lower and upper score bound for `rating` task.
+    corpus_dir : str or None, default: None
+        If provided, all the walks are generated once and written to a corpus file
+        in this directory, then gensim trains with the ``corpus_file`` mode, which
+        scales better with ``n_threads`` than a Python iterable. A memory-backed
+        directory such as ``/dev/shm`` is a good choice. The path of the file is
+        stored in ``model.data``, and the file is removed when the model is garbage
+        collected or :meth:`remove_corpus` is called.
+        When retraining with :meth:`rebuild_model`, new walks are generated from
+        the merged ``data_info``. If None, the walks are regenerated in every epoch.
+
+        .. versionadded:: 1.6.0
+
+    walk_workers : int, default: 1
+        Number of processes to generate the walks when ``corpus_dir`` is provided.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
@@ -59,6 +76,8 @@ class DeepWalk(GensimBase):
         n_threads=0,
         seed=42,
         lower_upper_bound=None,
+        corpus_dir=None,
+        walk_workers=1,
     ):
         super().__init__(
             task,
@@ -70,23 +89,34 @@ class DeepWalk(GensimBase):
             n_threads,
             seed,
             lower_upper_bound,
+            corpus_dir,
         )
         assert task == "ranking", "DeepWalk is only suitable for ranking"
         self.all_args = locals()
         self.n_walks = n_walks
         self.walk_length = walk_length
+        self.walk_workers = walk_workers
 
     def _build_graph(self):
-        graph = defaultdict(list)
-        for items in self.user_consumed.values():
-            for i in range(len(items) - 1):
-                graph[items[i]].append(items[i + 1])
-        return graph
+        return build_transition_csr(self.user_consumed, self.n_users, self.n_items)
 
     def get_data(self):
-        graph = self._build_graph()
+        indptr, indices = self._build_graph()
         return _ItemCorpus(
-            graph, self.n_items, self.n_walks, self.walk_length, self.seed
+            indptr, indices, self.n_items, self.n_walks, self.walk_length, self.seed
+        )
+
+    def write_corpus(self, f):
+        indptr, indices = self._build_graph()
+        write_walks(
+            f,
+            indptr,
+            indices,
+            self.n_items,
+            self.n_walks,
+            self.walk_length,
+            self.walk_workers,
+            self.seed,
         )
 
     def build_model(self):
@@ -100,13 +130,46 @@ class DeepWalk(GensimBase):
             workers=self.workers,
             sorted_vocab=0,
         )
-        model.build_vocab(self.data, update=False)
+        model.build_vocab(**self.corpus_kwargs(), update=False)
         return model
 
 
+def _generate_walks(indptr, indices, n_items, n_rounds, walk_length, seed):
+    """Generate walks starting from every item for ``n_rounds`` times."""
+    np_rng = np.random.default_rng(seed)
+    chunks = []
+    for _ in range(n_rounds):
+        start_nodes = np_rng.permutation(n_items)
+        walks = item_random_walks(np_rng, indptr, indices, start_nodes, walk_length)
+        lengths = np.count_nonzero(walks >= 0, axis=1)
+        chunks.append(encode_line_sentences(walks[walks >= 0], lengths, n_items))
+    return b"".join(chunks)
+
+
+def write_walks(f, indptr, indices, n_items, n_walks, walk_length, n_workers, seed):
+    """Write walks in `LineSentence` format, the rounds are sharded across processes."""
+    n_workers = max(1, min(n_workers, n_walks))
+    shard_rounds = [len(s) for s in np.array_split(np.arange(n_walks), n_workers)]
+    shard_seeds = [
+        s.generate_state(1)[0] for s in np.random.SeedSequence(seed).spawn(n_workers)
+    ]
+    args = (indptr, indices, n_items)
+    if n_workers == 1:
+        f.write(_generate_walks(*args, n_walks, walk_length, shard_seeds[0]))
+        return
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = [
+            executor.submit(_generate_walks, *args, rounds, walk_length, shard_seed)
+            for rounds, shard_seed in zip(shard_rounds, shard_seeds)
+        ]
+        for future in futures:
+            f.write(future.result())
+
+
 class _ItemCorpus:
-    def __init__(self, graph, n_items, n_walks, walk_length, seed):
-        self.graph = graph
+    def __init__(self, indptr, indices, n_items, n_walks, walk_length, seed):
+        self.indptr = indptr
+        self.indices = indices
         self.n_items = n_items
         self.n_walks = n_walks
         self.walk_length = walk_length
@@ -115,13 +178,10 @@ class _ItemCorpus:
 
     def __iter__(self):
         for _ in tqdm(range(self.n_walks), desc=f"DeepWalk iter {self.i}"):
-            for node in self.np_rng.permutation(self.n_items):
-                walk = [node]
-                while len(walk) < self.walk_length:
-                    neighbors = self.graph[walk[-1]]
-                    if len(neighbors) > 0:
-                        walk.append(random.choice(neighbors))
-                    else:
-                        break
-                yield list(map(str, walk))
+            start_nodes = self.np_rng.permutation(self.n_items)
+            walks = item_random_walks(
+                self.np_rng, self.indptr, self.indices, start_nodes, self.walk_length
+            )
+            for walk in walks.tolist():
+                yield [str(i) for i in walk if i >= 0]
         self.i += 1
@@ -89,6 +89,12 @@ class DIN(TfBase, metaclass=ModelMeta):
     tf_sess_config : dict or None, default: None
         Optional TensorFlow session config, see `ConfigProto options
         <https://github.com/tensorflow/tensorflow/blob/v2.10.0/tensorflow/core/protobuf/config.proto#L431>`_.
+    embed_compression : dict or None, default: None
+        Compressed embedding tables for ``'user'``, ``'item'`` or sparse columns,
+        which reduce the memory of high-cardinality ids and features.
+        See :class:`~libreco.bases.TfBase` for the options.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
@@ -125,8 +131,11 @@ class DIN(TfBase, metaclass=ModelMeta):
         seed=42,
         lower_upper_bound=None,
         tf_sess_config=None,
+        embed_compression=None,
     ):
-        super().__init__(task, data_info, lower_upper_bound, tf_sess_config)
+        super().__init__(
+            task, data_info, lower_upper_bound, tf_sess_config, embed_compression
+        )
 
         self.all_args = locals()
         self.loss_type = loss_type
@@ -171,6 +180,7 @@ class DIN(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_users + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["user"],
         )
         item_embed = embedding_lookup(
             indices=self.item_indices,
@@ -178,6 +188,7 @@ class DIN(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_items + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["item"],
         )
         concat_embeds = [user_embed, item_embed]
 
@@ -191,6 +202,7 @@ class DIN(TfBase, metaclass=ModelMeta):
                 initializer=tf.glorot_uniform_initializer(),
                 regularizer=self.reg,
                 flatten=True,
+                compression=self.compressed_tables["sparse"],
             )
             concat_embeds.append(sparse_embed)
         if self.dense:
@@ -204,7 +216,9 @@ class DIN(TfBase, metaclass=ModelMeta):
             )
             concat_embeds.append(dense_embed)
 
-        item_seq_feats = combine_seq_features(self.data_info, feat_agg_mode="concat")
+        item_seq_feats = combine_seq_features(
+            self.data_info, "concat", self.compressed_tables
+        )
         attention_embeds = self._build_seq_attention(item_seq_feats)
         dense_inputs = tf.concat([*concat_embeds, attention_embeds], axis=1)
         mlp_layer = dense_nn(
@@ -1,8 +1,12 @@
 """Implementation of Item2Vec."""
+import itertools
+
+import numpy as np
 from gensim.models import Word2Vec
 from tqdm import tqdm
 
 from ..bases import GensimBase
+from ..bases.gensim_base import encode_line_sentences
 
 
 class Item2Vec(GensimBase):
@@ -31,6 +35,17 @@ class Item2Vec(GensimBase):
         Random seed.
     lower_upper_bound : tuple or None, default: None
         Lower and upper score bound for `rating` task.
+    corpus_dir : str or None, default: None
+        If provided, the consumed item sequences are written once to a corpus file
+        in this directory, then gensim trains with the ``corpus_file`` mode, which
+        scales better with ``n_threads`` than a Python iterable. A memory-backed
+        directory such as ``/dev/shm`` is a good choice. The path of the file is
+        stored in ``model.data``, and the file is removed when the model is garbage
+        collected or :meth:`remove_corpus` is called.
+        When retraining with :meth:`rebuild_model`, a new corpus is written from
+        the merged ``data_info``.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
@@ -49,6 +64,7 @@ class Item2Vec(GensimBase):
         n_threads=0,
         seed=42,
         lower_upper_bound=None,
+        corpus_dir=None,
     ):
         super().__init__(
             task,
@@ -60,6 +76,7 @@ class Item2Vec(GensimBase):
             n_threads,
             seed,
             lower_upper_bound,
+            corpus_dir,
         )
         assert task == "ranking", "Item2Vec is only suitable for ranking"
         self.all_args = locals()
@@ -67,6 +84,18 @@ class Item2Vec(GensimBase):
     def get_data(self):
         return _ItemCorpus(self.user_consumed)
 
+    def write_corpus(self, f, chunk_size=100000):
+        item_seqs = [items for items in self.user_consumed.values() if len(items) > 0]
+        for i in range(0, len(item_seqs), chunk_size):
+            chunk = item_seqs[i : i + chunk_size]
+            lengths = np.array([len(items) for items in chunk])
+            tokens = np.fromiter(
+                itertools.chain.from_iterable(chunk),
+                dtype=np.int64,
+                count=lengths.sum(),
+            )
+            f.write(encode_line_sentences(tokens, lengths, self.n_items))
+
     def build_model(self):
         model = Word2Vec(
             vector_size=self.embed_size,
@@ -79,7 +108,7 @@ class Item2Vec(GensimBase):
             workers=self.workers,
             sorted_vocab=0,
         )
-        model.build_vocab(self.data, update=False)
+        model.build_vocab(**self.corpus_kwargs(), update=False)
         return model
 
 
@@ -53,6 +53,19 @@ class LightGCN(EmbedBase, metaclass=ModelMeta, backend="torch"):
         - ``'unconsumed'`` samples items that the target user did not consume before.
         - ``'popular'`` has a higher probability to sample popular items as negative samples.
 
+    subgraph_sampling : bool, default: False
+        Whether to propagate embeddings only over the multi-hop neighborhood of the
+        users and items in each training batch, instead of the whole graph. The full
+        propagation is still used for evaluation and inference.
+
+        .. versionadded:: 1.6.0
+
+    num_neighbors : int or None, default: None
+        Max number of neighbors sampled for every node in each layer when
+        ``subgraph_sampling=True``. None means using all the neighbors.
+
+        .. versionadded:: 1.6.0
+
     seed : int, default: 42
         Random seed.
     device : {'cpu', 'cuda'}, default: 'cuda'
@@ -63,6 +76,13 @@ class LightGCN(EmbedBase, metaclass=ModelMeta, backend="torch"):
 
     lower_upper_bound : tuple or None, default: None
         Lower and upper score bound for `rating` task.
+    laplacian_cache_dir : str or None, default: None
+        Directory to cache the normalized adjacency matrix of the user-item graph.
+        The file is named by the fingerprint of the training data, so the matrix
+        is built only once and reused when the model is built again with the same
+        data, e.g. after loading a saved model.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
@@ -88,9 +108,12 @@ class LightGCN(EmbedBase, metaclass=ModelMeta, backend="torch"):
         n_layers=3,
         margin=1.0,
         sampler="random",
+        subgraph_sampling=False,
+        num_neighbors=None,
         seed=42,
         device="cuda",
         lower_upper_bound=None,
+        laplacian_cache_dir=None,
         with_training=True,
     ):
         super().__init__(task, data_info, embed_size, lower_upper_bound)
@@ -109,8 +132,11 @@ class LightGCN(EmbedBase, metaclass=ModelMeta, backend="torch"):
         self.n_layers = n_layers
         self.margin = margin
         self.sampler = sampler
+        self.subgraph_sampling = subgraph_sampling
+        self.num_neighbors = num_neighbors
         self.seed = seed
         self.device = device_config(device)
+        self.laplacian_cache_dir = laplacian_cache_dir
         self._check_params()
 
     def build_model(self):
@@ -123,6 +149,10 @@ class LightGCN(EmbedBase, metaclass=ModelMeta, backend="torch"):
             self.dropout_rate,
             self.user_consumed,
             self.device,
+            self.laplacian_cache_dir,
+            self.subgraph_sampling,
+            self.num_neighbors,
+            self.seed,
         )
 
     def _check_params(self):
@@ -130,6 +160,10 @@ class LightGCN(EmbedBase, metaclass=ModelMeta, backend="torch"):
             raise ValueError("LightGCN is only suitable for ranking")
         if self.loss_type not in ("cross_entropy", "focal", "bpr", "max_margin"):
             raise ValueError(f"unsupported `loss_type` for LightGCN: {self.loss_type}")
+        if self.num_neighbors is not None and self.num_neighbors <= 0:
+            raise ValueError(
+                f"`num_neighbors` must be positive or None, got {self.num_neighbors}"
+            )
 
     @torch.inference_mode()
     def set_embeddings(self):
@@ -62,6 +62,12 @@ class NCF(TfBase, metaclass=ModelMeta):
     tf_sess_config : dict or None, default: None
         Optional TensorFlow session config, see `ConfigProto options
         <https://github.com/tensorflow/tensorflow/blob/v2.10.0/tensorflow/core/protobuf/config.proto#L431>`_.
+    embed_compression : dict or None, default: None
+        Compressed embedding tables for ``'user'``, ``'item'`` or sparse columns,
+        which reduce the memory of high-cardinality ids and features.
+        See :class:`~libreco.bases.TfBase` for the options.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
@@ -92,8 +98,11 @@ class NCF(TfBase, metaclass=ModelMeta):
         seed=42,
         lower_upper_bound=None,
         tf_sess_config=None,
+        embed_compression=None,
     ):
-        super().__init__(task, data_info, lower_upper_bound, tf_sess_config)
+        super().__init__(
+            task, data_info, lower_upper_bound, tf_sess_config, embed_compression
+        )
 
         self.all_args = locals()
         self.loss_type = loss_type
@@ -124,6 +133,7 @@ class NCF(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_users + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["user"],
         )
         item_embeds = embedding_lookup(
             indices=self.item_indices,
@@ -131,6 +141,7 @@ class NCF(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_items + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["item"],
         )
 
         gmf_layer = tf.multiply(user_embeds, item_embeds)
@@ -55,6 +55,19 @@ class NGCF(EmbedBase, metaclass=ModelMeta, backend="torch"):
         - ``'unconsumed'`` samples items that the target user did not consume before.
         - ``'popular'`` has a higher probability to sample popular items as negative samples.
 
+    subgraph_sampling : bool, default: False
+        Whether to propagate embeddings only over the multi-hop neighborhood of the
+        users and items in each training batch, instead of the whole graph. The full
+        propagation is still used for evaluation and inference.
+
+        .. versionadded:: 1.6.0
+
+    num_neighbors : int or None, default: None
+        Max number of neighbors sampled for every node in each layer when
+        ``subgraph_sampling=True``. None means using all the neighbors.
+
+        .. versionadded:: 1.6.0
+
     seed : int, default: 42
         Random seed.
     device : {'cpu', 'cuda'}, default: 'cuda'
@@ -65,6 +78,13 @@ class NGCF(EmbedBase, metaclass=ModelMeta, backend="torch"):
 
     lower_upper_bound : tuple or None, default: None
         Lower and upper score bound for `rating` task.
+    laplacian_cache_dir : str or None, default: None
+        Directory to cache the normalized adjacency matrix of the user-item graph.
+        The file is named by the fingerprint of the training data, so the matrix
+        is built only once and reused when the model is built again with the same
+        data, e.g. after loading a saved model.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
@@ -91,9 +111,12 @@ class NGCF(EmbedBase, metaclass=ModelMeta, backend="torch"):
         hidden_units=(64, 64, 64),
         margin=1.0,
         sampler="random",
+        subgraph_sampling=False,
+        num_neighbors=None,
         seed=42,
         device="cuda",
         lower_upper_bound=None,
+        laplacian_cache_dir=None,
     ):
         super().__init__(task, data_info, embed_size, lower_upper_bound)
 
@@ -112,8 +135,11 @@ class NGCF(EmbedBase, metaclass=ModelMeta, backend="torch"):
         self.hidden_units = hidden_units_config(hidden_units)
         self.margin = margin
         self.sampler = sampler
+        self.subgraph_sampling = subgraph_sampling
+        self.num_neighbors = num_neighbors
         self.seed = seed
         self.device = device_config(device)
+        self.laplacian_cache_dir = laplacian_cache_dir
         self._check_params()
 
     def build_model(self):
@@ -127,6 +153,10 @@ class NGCF(EmbedBase, metaclass=ModelMeta, backend="torch"):
             self.message_dropout,
             self.user_consumed,
             self.device,
+            self.laplacian_cache_dir,
+            self.subgraph_sampling,
+            self.num_neighbors,
+            self.seed,
         )
 
     def _check_params(self):
@@ -134,6 +164,10 @@ class NGCF(EmbedBase, metaclass=ModelMeta, backend="torch"):
             raise ValueError("NGCF is only suitable for ranking")
         if self.loss_type not in ("cross_entropy", "focal", "bpr", "max_margin"):
             raise ValueError(f"unsupported `loss_type` for NGCF: {self.loss_type}")
+        if self.num_neighbors is not None and self.num_neighbors <= 0:
+            raise ValueError(
+                f"`num_neighbors` must be positive or None, got {self.num_neighbors}"
+            )
 
     @torch.inference_mode()
     def set_embeddings(self):
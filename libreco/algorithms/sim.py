@@ -95,6 +95,12 @@ class SIM(TfBase, metaclass=ModelMeta):
     tf_sess_config : dict or None, default: None
         Optional TensorFlow session config, see `ConfigProto options
         <https://github.com/tensorflow/tensorflow/blob/v2.10.0/tensorflow/core/protobuf/config.proto#L431>`_.
+    embed_compression : dict or None, default: None
+        Compressed embedding tables for ``'user'``, ``'item'`` or sparse columns,
+        which reduce the memory of high-cardinality ids and features.
+        See :class:`~libreco.bases.TfBase` for the options.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
@@ -134,8 +140,11 @@ class SIM(TfBase, metaclass=ModelMeta):
         seed=42,
         lower_upper_bound=None,
         tf_sess_config=None,
+        embed_compression=None,
     ):
-        super().__init__(task, data_info, lower_upper_bound, tf_sess_config)
+        super().__init__(
+            task, data_info, lower_upper_bound, tf_sess_config, embed_compression
+        )
 
         self.all_args = locals()
         self.loss_type = loss_type
@@ -195,7 +204,7 @@ class SIM(TfBase, metaclass=ModelMeta):
         self._build_placeholders()
         other_feats = self._build_features()
         self.seq_feats = tf_dense(self.embed_size, use_bias=False)(
-            combine_seq_features(self.data_info, feat_agg_mode="concat")
+            combine_seq_features(self.data_info, "concat", self.compressed_tables)
         )
         # B * K
         self.target_embeds = tf.nn.embedding_lookup(self.seq_feats, self.item_indices)
@@ -310,6 +319,7 @@ class SIM(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_users + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["user"],
         )
         item_embed = embedding_lookup(
             indices=self.item_indices,
@@ -317,6 +327,7 @@ class SIM(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_items + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["item"],
         )
         concat_embeds = [user_embed, item_embed]
 
@@ -330,6 +341,7 @@ class SIM(TfBase, metaclass=ModelMeta):
                 initializer=tf.glorot_uniform_initializer(),
                 regularizer=self.reg,
                 flatten=True,
+                compression=self.compressed_tables["sparse"],
             )
             concat_embeds.append(sparse_embeds)
         if self.dense:
@@ -1,12 +1,29 @@
 """Implementation of SVD."""
+import logging
+import os
+
 import numpy as np
 
-from ..bases import EmbedBase, ModelMeta
+from ..bases import EmbedBase
+from ..evaluation import print_metrics
 from ..layers import embedding_lookup, normalize_embeds
-from ..tfops import reg_config, sess_config, tf
+from ..recommendation import recommend_from_embedding
+from ..tfops import (
+    rebuild_tf_model,
+    reg_config,
+    sess_config,
+    tf,
+    warm_start_tf_model,
+)
+from ..utils.initializers import truncated_normal
+from ..utils.misc import colorize, time_block
+from ..utils.validate import check_fitting, check_warm_start_model
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+logging.basicConfig(format=LOG_FORMAT)
 
 
-class SVD(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
+class SVD(EmbedBase):
     """*Singular Value Decomposition* algorithm.
 
     Parameters
@@ -55,6 +72,19 @@ class SVD(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
     tf_sess_config : dict or None, default: None
         Optional TensorFlow session config, see `ConfigProto options
         <https://github.com/tensorflow/tensorflow/blob/v2.10.0/tensorflow/core/protobuf/config.proto#L431>`_.
+    backend : {'tensorflow', 'cython'}, default: 'tensorflow'
+        Training backend. The Cython version runs multithreaded Hogwild SGD over the
+        rows of the rating matrix, which is much faster than TensorFlow. It only
+        supports `cross_entropy` loss in `ranking` task, and samples unconsumed items
+        uniformly as negative samples regardless of `sampler`. `batch_size`,
+        `lr_decay` and `epsilon` are not used in Cython version.
+
+        .. versionadded:: 1.6.0
+
+    num_threads : int, default: 1
+        Number of threads used in Cython version.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
@@ -83,24 +113,37 @@ class SVD(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
         seed=42,
         lower_upper_bound=None,
         tf_sess_config=None,
+        backend="tensorflow",
+        num_threads=1,
     ):
         super().__init__(task, data_info, embed_size, lower_upper_bound)
 
         self.all_args = locals()
-        self.sess = sess_config(tf_sess_config)
+        self.backend = check_backend(backend, task, loss_type)
+        if backend == "cython" and norm_embed:
+            raise ValueError("Cython version doesn't support `norm_embed`")
+        if backend == "tensorflow":
+            self.sess = sess_config(tf_sess_config)
         self.loss_type = loss_type
         self.norm_embed = norm_embed
         self.n_epochs = n_epochs
         self.lr = lr
         self.lr_decay = lr_decay
         self.epsilon = epsilon
-        self.reg = reg_config(reg)
+        self.reg = reg_config(reg) if backend == "tensorflow" else reg
         self.batch_size = batch_size
         self.sampler = sampler
         self.num_neg = num_neg
         self.seed = seed
+        self.num_threads = num_threads
 
     def build_model(self):
+        if self.backend == "cython":
+            build_sgd_params(self)
+        else:
+            self._build_model_tf()
+
+    def _build_model_tf(self):
         tf.set_random_seed(self.seed)
         self.user_indices = tf.placeholder(tf.int32, shape=[None])
         self.item_indices = tf.placeholder(tf.int32, shape=[None])
@@ -143,12 +186,56 @@ class SVD(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
             bias_user + bias_item + tf.einsum("ij,ij->i", embed_user, embed_item)
         )
 
+    def fit(
+        self,
+        train_data,
+        neg_sampling,
+        verbose=1,
+        shuffle=True,
+        eval_data=None,
+        metrics=None,
+        k=10,
+        eval_batch_size=8192,
+        eval_user_num=None,
+        **kwargs,
+    ):
+        if self.backend == "cython":
+            fit_cython(
+                self,
+                train_data,
+                neg_sampling,
+                verbose,
+                shuffle,
+                eval_data,
+                metrics,
+                k,
+                eval_batch_size,
+                eval_user_num,
+            )
+        else:
+            super().fit(
+                train_data,
+                neg_sampling,
+                verbose,
+                shuffle,
+                eval_data,
+                metrics,
+                k,
+                eval_batch_size,
+                eval_user_num,
+                **kwargs,
+            )
+
     def set_embeddings(self):
-        with tf.variable_scope("embedding", reuse=True):
-            bu = self.sess.run(tf.get_variable("bu_var"))
-            bi = self.sess.run(tf.get_variable("bi_var"))
-            pu = self.sess.run(tf.get_variable("pu_var"))
-            qi = self.sess.run(tf.get_variable("qi_var"))
+        if self.backend == "cython":
+            bu, bi = self.sgd_params["user_bias"], self.sgd_params["item_bias"]
+            pu, qi = self.sgd_params["user_factors"], self.sgd_params["item_factors"]
+        else:
+            with tf.variable_scope("embedding", reuse=True):
+                bu = self.sess.run(tf.get_variable("bu_var"))
+                bi = self.sess.run(tf.get_variable("bi_var"))
+                pu = self.sess.run(tf.get_variable("pu_var"))
+                qi = self.sess.run(tf.get_variable("qi_var"))
 
         user_bias = np.ones([len(pu), 2], dtype=pu.dtype)
         user_bias[:, 0] = bu
@@ -158,3 +245,186 @@ class SVD(EmbedBase, metaclass=ModelMeta, backend="tensorflow"):
             pu, qi = normalize_embeds(pu, qi, backend="np")
         self.user_embeds_np = np.hstack([pu, user_bias])
         self.item_embeds_np = np.hstack([qi, item_bias])
+
+    def save(self, path, model_name, inference_only=False, **kwargs):
+        super().save(path, model_name, inference_only, **kwargs)
+        if self.backend == "cython" and not inference_only:
+            save_sgd_params(self, path, model_name)
+
+    def rebuild_model(self, path, model_name, full_assign=True):
+        """Assign the saved model variables to the newly initialized model.
+
+        Parameters
+        ----------
+        path : str
+            File folder path for the saved model variables.
+        model_name : str
+            Name of the saved model file.
+        full_assign : bool, default: True
+            Whether to also restore the variables of Adam optimizer.
+            Only used in TensorFlow version.
+        """
+        if self.backend == "cython":
+            rebuild_sgd_params(self, path, model_name)
+        else:
+            rebuild_tf_model(self, path, model_name, full_assign)
+
+    def warm_start_from(self, old_model, full_assign=True):
+        """Assign the variables of the old model in memory to the new model.
+
+        .. versionadded:: 1.6.0
+
+        Parameters
+        ----------
+        old_model : SVD
+            Trained model whose ``data_info`` has been merged into the ``data_info``
+            of the new model by ``merge_trainset``.
+        full_assign : bool, default: True
+            Whether to also restore the variables of Adam optimizer.
+            Only used in TensorFlow version.
+        """
+        if self.backend == "cython":
+            warm_start_sgd_params(self, old_model)
+        else:
+            warm_start_tf_model(self, old_model, full_assign)
+
+
+def check_backend(backend, task, loss_type):
+    if backend not in ("tensorflow", "cython"):
+        raise ValueError(f"`backend` must be `tensorflow` or `cython`, got {backend}")
+    if backend == "cython" and task == "ranking" and loss_type != "cross_entropy":
+        raise ValueError("Cython version only supports `cross_entropy` loss")
+    return backend
+
+
+def build_sgd_params(model, implicit=False):
+    """Initialize the biases and factors trained by the Cython SGD engine."""
+    np_rng = np.random.default_rng(model.seed)
+    names = ["user_factors", "item_factors"]
+    if implicit:
+        names.append("implicit_factors")
+    model.sgd_params = {
+        "user_bias": np.zeros(model.n_users, dtype=np.float32),
+        "item_bias": np.zeros(model.n_items, dtype=np.float32),
+    }
+    for name in names:
+        n = model.n_users if name == "user_factors" else model.n_items
+        model.sgd_params[name] = truncated_normal(
+            np_rng, shape=(n, model.embed_size), mean=0.0, scale=0.03
+        )
+
+
+def save_sgd_params(model, path, model_name):
+    variable_path = os.path.join(path, f"{model_name}_sgd_params")
+    np.savez_compressed(variable_path, **model.sgd_params)
+
+
+def rebuild_sgd_params(model, path, model_name):
+    """Assign the saved parameters of Cython version to the newly built model."""
+    variable_path = os.path.join(path, f"{model_name}_sgd_params.npz")
+    with np.load(variable_path) as variables:
+        assign_old_sgd_params(model, dict(variables.items()))
+
+
+def warm_start_sgd_params(model, old_model):
+    check_warm_start_model(model, old_model)
+    if getattr(old_model, "backend", None) != "cython":
+        raise ValueError("Old model must also be trained by Cython version")
+    assign_old_sgd_params(model, old_model.sgd_params)
+
+
+def assign_old_sgd_params(model, old_params):
+    model.model_built = True
+    model.build_model()
+    # new users and items are appended after the old ones
+    for name, old_param in old_params.items():
+        model.sgd_params[name][: len(old_param)] = old_param
+
+
+def fit_cython(
+    model,
+    train_data,
+    neg_sampling,
+    verbose,
+    shuffle,
+    eval_data,
+    metrics,
+    k,
+    eval_batch_size,
+    eval_user_num,
+    implicit_interaction=None,
+):
+    """Train SVD or SVD++ with the Cython SGD engine.
+
+    ``implicit_interaction`` is the user consumed items in
+    :class:`scipy.sparse.csr_matrix` format, which is only used in SVD++.
+    """
+    try:
+        from ._svd import svd_update
+    except (ImportError, ModuleNotFoundError):
+        logging.warning("SVD cython version is not available")
+        raise
+
+    check_fitting(model, train_data, eval_data, neg_sampling, k)
+    model.show_start_time()
+    if not model.model_built:
+        model.build_model()
+        model.model_built = True
+
+    params = model.sgd_params
+    interaction = train_data.sparse_interaction
+    num_neg = 0
+    if neg_sampling:
+        # all the interactions are positive samples
+        interaction = interaction.copy()
+        interaction.data = np.ones_like(interaction.data)
+        num_neg = model.num_neg
+    for epoch in range(1, model.n_epochs + 1):
+        if shuffle:
+            user_order = model.data_info.np_rng.permutation(model.n_users)
+        else:
+            user_order = np.arange(model.n_users)
+        with time_block(f"Epoch {epoch}", verbose):
+            train_loss = svd_update(
+                sparse_interaction=interaction,
+                user_order=user_order,
+                user_bias=params["user_bias"],
+                item_bias=params["item_bias"],
+                user_factors=params["user_factors"],
+                item_factors=params["item_factors"],
+                lr=model.lr,
+                reg=model.reg or 0.0,
+                task=model.task,
+                num_neg=num_neg,
+                num_threads=model.num_threads,
+                seed=model.seed + epoch,
+                implicit_interaction=implicit_interaction,
+                implicit_factors=params.get("implicit_factors"),
+            )
+        if verbose > 1:
+            train_loss_str = f"train_loss: {train_loss:.4f}"
+            print(f"\t {colorize(train_loss_str, 'green')}")
+            model.set_embeddings()
+            print_metrics(
+                model=model,
+                neg_sampling=neg_sampling,
+                eval_data=eval_data,
+                metrics=metrics,
+                eval_batch_size=eval_batch_size,
+                k=k,
+                sample_user_num=eval_user_num,
+                seed=model.seed,
+            )
+            print("=" * 30)
+
+    model.set_embeddings()
+    model.assign_embedding_oov()
+    model.default_recs = recommend_from_embedding(
+        model=model,
+        user_ids=[model.n_users],
+        n_rec=min(2000, model.n_items),
+        user_embeddings=model.user_embeds_np,
+        item_embeddings=model.item_embeds_np,
+        filter_consumed=False,
+        random_rec=False,
+    ).flatten()
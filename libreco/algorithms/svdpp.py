@@ -1,9 +1,24 @@
 """Implementation of SVD++."""
 import numpy as np
+from scipy.sparse import csr_matrix
 
+from .svd import (
+    build_sgd_params,
+    check_backend,
+    fit_cython,
+    rebuild_sgd_params,
+    save_sgd_params,
+    warm_start_sgd_params,
+)
 from ..bases import EmbedBase
 from ..layers import embedding_lookup, sparse_embeds_pooling
-from ..tfops import rebuild_tf_model, reg_config, sess_config, tf
+from ..tfops import (
+    rebuild_tf_model,
+    reg_config,
+    sess_config,
+    tf,
+    warm_start_tf_model,
+)
 
 
 class SVDpp(EmbedBase):
@@ -53,6 +68,20 @@ class SVDpp(EmbedBase):
     tf_sess_config : dict or None, default: None
         Optional TensorFlow session config, see `ConfigProto options
         <https://github.com/tensorflow/tensorflow/blob/v2.10.0/tensorflow/core/protobuf/config.proto#L431>`_.
+    backend : {'tensorflow', 'cython'}, default: 'tensorflow'
+        Training backend. The Cython version runs multithreaded Hogwild SGD over the
+        rows of the rating matrix, and keeps the implicit feedback sum of each user
+        up to date instead of pooling it in every batch. It only supports
+        `cross_entropy` loss in `ranking` task, and samples unconsumed items
+        uniformly as negative samples regardless of `sampler`. `batch_size`,
+        `lr_decay` and `epsilon` are not used in Cython version.
+
+        .. versionadded:: 1.6.0
+
+    num_threads : int, default: 1
+        Number of threads used in Cython version.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
@@ -81,25 +110,36 @@ class SVDpp(EmbedBase):
         recent_num=30,
         lower_upper_bound=None,
         tf_sess_config=None,
+        backend="tensorflow",
+        num_threads=1,
     ):
         super().__init__(task, data_info, embed_size, lower_upper_bound)
 
         self.all_args = locals()
-        self.sess = sess_config(tf_sess_config)
+        self.backend = check_backend(backend, task, loss_type)
+        if backend == "tensorflow":
+            self.sess = sess_config(tf_sess_config)
         self.loss_type = loss_type
         self.n_epochs = n_epochs
         self.lr = lr
         self.lr_decay = lr_decay
         self.epsilon = epsilon
-        self.reg = reg_config(reg)
+        self.reg = reg_config(reg) if backend == "tensorflow" else reg
         self.batch_size = batch_size
         self.sampler = sampler
         self.num_neg = num_neg
         self.recent_num = recent_num
         self.seed = seed
+        self.num_threads = num_threads
         self.sparse_interaction = None
 
     def build_model(self):
+        if self.backend == "cython":
+            build_sgd_params(self, implicit=True)
+        else:
+            self._build_model_tf()
+
+    def _build_model_tf(self):
         tf.set_random_seed(self.seed)
         self.user_indices = tf.placeholder(tf.int32, shape=[None])
         self.item_indices = tf.placeholder(tf.int32, shape=[None])
@@ -149,6 +189,21 @@ class SVDpp(EmbedBase):
     ):
         if self.sparse_interaction is None:
             self.sparse_interaction = self._set_sparse_interaction()
+        if self.backend == "cython":
+            fit_cython(
+                self,
+                train_data,
+                neg_sampling,
+                verbose,
+                shuffle,
+                eval_data,
+                metrics,
+                k,
+                eval_batch_size,
+                eval_user_num,
+                implicit_interaction=self.sparse_interaction,
+            )
+            return
         super().fit(
             train_data,
             neg_sampling,
@@ -159,15 +214,34 @@ class SVDpp(EmbedBase):
             k,
             eval_batch_size,
             eval_user_num,
+            **kwargs,
         )
 
     def set_embeddings(self):
-        with tf.variable_scope("embedding", reuse=True):
-            bu = self.sess.run(tf.get_variable("bu_var"))
-            bi = self.sess.run(tf.get_variable("bi_var"))
-            qi = self.sess.run(tf.get_variable("qi_var"))
+        if self.backend == "cython":
+            bu, bi = self.sgd_params["user_bias"], self.sgd_params["item_bias"]
+            qi = self.sgd_params["item_factors"]
+            # pu + |N(u)|^-0.5 * sum(yj), same as the `sqrtn` pooling in TensorFlow
+            counts = np.diff(self.sparse_interaction.indptr)
+            implicit = csr_matrix(
+                (
+                    np.repeat(1.0 / np.sqrt(np.maximum(counts, 1)), counts),
+                    self.sparse_interaction.indices,
+                    self.sparse_interaction.indptr,
+                ),
+                shape=(self.n_users, self.n_items),
+                dtype=np.float32,
+            )
+            puj = self.sgd_params["user_factors"] + implicit.dot(
+                self.sgd_params["implicit_factors"]
+            )
+        else:
+            with tf.variable_scope("embedding", reuse=True):
+                bu = self.sess.run(tf.get_variable("bu_var"))
+                bi = self.sess.run(tf.get_variable("bi_var"))
+                qi = self.sess.run(tf.get_variable("qi_var"))
+            puj = self.sess.run(self.all_user_embeds)
 
-        puj = self.sess.run(self.all_user_embeds)
         user_bias = np.ones([len(puj), 2], dtype=puj.dtype)
         user_bias[:, 0] = bu
         item_bias = np.ones([len(qi), 2], dtype=qi.dtype)
@@ -186,6 +260,14 @@ class SVDpp(EmbedBase):
             u_data = items if self.recent_num is None else items[-self.recent_num :]
             indices.extend([u] * len(u_data))
             values.extend(u_data)
+        if self.backend == "cython":
+            counts = np.bincount(indices, minlength=self.n_users)
+            indptr = np.append(0, np.cumsum(counts)).astype(np.int32)
+            values = np.array(values, dtype=np.int32)
+            return csr_matrix(
+                (np.ones(len(values), dtype=np.float32), values, indptr),
+                shape=(self.n_users, self.n_items),
+            )
         indices = np.array(indices)[:, None]
         indices = np.concatenate([indices, np.zeros_like(indices)], axis=1)
         sparse_interaction = tf.SparseTensor(
@@ -213,6 +295,21 @@ class SVDpp(EmbedBase):
         )
         return pu_var + uj
 
+    def save(self, path, model_name, inference_only=False, **kwargs):
+        super().save(path, model_name, inference_only, **kwargs)
+        if self.backend == "cython" and not inference_only:
+            save_sgd_params(self, path, model_name)
+
     def rebuild_model(self, path, model_name, full_assign=False):
         self.sparse_interaction = self._set_sparse_interaction()
-        rebuild_tf_model(self, path, model_name, full_assign)
+        if self.backend == "cython":
+            rebuild_sgd_params(self, path, model_name)
+        else:
+            rebuild_tf_model(self, path, model_name, full_assign)
+
+    def warm_start_from(self, old_model, full_assign=False):
+        self.sparse_interaction = self._set_sparse_interaction()
+        if self.backend == "cython":
+            warm_start_sgd_params(self, old_model)
+        else:
+            warm_start_tf_model(self, old_model, full_assign)
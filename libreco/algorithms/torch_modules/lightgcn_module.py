@@ -1,8 +1,8 @@
-import numpy as np
 import torch
-from scipy import sparse as ssp
 from torch import nn as nn
 
+from ...graph.laplacian import PropagationSampler, load_laplacian_matrix
+
 
 class LightGCNModel(nn.Module):
     def __init__(
@@ -14,6 +14,10 @@ class LightGCNModel(nn.Module):
         dropout_rate,
         user_consumed,
         device,
+        cache_dir=None,
+        subgraph_sampling=False,
+        num_neighbors=None,
+        seed=42,
     ):
         super(LightGCNModel, self).__init__()
         self.n_users = n_users
@@ -23,8 +27,16 @@ class LightGCNModel(nn.Module):
         self.dropout_rate = dropout_rate
         self.user_consumed = user_consumed
         self.device = device
+        self.cache_dir = cache_dir
         self.user_init_embeds, self.item_init_embeds = self.init_embeds()
         self.laplacian_matrix = self._build_laplacian_matrix()
+        self.subgraph_sampler = (
+            PropagationSampler(
+                self.laplacian_matrix, n_layers, num_neighbors, device, seed
+            )
+            if subgraph_sampling
+            else None
+        )
 
     def init_embeds(self):
         user_embeds = nn.Embedding(self.n_users, self.embed_size)
@@ -34,34 +46,21 @@ class LightGCNModel(nn.Module):
         return user_embeds.to(self.device), item_embeds.to(self.device)
 
     def _build_laplacian_matrix(self):
-        R = ssp.dok_matrix((self.n_users, self.n_items), dtype=np.float32)
-        for u in range(self.n_users):
-            items = self.user_consumed[u]
-            R[u, items] = 1.0
-        R = R.tolil()
-
-        adj_matrix = ssp.lil_matrix(
-            (self.n_users + self.n_items, self.n_items + self.n_users), dtype=np.float32
-        )
-        adj_matrix[: self.n_users, self.n_users :] = R
-        adj_matrix[self.n_users :, : self.n_users] = R.T
-        adj_matrix = adj_matrix.tocsr()
-
-        row_sum = np.array(adj_matrix.sum(axis=1))
-        diag_inv = np.power(row_sum, -0.5).flatten()
-        diag_inv[np.isinf(diag_inv)] = 0.0
-        diag_matrix_inv = ssp.diags(diag_inv)
-
-        coo = diag_matrix_inv.dot(adj_matrix).dot(diag_matrix_inv).tocoo()
-        indices = torch.from_numpy(np.array([coo.row, coo.col]))
-        values = torch.from_numpy(coo.data)
-        laplacian_matrix = torch.sparse_coo_tensor(
-            indices, values, coo.shape, dtype=torch.float32, device=self.device
+        return load_laplacian_matrix(
+            self.user_consumed,
+            self.n_users,
+            self.n_items,
+            self.device,
+            norm="symmetric",
+            self_loop=False,
+            cache_dir=self.cache_dir,
         )
-        return laplacian_matrix
 
-    def forward(self, use_dropout):
-        return self.embedding_propagation(use_dropout=use_dropout)
+    def forward(self, users, items, use_dropout):
+        if self.subgraph_sampler is not None:
+            return self.subgraph_propagation(users, items, use_dropout)
+        user_embeds, item_embeds = self.embedding_propagation(use_dropout=use_dropout)
+        return user_embeds[users], item_embeds[items]
 
     def embedding_propagation(self, use_dropout):
         if use_dropout and self.dropout_rate > 0:
@@ -87,6 +86,33 @@ class LightGCNModel(nn.Module):
         )
         return user_embeds, item_embeds
 
+    def subgraph_propagation(self, users, items, use_dropout):
+        """Propagate only over the sampled neighborhood of ``users`` and ``items``."""
+        nodes = torch.cat([users, items + self.n_users])
+        target_nodes, inverse = torch.unique(nodes, return_inverse=True)
+        input_nodes, blocks = self.subgraph_sampler(target_nodes.cpu().numpy())
+        h = self.get_init_embeds(torch.from_numpy(input_nodes).to(self.device))
+        n_targets = len(target_nodes)
+        all_embeddings = [h[:n_targets]]
+        for block in blocks:
+            if use_dropout and self.dropout_rate > 0:
+                block = self.sparse_dropout(block, block._nnz())
+            h = torch.sparse.mm(block, h)
+            all_embeddings.append(h[:n_targets])
+
+        all_embeddings = torch.stack(all_embeddings, dim=1)
+        all_embeddings = torch.mean(all_embeddings, dim=1)[inverse]
+        return torch.split(all_embeddings, [len(users), len(items)])
+
+    def get_init_embeds(self, nodes):
+        is_user = nodes < self.n_users
+        embeds = torch.empty(
+            len(nodes), self.embed_size, device=self.device, dtype=torch.float32
+        )
+        embeds[is_user] = self.user_init_embeds(nodes[is_user])
+        embeds[~is_user] = self.item_init_embeds(nodes[~is_user] - self.n_users)
+        return embeds
+
     def sparse_dropout(self, x, noise_shape):
         keep_prob = 1 - self.dropout_rate
         random_tensor = (torch.rand(noise_shape) + keep_prob).to(x.device)
@@ -1,9 +1,9 @@
-import numpy as np
 import torch
-from scipy import sparse as ssp
 from torch import nn as nn
 from torch.nn import functional as F
 
+from ...graph.laplacian import PropagationSampler, load_laplacian_matrix
+
 
 class NGCFModel(nn.Module):
     def __init__(
@@ -16,6 +16,10 @@ class NGCFModel(nn.Module):
         message_dropout,
         user_consumed,
         device,
+        cache_dir=None,
+        subgraph_sampling=False,
+        num_neighbors=None,
+        seed=42,
     ):
         super(NGCFModel, self).__init__()
         self.n_users = n_users
@@ -26,8 +30,16 @@ class NGCFModel(nn.Module):
         self.message_dropout = message_dropout
         self.user_consumed = user_consumed
         self.device = device
+        self.cache_dir = cache_dir
         self.embedding_dict, self.weight_dict = self.init_weights()
         self.laplacian_matrix = self._build_laplacian_matrix()
+        self.subgraph_sampler = (
+            PropagationSampler(
+                self.laplacian_matrix, len(layers), num_neighbors, device, seed
+            )
+            if subgraph_sampling
+            else None
+        )
 
     def init_weights(self):
         embedding_dict = nn.ParameterDict(
@@ -59,34 +71,21 @@ class NGCFModel(nn.Module):
         return embedding_dict.to(self.device), weight_dict.to(self.device)
 
     def _build_laplacian_matrix(self):
-        R = ssp.dok_matrix((self.n_users, self.n_items), dtype=np.float32)
-        for u in range(self.n_users):
-            items = self.user_consumed[u]
-            R[u, items] = 1.0
-        R = R.tolil()
-
-        adj_matrix = ssp.lil_matrix(
-            (self.n_users + self.n_items, self.n_items + self.n_users), dtype=np.float32
-        )
-        adj_matrix[: self.n_users, self.n_users :] = R
-        adj_matrix[self.n_users :, : self.n_users] = R.T
-        adj_matrix = adj_matrix.tocsr() + ssp.eye(adj_matrix.shape[0])
-
-        row_sum = np.array(adj_matrix.sum(axis=1))
-        diag_inv = np.power(row_sum, -1).flatten()
-        diag_inv[np.isinf(diag_inv)] = 0.0
-        diag_matrix_inv = ssp.diags(diag_inv)
-
-        coo = diag_matrix_inv.dot(adj_matrix).tocoo()
-        indices = torch.from_numpy(np.array([coo.row, coo.col]))
-        values = torch.from_numpy(coo.data)
-        laplacian_matrix = torch.sparse_coo_tensor(
-            indices, values, coo.shape, dtype=torch.float32, device=self.device
+        return load_laplacian_matrix(
+            self.user_consumed,
+            self.n_users,
+            self.n_items,
+            self.device,
+            norm="left",
+            self_loop=True,
+            cache_dir=self.cache_dir,
         )
-        return laplacian_matrix
 
-    def forward(self, use_dropout):
-        return self.embedding_propagation(use_dropout=use_dropout)
+    def forward(self, users, items, use_dropout):
+        if self.subgraph_sampler is not None:
+            return self.subgraph_propagation(users, items, use_dropout)
+        user_embeds, item_embeds = self.embedding_propagation(use_dropout=use_dropout)
+        return user_embeds[users], item_embeds[items]
 
     def embedding_propagation(self, use_dropout):
         if use_dropout and self.node_dropout > 0:
@@ -104,23 +103,9 @@ class NGCFModel(nn.Module):
         ]
         for k in range(len(self.layers)):
             side_embeddings = torch.sparse.mm(laplacian_norm, all_embeddings[-1])
-            self_embeddings = (
-                torch.matmul(side_embeddings, self.weight_dict[f"W_self_{k}"])
-                + self.weight_dict[f"b_self_{k}"]
-            )
-            pair_embeddings = (
-                torch.matmul(
-                    torch.mul(side_embeddings, all_embeddings[-1]),
-                    self.weight_dict[f"W_pair_{k}"],
-                )
-                + self.weight_dict[f"b_pair_{k}"]
+            norm_embeddings = self.aggregate(
+                k, side_embeddings, all_embeddings[-1], use_dropout
             )
-            embed_messages = F.leaky_relu(
-                self_embeddings + pair_embeddings, negative_slope=0.2
-            )
-            if use_dropout and self.message_dropout > 0:
-                embed_messages = F.dropout(embed_messages, p=self.message_dropout)
-            norm_embeddings = F.normalize(embed_messages, p=2, dim=1)
             all_embeddings.append(norm_embeddings)
 
         all_embeddings = torch.cat(all_embeddings, dim=1)
@@ -128,6 +113,55 @@ class NGCFModel(nn.Module):
         item_embeds = all_embeddings[self.n_users :]
         return user_embeds, item_embeds
 
+    def subgraph_propagation(self, users, items, use_dropout):
+        """Propagate only over the sampled neighborhood of ``users`` and ``items``."""
+        nodes = torch.cat([users, items + self.n_users])
+        target_nodes, inverse = torch.unique(nodes, return_inverse=True)
+        input_nodes, blocks = self.subgraph_sampler(target_nodes.cpu().numpy())
+        h = self.get_init_embeds(torch.from_numpy(input_nodes).to(self.device))
+        n_targets = len(target_nodes)
+        all_embeddings = [h[:n_targets]]
+        for k, block in enumerate(blocks):
+            if use_dropout and self.node_dropout > 0:
+                block = self.sparse_dropout(block, block._nnz())
+            side_embeddings = torch.sparse.mm(block, h)
+            ego_embeddings = h[: block.shape[0]]
+            h = self.aggregate(k, side_embeddings, ego_embeddings, use_dropout)
+            all_embeddings.append(h[:n_targets])
+
+        all_embeddings = torch.cat(all_embeddings, dim=1)[inverse]
+        return torch.split(all_embeddings, [len(users), len(items)])
+
+    def aggregate(self, k, side_embeddings, ego_embeddings, use_dropout):
+        self_embeddings = (
+            torch.matmul(side_embeddings, self.weight_dict[f"W_self_{k}"])
+            + self.weight_dict[f"b_self_{k}"]
+        )
+        pair_embeddings = (
+            torch.matmul(
+                torch.mul(side_embeddings, ego_embeddings),
+                self.weight_dict[f"W_pair_{k}"],
+            )
+            + self.weight_dict[f"b_pair_{k}"]
+        )
+        embed_messages = F.leaky_relu(
+            self_embeddings + pair_embeddings, negative_slope=0.2
+        )
+        if use_dropout and self.message_dropout > 0:
+            embed_messages = F.dropout(embed_messages, p=self.message_dropout)
+        return F.normalize(embed_messages, p=2, dim=1)
+
+    def get_init_embeds(self, nodes):
+        is_user = nodes < self.n_users
+        embeds = torch.empty(
+            len(nodes), self.embed_size, device=self.device, dtype=torch.float32
+        )
+        embeds[is_user] = self.embedding_dict["user_embed"][nodes[is_user]]
+        embeds[~is_user] = self.embedding_dict["item_embed"][
+            nodes[~is_user] - self.n_users
+        ]
+        return embeds
+
     def sparse_dropout(self, x, noise_shape):
         keep_prob = 1 - self.node_dropout
         random_tensor = (torch.rand(noise_shape) + keep_prob).to(x.device)
@@ -106,6 +106,12 @@ class Transformer(TfBase, metaclass=ModelMeta):
     tf_sess_config : dict or None, default: None
         Optional TensorFlow session config, see `ConfigProto options
         <https://github.com/tensorflow/tensorflow/blob/v2.10.0/tensorflow/core/protobuf/config.proto#L431>`_.
+    embed_compression : dict or None, default: None
+        Compressed embedding tables for ``'user'``, ``'item'`` or sparse columns,
+        which reduce the memory of high-cardinality ids and features.
+        See :class:`~libreco.bases.TfBase` for the options.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
@@ -152,8 +158,11 @@ class Transformer(TfBase, metaclass=ModelMeta):
         seed=42,
         lower_upper_bound=None,
         tf_sess_config=None,
+        embed_compression=None,
     ):
-        super().__init__(task, data_info, lower_upper_bound, tf_sess_config)
+        super().__init__(
+            task, data_info, lower_upper_bound, tf_sess_config, embed_compression
+        )
 
         self.all_args = locals()
         self.loss_type = loss_type
@@ -209,6 +218,7 @@ class Transformer(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_users + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["user"],
         )
         item_embed = embedding_lookup(
             indices=self.item_indices,
@@ -216,6 +226,7 @@ class Transformer(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_items + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["item"],
         )
         concat_embeds = [user_embed, item_embed]
 
@@ -229,6 +240,7 @@ class Transformer(TfBase, metaclass=ModelMeta):
                 initializer=tf.glorot_uniform_initializer(),
                 regularizer=self.reg,
                 flatten=True,
+                compression=self.compressed_tables["sparse"],
             )
             concat_embeds.append(sparse_embed)
         if self.dense:
@@ -242,7 +254,9 @@ class Transformer(TfBase, metaclass=ModelMeta):
             )
             concat_embeds.append(dense_embed)
 
-        self.seq_feats = combine_seq_features(self.data_info, self.feat_agg_mode)
+        self.seq_feats = combine_seq_features(
+            self.data_info, self.feat_agg_mode, self.compressed_tables
+        )
         seq_embeds = self._build_seq_repr()
         dense_inputs = tf.concat([*concat_embeds, seq_embeds], axis=1)
         mlp_layer = dense_nn(
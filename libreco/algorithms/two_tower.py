@@ -421,6 +421,7 @@ class TwoTower(DynEmbedBase, metaclass=ModelMeta, backend="tensorflow"):
         eval_batch_size=8192,
         eval_user_num=None,
         num_workers=0,
+        prefetch_batches=0,
     ):
         if self.loss_type == "softmax" and self.use_correction:
             if not self.data_info.old_info:
@@ -447,6 +448,8 @@ class TwoTower(DynEmbedBase, metaclass=ModelMeta, backend="tensorflow"):
             k,
             eval_batch_size,
             eval_user_num,
+            num_workers,
+            prefetch_batches,
         )
 
     def set_embeddings(self):
@@ -76,6 +76,12 @@ class WideDeep(TfBase, metaclass=ModelMeta):
     tf_sess_config : dict or None, default: None
         Optional TensorFlow session config, see `ConfigProto options
         <https://github.com/tensorflow/tensorflow/blob/v2.10.0/tensorflow/core/protobuf/config.proto#L431>`_.
+    embed_compression : dict or None, default: None
+        Compressed embedding tables for ``'user'``, ``'item'`` or sparse columns,
+        which reduce the memory of high-cardinality ids and features.
+        See :class:`~libreco.bases.TfBase` for the options.
+
+        .. versionadded:: 1.6.0
 
     Notes
     -----
@@ -116,8 +122,11 @@ class WideDeep(TfBase, metaclass=ModelMeta):
         seed=42,
         lower_upper_bound=None,
         tf_sess_config=None,
+        embed_compression=None,
     ):
-        super().__init__(task, data_info, lower_upper_bound, tf_sess_config)
+        super().__init__(
+            task, data_info, lower_upper_bound, tf_sess_config, embed_compression
+        )
 
         self.all_args = locals()
         self.loss_type = loss_type
@@ -187,6 +196,7 @@ class WideDeep(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_users + 1, 1),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["user"],
         )
         wide_item_embed = embedding_lookup(
             indices=self.item_indices,
@@ -194,6 +204,7 @@ class WideDeep(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_items + 1, 1),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["item"],
         )
         deep_user_embed = embedding_lookup(
             indices=self.user_indices,
@@ -201,6 +212,7 @@ class WideDeep(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_users + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["user"],
         )
         deep_item_embed = embedding_lookup(
             indices=self.item_indices,
@@ -208,6 +220,7 @@ class WideDeep(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_items + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["item"],
         )
 
         self.wide_embed.extend([wide_user_embed, wide_item_embed])
@@ -225,6 +238,7 @@ class WideDeep(TfBase, metaclass=ModelMeta):
             var_shape=[self.sparse_feature_size],
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["sparse"],
         )
         deep_sparse_embed = compute_sparse_feats(
             self.data_info,
@@ -235,6 +249,7 @@ class WideDeep(TfBase, metaclass=ModelMeta):
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
             flatten=True,
+            compression=self.compressed_tables["sparse"],
         )
         self.wide_embed.append(wide_sparse_embed)
         self.deep_embed.append(deep_sparse_embed)
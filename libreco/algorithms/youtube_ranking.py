@@ -89,6 +89,12 @@ class YouTubeRanking(TfBase, metaclass=ModelMeta):
     tf_sess_config : dict or None, default: None
         Optional TensorFlow session config, see `ConfigProto options
         <https://github.com/tensorflow/tensorflow/blob/v2.10.0/tensorflow/core/protobuf/config.proto#L431>`_.
+    embed_compression : dict or None, default: None
+        Compressed embedding tables for ``'user'``, ``'item'`` or sparse columns,
+        which reduce the memory of high-cardinality ids and features.
+        See :class:`~libreco.bases.TfBase` for the options.
+
+        .. versionadded:: 1.6.0
 
     References
     ----------
@@ -124,8 +130,11 @@ class YouTubeRanking(TfBase, metaclass=ModelMeta):
         seed=42,
         lower_upper_bound=None,
         tf_sess_config=None,
+        embed_compression=None,
     ):
-        super().__init__(task, data_info, lower_upper_bound, tf_sess_config)
+        super().__init__(
+            task, data_info, lower_upper_bound, tf_sess_config, embed_compression
+        )
 
         assert task == "ranking", "YouTube models is only suitable for ranking"
         self.all_args = locals()
@@ -181,6 +190,7 @@ class YouTubeRanking(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_users + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["user"],
         )
         item_embed = embedding_lookup(
             indices=self.item_indices,
@@ -188,6 +198,7 @@ class YouTubeRanking(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_items + 1, self.embed_size),
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
+            compression=self.compressed_tables["item"],
         )
         pooled_embed = seq_embeds_pooling(
             self.user_interacted_seq,
@@ -197,6 +208,7 @@ class YouTubeRanking(TfBase, metaclass=ModelMeta):
             var_shape=(self.n_items + 1, self.embed_size),
             reuse_layer=True,
             scope_name="embedding",
+            compression=self.compressed_tables["item"],
         )
         self.concat_embed = [user_embed, item_embed, pooled_embed]
 
@@ -230,6 +242,7 @@ class YouTubeRanking(TfBase, metaclass=ModelMeta):
             initializer=tf.glorot_uniform_initializer(),
             regularizer=self.reg,
             flatten=True,
+            compression=self.compressed_tables["sparse"],
         )
         self.concat_embed.append(sparse_embed)
 
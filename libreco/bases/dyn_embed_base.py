@@ -137,6 +137,7 @@ class DynEmbedBase(EmbedBase):
             )
 
         check_dynamic_rec_feats(self.model_name, user, user_feats, seq)
+        self.refresh_embeddings()
         user_embed = self.dyn_user_embedding(
             user, user_feats=user_feats, seq=seq, include_bias=True, inner_id=inner_id
         )
@@ -306,6 +307,7 @@ class DynEmbedBase(EmbedBase):
     def save(self, path, model_name, inference_only=False, **_):
         super().save(path, model_name, inference_only=False)
         if inference_only:
+            self.refresh_embeddings()
             embed_path = os.path.join(path, model_name)
             np.savez_compressed(
                 file=embed_path,
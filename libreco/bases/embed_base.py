@@ -9,6 +9,7 @@ from .base import Base
 from ..prediction import predict_from_embedding
 from ..recommendation import cold_start_rec, construct_rec, recommend_from_embedding
 from ..training.dispatch import get_trainer
+from ..training.stream import build_stream_data
 from ..utils.misc import colorize
 from ..utils.save_load import (
     load_default_recs,
@@ -18,7 +19,12 @@ from ..utils.save_load import (
     save_tf_variables,
     save_torch_state_dict,
 )
-from ..utils.validate import check_fitting, check_unknown_user
+from ..utils.validate import (
+    check_fitting,
+    check_labels,
+    check_partial_fitting,
+    check_unknown_user,
+)
 
 
 class EmbedBase(Base):
@@ -56,6 +62,7 @@ class EmbedBase(Base):
         self.model_built = False
         self.trainer = None
         self.loaded = False
+        self.embeds_stale = False
 
     @abc.abstractmethod
     def build_model(self):
@@ -73,6 +80,7 @@ class EmbedBase(Base):
         eval_batch_size=8192,
         eval_user_num=None,
         num_workers=0,
+        prefetch_batches=0,
     ):
         """Fit embed model on the training data.
 
@@ -96,8 +104,18 @@ class EmbedBase(Base):
             - ``verbose == 1``: Print progress bar and training time.
             - ``verbose > 1`` : Print evaluation metrics if ``eval_data`` is provided.
 
-        shuffle : bool, default: True
+        shuffle : bool or {'block'}, default: True
             Whether to shuffle the training data.
+
+            - ``True``: Draw a random permutation of rows in every epoch.
+            - ``'block'``: Reorder the rows into new arrays in every epoch, then every
+              batch is a contiguous slice of them. It replaces the gathers of every
+              batch with one gather per epoch, at the cost of holding the training
+              data twice while the rows are reordered.
+
+            .. versionchanged:: 1.6.0
+               Added the ``'block'`` mode.
+
         eval_data : :class:`~libreco.data.TransformedSet` object, default: None
             Data object used for evaluating.
         metrics : list or None, default: None
@@ -120,6 +138,12 @@ class EmbedBase(Base):
                Using multiprocessing(``num_workers`` > 0) may consume more memory than
                single processing. See `Multi-process data loading <https://pytorch.org/docs/stable/data.html#multi-process-data-loading>`_.
 
+        prefetch_batches : int, default: 0
+            Number of batches prepared ahead in a background thread, so that data loading
+            overlaps with training steps. 0 means no prefetching.
+
+            .. versionadded:: 1.6.0
+
         Raises
         ------
         RuntimeError
@@ -145,6 +169,7 @@ class EmbedBase(Base):
             eval_batch_size,
             eval_user_num,
             num_workers,
+            prefetch_batches,
         )
 
         if self.user_embeds_np is None:
@@ -160,6 +185,54 @@ class EmbedBase(Base):
             random_rec=False,
         ).flatten()
 
+    def partial_fit(self, data, neg_sampling, max_steps=None):
+        """Update the model with a batch of new data, e.g. micro-batches from a stream.
+
+        The rows are encoded with the current ``data_info``, then the model is trained
+        on them once in arriving order. The embeddings for inference are recomputed
+        lazily, i.e. on the next prediction or recommendation.
+
+        .. versionadded:: 1.6.0
+
+        Parameters
+        ----------
+        data : pandas.DataFrame
+            New data with ``user``, ``item`` and ``label`` columns. Rows with unknown
+            users or items are skipped. In order to train on them, merge the data with
+            ``merge_trainset`` and use ``warm_start_from`` in a new model.
+        neg_sampling : bool
+            Whether to perform negative sampling for the new data.
+        max_steps : int or None, default: None
+            Maximum number of optimizer steps. None means all the batches of the data.
+
+        Returns
+        -------
+        float or None
+            Mean training loss, None if there is no known row in the data.
+
+        Raises
+        ------
+        RuntimeError
+            If the model has not been trained or rebuilt, or it is a loaded model.
+        ValueError
+            If the model can't be trained incrementally, e.g. `ALS`.
+        """
+        check_partial_fitting(self, neg_sampling)
+        train_data = build_stream_data(self, data)
+        if train_data is None:
+            return None
+        check_labels(self, train_data.labels, neg_sampling)
+        loss = self.trainer.partial_run(train_data, neg_sampling, max_steps)
+        self.embeds_stale = True
+        return loss
+
+    def refresh_embeddings(self):
+        """Recompute the embeddings if the model has been updated by ``partial_fit``."""
+        if self.embeds_stale:
+            self.set_embeddings()
+            self.assign_embedding_oov()
+            self.embeds_stale = False
+
     def predict(self, user, item, cold_start="average", inner_id=False):
         """Make prediction(s) on given user(s) and item(s).
 
@@ -185,6 +258,7 @@ class EmbedBase(Base):
         prediction : float or numpy.ndarray
             Predicted scores for each user-item pair.
         """
+        self.refresh_embeddings()
         return predict_from_embedding(self, user, item, cold_start, inner_id)
 
     def recommend_user(
@@ -224,6 +298,7 @@ class EmbedBase(Base):
         recommendation : dict of {Union[int, str, array_like] : numpy.ndarray}
             Recommendation result with user ids as keys and array_like recommended items as values.
         """
+        self.refresh_embeddings()
         result_recs = dict()
         user_ids, unknown_users = check_unknown_user(self.data_info, user, inner_id)
         if unknown_users:
@@ -287,6 +362,7 @@ class EmbedBase(Base):
         save_params(self, path, model_name)
         save_default_recs(self, path, model_name)
         if inference_only:
+            self.refresh_embeddings()
             variable_path = os.path.join(path, model_name)
             np.savez_compressed(
                 file=variable_path,
@@ -365,6 +441,7 @@ class EmbedBase(Base):
         assert (
             self.user_embeds_np is not None
         ), "call `model.fit()` before getting user embeddings"
+        self.refresh_embeddings()
         user_embeds = (
             self.user_embeds_np[:-1]
             if include_bias
@@ -401,6 +478,7 @@ class EmbedBase(Base):
         assert (
             self.item_embeds_np is not None
         ), "call `model.fit()` before getting item embeddings"
+        self.refresh_embeddings()
         item_embeds = (
             self.item_embeds_np[:-1]
             if include_bias
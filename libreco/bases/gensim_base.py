@@ -1,5 +1,7 @@
 import abc
 import os
+import tempfile
+import weakref
 
 import numpy as np
 from gensim.models import Word2Vec
@@ -16,6 +18,12 @@ class GensimBase(EmbedBase):
     """Base class for models that use Gensim for training.
 
     Including Item2Vec and Deepwalk.
+
+    If ``corpus_dir`` is provided, the training sequences are serialized once by
+    :meth:`write_corpus` into a file in `LineSentence` format, and the model is
+    trained with gensim's ``corpus_file`` mode, which scales better with
+    ``n_threads`` than a Python iterable. The model owns the file, which is removed
+    when the model is garbage collected, or when :meth:`remove_corpus` is called.
     """
 
     def __init__(
@@ -29,6 +37,7 @@ class GensimBase(EmbedBase):
         n_threads=0,
         seed=42,
         lower_upper_bound=None,
+        corpus_dir=None,
     ):
         super().__init__(task, data_info, embed_size, lower_upper_bound)
         self.norm_embed = norm_embed
@@ -36,13 +45,45 @@ class GensimBase(EmbedBase):
         self.n_epochs = n_epochs
         self.workers = os.cpu_count() if not n_threads else n_threads
         self.seed = seed
+        self.corpus_dir = corpus_dir
         self.gensim_model = None
         self.data = None
+        self._corpus_finalizer = None
 
     @abc.abstractmethod
     def get_data(self):
         raise NotImplementedError
 
+    def write_corpus(self, f):
+        """Write the training sequences to a binary file in `LineSentence` format."""
+        raise NotImplementedError(
+            f"{self.model_name} doesn't support training from `corpus_dir`"
+        )
+
+    def build_corpus(self):
+        """Write the sequences from :meth:`write_corpus` to a new file in ``corpus_dir``.
+
+        Returns the path of the corpus file.
+        """
+        self.remove_corpus()
+        fd, corpus_file = tempfile.mkstemp(
+            suffix=".txt", prefix=f"{self.model_name.lower()}_", dir=self.corpus_dir
+        )
+        self._corpus_finalizer = weakref.finalize(
+            self, _remove_file, corpus_file, os.getpid()
+        )
+        with os.fdopen(fd, "wb") as f:
+            self.write_corpus(f)
+        return corpus_file
+
+    def remove_corpus(self):
+        """Remove the corpus file written in ``corpus_dir``, if any."""
+        if self._corpus_finalizer is not None:
+            self._corpus_finalizer()
+            self._corpus_finalizer = None
+            if isinstance(self.data, str):
+                self.data = None
+
     def fit(
         self,
         train_data,
@@ -58,14 +99,17 @@ class GensimBase(EmbedBase):
     ):
         check_fitting(self, train_data, eval_data, neg_sampling, k)
         self.show_start_time()
-        if self.data is None:
+        if self.data is None and self.corpus_dir is None:
             self.data = self.get_data()
+        elif self.data is None:
+            self.data = self.build_corpus()
         if self.gensim_model is None:
             self.gensim_model = self.build_model()
         with time_block("gensim word2vec training", verbose):
             self.gensim_model.train(
-                self.data,
+                **self.corpus_kwargs(),
                 total_examples=self.gensim_model.corpus_count,
+                total_words=self.gensim_model.corpus_total_words,
                 epochs=self.n_epochs,
             )
         self.set_embeddings()
@@ -93,6 +137,12 @@ class GensimBase(EmbedBase):
             )
             print("=" * 30)
 
+    def corpus_kwargs(self):
+        """Keyword arguments that pass the training data to gensim."""
+        if isinstance(self.data, str):
+            return {"corpus_file": self.data}
+        return {"corpus_iterable": self.data}
+
     def set_embeddings(self):
         self.item_embeds_np = np.array(
             [
@@ -138,6 +188,10 @@ class GensimBase(EmbedBase):
         This method is used before retraining the new model, in order to avoid training
         from scratch every time we get some new data.
 
+        If ``corpus_dir`` is provided, a new corpus is written from the consumed
+        sequences in the merged ``data_info``, same as the data used without
+        ``corpus_dir``.
+
         Parameters
         ----------
         path : str
@@ -145,7 +199,40 @@ class GensimBase(EmbedBase):
         model_name : str
             Name of the saved model file.
         """
-        self.data = self.get_data()
+        if self.corpus_dir is None:
+            self.data = self.get_data()
+        else:
+            self.data = self.build_corpus()
         model_path = os.path.join(path, f"{model_name}_gensim.pkl")
         self.gensim_model = Word2Vec.load(model_path)
-        self.gensim_model.build_vocab(self.data, update=True)
+        self.gensim_model.build_vocab(**self.corpus_kwargs(), update=True)
+
+
+def _remove_file(path, pid):
+    # processes forked for generating walks inherit the finalizer
+    if os.getpid() == pid and os.path.exists(path):
+        os.remove(path)
+
+
+def encode_line_sentences(tokens, lengths, vocab_size):
+    """Encode integer sequences into bytes of gensim `LineSentence` format.
+
+    Parameters
+    ----------
+    tokens : numpy.ndarray
+        Concatenated tokens of all the sequences, ranging in ``[0, vocab_size)``.
+    lengths : numpy.ndarray
+        Length of each sequence, which should be positive.
+    vocab_size : int
+        Number of distinct tokens.
+
+    Returns
+    -------
+    bytes
+        Sequences separated by newlines, with tokens separated by spaces.
+    """
+    words = [f"{i} " for i in range(vocab_size)] + [f"{i}\n" for i in range(vocab_size)]
+    is_end = np.zeros(len(tokens), dtype=np.int64)
+    is_end[np.cumsum(lengths) - 1] = vocab_size
+    words = np.array(words, dtype=object)[tokens + is_end]
+    return "".join(words.tolist()).encode()
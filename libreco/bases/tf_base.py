@@ -5,6 +5,7 @@ import os
 import numpy as np
 
 from .base import Base
+from ..layers.compression import get_compressed_tables
 from ..prediction import predict_tf_feat
 from ..recommendation import (
     check_dynamic_rec_feats,
@@ -14,6 +15,7 @@ from ..recommendation import (
 )
 from ..tfops import modify_variable_names, sess_config, tf
 from ..training.dispatch import get_trainer
+from ..training.stream import build_stream_data
 from ..utils.save_load import (
     load_tf_model,
     load_tf_variables,
@@ -22,7 +24,12 @@ from ..utils.save_load import (
     save_tf_model,
     save_tf_variables,
 )
-from ..utils.validate import check_fitting, check_unknown_user
+from ..utils.validate import (
+    check_fitting,
+    check_labels,
+    check_partial_fitting,
+    check_unknown_user,
+)
 
 
 class TfBase(Base):
@@ -43,11 +50,34 @@ class TfBase(Base):
     tf_sess_config : dict or None
         Optional TensorFlow session config, see `ConfigProto options
         <https://github.com/tensorflow/tensorflow/blob/v2.10.0/tensorflow/core/protobuf/config.proto#L431>`_.
+    embed_compression : dict or None, default: None
+        Compressed embedding tables for ``'user'``, ``'item'`` or sparse columns,
+        e.g. ``{"user": {"method": "hash", "num_buckets": 100000, "num_hashes": 2},
+        "city": {"method": "qr", "num_buckets": 1000}}``.
+
+        - ``'hash'`` maps every id to ``num_hashes`` rows among ``num_buckets`` rows
+          by different hash functions, and sums the rows.
+        - ``'qr'`` uses the quotient-remainder trick, the row of ``id % num_buckets``
+          and the row of ``id // num_buckets`` are multiplied element-wise.
+
+        A multi-sparse field is compressed if any of its columns is specified.
+        Unknown ids share the rows with known ids in a compressed table.
+
+        .. versionadded:: 1.6.0
     """
 
-    def __init__(self, task, data_info, lower_upper_bound=None, tf_sess_config=None):
+    def __init__(
+        self,
+        task,
+        data_info,
+        lower_upper_bound=None,
+        tf_sess_config=None,
+        embed_compression=None,
+    ):
         super().__init__(task, data_info, lower_upper_bound)
         self.sess = sess_config(tf_sess_config)
+        self.embed_compression = embed_compression
+        self.compressed_tables = get_compressed_tables(data_info, embed_compression)
         self.model_built = False
         self.trainer = None
         self.loaded = False
@@ -68,6 +98,7 @@ class TfBase(Base):
         eval_batch_size=8192,
         eval_user_num=None,
         num_workers=0,
+        prefetch_batches=0,
     ):
         """Fit TF model on the training data.
 
@@ -91,8 +122,18 @@ class TfBase(Base):
             - ``verbose == 1``: Print progress bar and training time.
             - ``verbose > 1`` : Print evaluation metrics if ``eval_data`` is provided.
 
-        shuffle : bool, default: True
+        shuffle : bool or {'block'}, default: True
             Whether to shuffle the training data.
+
+            - ``True``: Draw a random permutation of rows in every epoch.
+            - ``'block'``: Reorder the rows into new arrays in every epoch, then every
+              batch is a contiguous slice of them. It replaces the gathers of every
+              batch with one gather per epoch, at the cost of holding the training
+              data twice while the rows are reordered.
+
+            .. versionchanged:: 1.6.0
+               Added the ``'block'`` mode.
+
         eval_data : :class:`~libreco.data.TransformedSet` object, default: None
             Data object used for evaluating.
         metrics : list or None, default: None
@@ -115,6 +156,12 @@ class TfBase(Base):
                Using multiprocessing(``num_workers`` > 0) may consume more memory than
                single processing. See `Multi-process data loading <https://pytorch.org/docs/stable/data.html#multi-process-data-loading>`_.
 
+        prefetch_batches : int, default: 0
+            Number of batches prepared ahead in a background thread, so that data loading
+            overlaps with training steps. 0 means no prefetching.
+
+            .. versionadded:: 1.6.0
+
         Raises
         ------
         RuntimeError
@@ -140,6 +187,7 @@ class TfBase(Base):
             eval_batch_size,
             eval_user_num,
             num_workers,
+            prefetch_batches,
         )
         self.assign_tf_variables_oov()
         self.default_recs = recommend_tf_feat(
@@ -152,6 +200,45 @@ class TfBase(Base):
             random_rec=False,
         ).flatten()
 
+    def partial_fit(self, data, neg_sampling, max_steps=None):
+        """Update the model with a batch of new data, e.g. micro-batches from a stream.
+
+        The rows are encoded with the current ``data_info``, then the model is trained
+        on them once in arriving order. Features of the rows are taken from
+        ``data_info``, which can be updated by
+        :meth:`~libreco.data.DataInfo.assign_user_features` and
+        :meth:`~libreco.data.DataInfo.assign_item_features`.
+
+        .. versionadded:: 1.6.0
+
+        Parameters
+        ----------
+        data : pandas.DataFrame
+            New data with ``user``, ``item`` and ``label`` columns. Rows with unknown
+            users or items are skipped. In order to train on them, merge the data with
+            ``merge_trainset`` and use ``warm_start_from`` in a new model.
+        neg_sampling : bool
+            Whether to perform negative sampling for the new data.
+        max_steps : int or None, default: None
+            Maximum number of optimizer steps. None means all the batches of the data.
+
+        Returns
+        -------
+        float or None
+            Mean training loss, None if there is no known row in the data.
+
+        Raises
+        ------
+        RuntimeError
+            If the model has not been trained or rebuilt, or it is a loaded model.
+        """
+        check_partial_fitting(self, neg_sampling)
+        train_data = build_stream_data(self, data)
+        if train_data is None:
+            return None
+        check_labels(self, train_data.labels, neg_sampling)
+        return self.trainer.partial_run(train_data, neg_sampling, max_steps)
+
     def predict(self, user, item, feats=None, cold_start="average", inner_id=False):
         """Make prediction(s) on given user(s) and item(s).
 
@@ -316,6 +403,14 @@ class TfBase(Base):
             _,
         ) = modify_variable_names(self, trainable=True)
 
+        # oov rows are shared with other ids in compressed tables
+        if self.compressed_tables["user"] is not None:
+            user_variables = None
+        if self.compressed_tables["item"] is not None:
+            item_variables = None
+        if self.compressed_tables["sparse"] is not None:
+            sparse_variables = None
+
         update_ops = []
         for v in tf.trainable_variables():
             if user_variables is not None and v.name in user_variables:
@@ -1,4 +1,15 @@
-from .batch_data import adjust_batch_size, get_batch_loader
+from .batch_data import (
+    adjust_batch_size,
+    get_batch_loader,
+    get_collate_fn,
+    get_stream_loader,
+)
 from .tf_feed_dicts import get_tf_feeds
 
-__all__ = ["adjust_batch_size", "get_batch_loader", "get_tf_feeds"]
+__all__ = [
+    "adjust_batch_size",
+    "get_batch_loader",
+    "get_collate_fn",
+    "get_stream_loader",
+    "get_tf_feeds",
+]
@@ -9,6 +9,18 @@ from ..batch.enums import Backend
 T = TypeVar("T", int, float)
 
 
+def tensor_from_numpy(array):
+    """Convert array to tensor, compact dtypes are restored to int64 and float32."""
+    if array.dtype.kind in ("i", "u"):
+        array = array.astype(np.int64, copy=False)
+    elif array.dtype == np.float16:
+        array = array.astype(np.float32)
+    if not array.flags.writeable:
+        # slices of read-only shared arrays
+        array = array.copy()
+    return torch.from_numpy(array)
+
+
 @dataclass
 class PairFeats(Generic[T]):
     user_feats: Optional[Iterable[T]]
@@ -16,9 +28,9 @@ class PairFeats(Generic[T]):
 
     def to_torch_tensor(self):
         if self.user_feats is not None:
-            self.user_feats = torch.from_numpy(self.user_feats)
+            self.user_feats = tensor_from_numpy(self.user_feats)
         if self.item_feats is not None:
-            self.item_feats = torch.from_numpy(self.item_feats)
+            self.item_feats = tensor_from_numpy(self.item_feats)
         return self
 
 
@@ -30,11 +42,11 @@ class TripleFeats(Generic[T]):
 
     def to_torch_tensor(self):
         if self.query_feats is not None:
-            self.query_feats = torch.from_numpy(self.query_feats)
+            self.query_feats = tensor_from_numpy(self.query_feats)
         if self.item_pos_feats is not None:
-            self.item_pos_feats = torch.from_numpy(self.item_pos_feats)
+            self.item_pos_feats = tensor_from_numpy(self.item_pos_feats)
         if self.item_neg_feats is not None:
-            self.item_neg_feats = torch.from_numpy(self.item_neg_feats)
+            self.item_neg_feats = tensor_from_numpy(self.item_neg_feats)
         return self
 
     def to_device(self, device):  # pragma: no cover
@@ -95,13 +107,13 @@ class PointwiseBatch:
     # todo: For now, no torch model uses sequence feature
     def __post_init__(self, backend):
         if backend is Backend.TORCH:
-            self.users = torch.from_numpy(self.users).long()
-            self.items = torch.from_numpy(self.items).long()
-            self.labels = torch.from_numpy(self.labels)
+            self.users = tensor_from_numpy(self.users).long()
+            self.items = tensor_from_numpy(self.items).long()
+            self.labels = tensor_from_numpy(self.labels)
             if self.sparse_indices is not None:
-                self.sparse_indices = torch.from_numpy(self.sparse_indices)
+                self.sparse_indices = tensor_from_numpy(self.sparse_indices)
             if self.dense_values is not None:
-                self.dense_values = torch.from_numpy(self.dense_values)
+                self.dense_values = tensor_from_numpy(self.dense_values)
 
     def to_device(self, device):  # pragma: no cover
         self.users = self.users.to(device)
@@ -121,9 +133,9 @@ class PointwiseSepFeatBatch(PointwiseBatch):
 
     def __post_init__(self, backend):
         if backend is Backend.TORCH:
-            self.users = torch.from_numpy(self.users)
-            self.items = torch.from_numpy(self.items)
-            self.labels = torch.from_numpy(self.labels)
+            self.users = tensor_from_numpy(self.users)
+            self.items = tensor_from_numpy(self.items)
+            self.labels = tensor_from_numpy(self.labels)
             if self.sparse_indices is not None:
                 self.sparse_indices.to_torch_tensor()
             if self.dense_values is not None:
@@ -154,10 +166,10 @@ class PairwiseBatch:
 
     def __post_init__(self, backend):
         if backend is Backend.TORCH:
-            self.queries = torch.from_numpy(self.queries)
+            self.queries = tensor_from_numpy(self.queries)
             self.item_pairs = (
-                torch.from_numpy(self.item_pairs[0]),
-                torch.from_numpy(self.item_pairs[1]),
+                tensor_from_numpy(self.item_pairs[0]),
+                tensor_from_numpy(self.item_pairs[1]),
             )
             if self.sparse_indices is not None:
                 self.sparse_indices.to_torch_tensor()
@@ -1,3 +1,5 @@
+import dataclasses
+import importlib
 import random
 
 import numpy as np
@@ -16,14 +18,21 @@ from .batch_unit import (
     TripleFeats,
 )
 from .enums import FeatType
-from .sequence import get_dual_seqs, get_interacted_seqs, get_sparse_interacted
+from .sequence import (
+    build_seq_history,
+    get_dual_seqs,
+    get_interacted_seqs,
+    get_sparse_interacted,
+)
 from ..graph import build_subgraphs, pairs_from_dgl_graph
 from ..sampling import (
+    AliasSampler,
+    build_consumed_csr,
     neg_probs_from_frequency,
     negatives_from_out_batch,
     negatives_from_popular,
     negatives_from_random,
-    negatives_from_unconsumed,
+    negatives_from_unconsumed_csr,
     pairs_from_random_walk,
     pos_probs_from_frequency,
 )
@@ -59,14 +68,20 @@ class BaseCollator:
         self.backend = backend
         self.seed = model.seed
         self.temperature = temperature
-        self.user_consumed_set = None
-        self.neg_probs = None
+        self.seq_history = None
+        self.consumed_indptr = None
+        self.consumed_indices = None
+        self.neg_sampler = None
         self.np_rng = None
+        self.shared_arrays = None
+        if self.has_seq:
+            # build in the main process, so that all the DataLoader workers share the arrays
+            self._set_seq_history()
 
     def __call__(self, batch):
         sparse_batch = self.get_features(batch, FeatType.SPARSE)
         dense_batch = self.get_features(batch, FeatType.DENSE)
-        seq_batch = self.get_seqs(batch["user"], batch["item"])
+        seq_batch = self.get_seqs(batch["user"], batch["item"], batch.get("position"))
         if self.dual_seq:
             batch_cls = PointwiseDualSeqBatch
         elif self.separate_features:
@@ -106,40 +121,42 @@ class BaseCollator:
             features = PairFeats(user_features, item_features)
         return features
 
-    def get_seqs(self, user_indices, item_indices):
+    def get_seqs(self, user_indices, item_indices, positions=None):
         if not self.has_seq:
             return
         self._set_random_seeds()
-        self._set_user_consumed()
         if self.dual_seq:
             long_seqs, long_lens, short_seqs, short_lens = get_dual_seqs(
                 user_indices,
                 item_indices,
-                self.user_consumed,
+                self.seq_history,
                 self.n_items,
                 self.long_max_len,
                 self.short_max_len,
-                self.user_consumed_set,
+                positions,
             )
             return DualSeqFeats(long_seqs, long_lens, short_seqs, short_lens)
         else:
             seqs, seq_lens = get_interacted_seqs(
                 user_indices,
                 item_indices,
-                self.user_consumed,
+                self.seq_history,
                 self.n_items,
                 self.seq_mode,
                 self.max_seq_len,
-                self.user_consumed_set,
                 self.np_rng,
+                positions,
             )
             return SeqFeats(seqs, seq_lens)
 
     def sample_neg_items(self, batch, sampler, num_neg):
         if sampler == "unconsumed":
-            self._set_user_consumed()
-            items_neg = negatives_from_unconsumed(
-                self.user_consumed_set,
+            self._set_random_seeds()
+            self._set_consumed_csr()
+            items_neg = negatives_from_unconsumed_csr(
+                self.np_rng,
+                self.consumed_indptr,
+                self.consumed_indices,
                 batch["user"],
                 batch["item"],
                 self.n_items,
@@ -147,13 +164,13 @@ class BaseCollator:
             )
         elif sampler == "popular":
             self._set_random_seeds()
-            self._set_neg_probs()
+            self._set_neg_sampler()
             items_neg = negatives_from_popular(
                 self.np_rng,
                 self.n_items,
                 batch["item"],
                 num_neg,
-                probs=self.neg_probs,
+                alias_sampler=self.neg_sampler,
             )
         else:
             self._set_random_seeds()
@@ -163,19 +180,70 @@ class BaseCollator:
                 batch["item"],
                 num_neg,
             )
-        return items_neg
+        # keep the same dtype as the compact item indices
+        return items_neg.astype(batch["item"].dtype, copy=False)
+
+    def _set_seq_history(self):
+        if self.seq_history is None:
+            self.seq_history = build_seq_history(self.user_consumed, self.n_users)
 
-    def _set_user_consumed(self):
-        if self.user_consumed_set is None:
-            self.user_consumed_set = [
-                set(self.user_consumed[u]) for u in range(self.n_users)
-            ]
+    def _init_sampler_state(self):
+        # build in the main process, so that all the DataLoader workers share the arrays
+        if self.sampler == "unconsumed":
+            self._set_consumed_csr()
+        elif self.sampler == "popular":
+            self._set_neg_sampler()
+
+    def _set_consumed_csr(self):
+        if self.consumed_indptr is None:
+            self.consumed_indptr, self.consumed_indices = build_consumed_csr(
+                self.user_consumed, self.n_users, self.n_items
+            )
 
-    def _set_neg_probs(self):
-        if self.neg_probs is None:
-            self.neg_probs = neg_probs_from_frequency(
+    def _set_neg_sampler(self):
+        if self.neg_sampler is None:
+            neg_probs = neg_probs_from_frequency(
                 self.item_consumed, self.n_items, self.temperature
             )
+            self.neg_sampler = AliasSampler(neg_probs)
+
+    def share_memory(self, shared_arrays):
+        """Move the read-only sampling and feature arrays into shared memory.
+
+        Workers of the multiprocessing DataLoader then attach the arrays without copying.
+
+        .. versionadded:: 1.6.0
+        """
+        self.shared_arrays = shared_arrays
+        for name in (
+            "consumed_indptr",
+            "consumed_indices",
+            "item_sparse_unique",
+            "item_dense_unique",
+        ):
+            setattr(self, name, shared_arrays.share(name, getattr(self, name)))
+        if self.seq_history is not None:
+            shared_fields = {
+                f.name: shared_arrays.share(
+                    f"seq_history_{f.name}", getattr(self.seq_history, f.name)
+                )
+                for f in dataclasses.fields(self.seq_history)
+            }
+            self.seq_history = dataclasses.replace(self.seq_history, **shared_fields)
+        for name in ("neg_sampler", "start_node_sampler"):
+            sampler = getattr(self, name, None)
+            if sampler is not None:
+                sampler.prob = shared_arrays.share(f"{name}_prob", sampler.prob)
+                sampler.alias = shared_arrays.share(f"{name}_alias", sampler.alias)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.shared_arrays is not None:
+            # workers only attach the arrays, the files are owned by the main process
+            state["shared_arrays"] = None
+            # the sampling state has been built from them in the main process
+            state["user_consumed"] = state["item_consumed"] = None
+        return state
 
     def _set_random_seeds(self):
         if self.np_rng is None:
@@ -190,9 +258,10 @@ class BaseCollator:
 class SparseCollator(BaseCollator):
     def __init__(self, model, data_info, backend):
         super().__init__(model, data_info, backend)
+        self._set_seq_history()
 
     def __call__(self, batch):
-        seq_batch = self.get_seqs(batch["user"], batch["item"])
+        seq_batch = self.get_seqs(batch["user"], batch["item"], batch.get("position"))
         sparse_batch = self.get_features(batch, FeatType.SPARSE)
         dense_batch = self.get_features(batch, FeatType.DENSE)
         return SparseBatch(
@@ -202,16 +271,17 @@ class SparseCollator(BaseCollator):
             dense_values=dense_batch,
         )
 
-    def get_seqs(self, user_indices, item_indices):
+    def get_seqs(self, user_indices, item_indices, positions=None):
         if self.seq_mode == "random":
             self._set_random_seeds()
         batch_indices, batch_values, batch_size = get_sparse_interacted(
             user_indices,
             item_indices,
-            self.user_consumed,
+            self.seq_history,
             self.seq_mode,
             self.max_seq_len,
             self.np_rng,
+            positions,
         )
         return SparseSeqFeats(batch_indices, batch_values, batch_size)
 
@@ -221,6 +291,7 @@ class PointwiseCollator(BaseCollator):
         super().__init__(model, data_info, backend, separate_features)
         self.sampler = model.sampler
         self.num_neg = model.num_neg
+        self._init_sampler_state()
 
     def __call__(self, batch):
         user_batch = np.repeat(batch["user"], self.num_neg + 1)
@@ -233,7 +304,8 @@ class PointwiseCollator(BaseCollator):
 
         sparse_batch = self.get_pointwise_feats(batch, FeatType.SPARSE, item_batch)
         dense_batch = self.get_pointwise_feats(batch, FeatType.DENSE, item_batch)
-        seq_batch = self.get_seqs(user_batch, item_batch)
+        positions = self.get_pointwise_positions(batch, user_batch, item_batch)
+        seq_batch = self.get_seqs(user_batch, item_batch, positions)
         if self.dual_seq:
             batch_cls = PointwiseDualSeqBatch
         elif self.separate_features:
@@ -251,6 +323,18 @@ class PointwiseCollator(BaseCollator):
         )
         return batch_data
 
+    def get_pointwise_positions(self, batch, users, items):
+        if not self.has_seq or "position" not in batch:
+            return
+        # positions of positive items are precomputed, only search the negative ones
+        positions = np.repeat(batch["position"], self.num_neg + 1)
+        neg_mask = np.ones(len(items), dtype=bool)
+        neg_mask[:: (self.num_neg + 1)] = False
+        positions[neg_mask] = self.seq_history.get_positions(
+            users[neg_mask], items[neg_mask]
+        )
+        return positions
+
     def get_pointwise_feats(self, batch, feat_type, items):
         if feat_type.value not in batch:
             return
@@ -273,6 +357,7 @@ class PairwiseCollator(BaseCollator):
         self.sampler = model.sampler
         self.num_neg = model.num_neg
         self.repeat_positives = repeat_positives
+        self._init_sampler_state()
 
     def __call__(self, batch):
         if self.repeat_positives and self.num_neg > 1:
@@ -285,7 +370,10 @@ class PairwiseCollator(BaseCollator):
 
         sparse_batch = self.get_pairwise_feats(batch, FeatType.SPARSE, items_neg)
         dense_batch = self.get_pairwise_feats(batch, FeatType.DENSE, items_neg)
-        seq_batch = self.get_seqs(users, items_pos)
+        positions = batch.get("position")
+        if positions is not None and self.repeat_positives and self.num_neg > 1:
+            positions = np.repeat(positions, self.num_neg)
+        seq_batch = self.get_seqs(users, items_pos, positions)
         if self.has_seq and not self.repeat_positives and self.num_neg > 1:
             seq_batch = seq_batch.repeat(self.num_neg)
         batch_data = PairwiseBatch(
@@ -326,14 +414,16 @@ class GraphCollator(BaseCollator):
         self.paradigm = model.paradigm
         self.sampler = model.sampler
         self.num_neg = model.num_neg
+        self._init_sampler_state()
         self.num_walks = model.num_walks
         self.walk_length = model.sample_walk_len
         self.start_node = model.start_node
         self.focus_start = model.focus_start
         if self.start_node == "unpopular":
-            self.pos_probs = pos_probs_from_frequency(
+            pos_probs = pos_probs_from_frequency(
                 self.item_consumed, self.n_users, self.n_items, alpha
             )
+            self.start_node_sampler = AliasSampler(pos_probs)
 
     def __call__(self, batch):
         self._set_random_seeds()
@@ -347,9 +437,9 @@ class GraphCollator(BaseCollator):
         else:
             start_nodes = self.get_start_nodes(batch)
             items, items_pos = pairs_from_random_walk(
+                self.np_rng,
+                self.neighbor_walker.bipartite_graph,
                 start_nodes,
-                self.user_consumed,
-                self.item_consumed,
                 self.num_walks,
                 self.walk_length,
                 self.focus_start,
@@ -367,13 +457,14 @@ class GraphCollator(BaseCollator):
                 self.np_rng, self.n_items, items_pos, items, self.num_neg
             )
         elif self.sampler == "popular":
+            self._set_neg_sampler()
             items_neg = negatives_from_popular(
                 self.np_rng,
                 self.n_items,
                 items_pos,
                 self.num_neg,
                 items=items,
-                probs=self.neg_probs,
+                alias_sampler=self.neg_sampler,
             )
         else:
             items_neg = negatives_from_random(
@@ -388,12 +479,14 @@ class GraphCollator(BaseCollator):
     def get_start_nodes(self, batch):
         size = len(batch["item"])
         if self.start_node == "unpopular":
-            population = range(self.n_items)
-            start_nodes = random.choices(population, weights=self.pos_probs, k=size)
+            return self.start_node_sampler.sample(self.np_rng, size)
         else:
-            start_nodes = self.np_rng.integers(0, self.n_items, size=size)
-            start_nodes = start_nodes.tolist()
-        return start_nodes
+            return self.np_rng.integers(0, self.n_items, size=size)
+
+    def _set_random_seeds(self):
+        super()._set_random_seeds()
+        # neighbors are sampled with the same generator seeded for each worker
+        self.neighbor_walker.np_rng = self.np_rng
 
 
 class GraphDGLCollator(GraphCollator):
@@ -402,8 +495,24 @@ class GraphDGLCollator(GraphCollator):
         self.graph = model.hetero_g
         self.dgl = model._dgl
         self.dgl_seed = None
-        if self.start_node == "unpopular":
-            self.pos_probs = torch.tensor(self.pos_probs, dtype=torch.float)
+
+    def share_memory(self, shared_arrays):
+        super().share_memory(shared_arrays)
+        # Build all the sparse formats once, so workers don't build their own copies.
+        # Graph structures are torch tensors, which are passed to workers through
+        # shared memory if they are started with `spawn`.
+        self.graph.create_formats_()
+        self.neighbor_walker.graph.create_formats_()
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # modules can't be pickled, import again in workers
+        state["dgl"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.dgl = importlib.import_module("dgl")
 
     def __call__(self, batch):
         self._set_random_seeds()
@@ -443,7 +552,8 @@ class GraphDGLCollator(GraphCollator):
     def get_start_nodes(self, batch):
         size = len(batch["item"])
         if self.start_node == "unpopular":
-            start_nodes = torch.multinomial(self.pos_probs, size, replacement=True)
+            start_nodes = self.start_node_sampler.sample(self.np_rng, size)
+            start_nodes = torch.from_numpy(start_nodes)
         else:
             start_nodes = torch.randint(0, self.n_items, (size,))
         return start_nodes
@@ -1,74 +1,158 @@
+import itertools
 import random
+from dataclasses import dataclass
 
 import numpy as np
 
+from ..utils.sparse import csr_search
+
+
+@dataclass
+class SeqHistory:
+    """Consumed items of all users in CSR format, used for gathering sequences.
+
+    Attributes
+    ----------
+    indptr : numpy.ndarray
+        Row pointers of users in ``items``.
+    items : numpy.ndarray
+        Consumed items of all users in chronological order.
+    sorted_items : numpy.ndarray
+        Unique consumed items of each user, sorted for binary search.
+    positions : numpy.ndarray
+        First position of each item in ``sorted_items`` inside the user's sequence.
+    sorted_indptr : numpy.ndarray
+        Row pointers of users in ``sorted_items`` and ``positions``.
+    """
+
+    indptr: np.ndarray
+    items: np.ndarray
+    sorted_items: np.ndarray
+    positions: np.ndarray
+    sorted_indptr: np.ndarray
+
+    def get_positions(self, user_indices, item_indices):
+        """Position of each item inside the user's sequence, -1 if not consumed."""
+        found, locations = csr_search(
+            self.sorted_indptr, self.sorted_items, user_indices, item_indices
+        )
+        return np.where(found, self.positions[locations], -1).astype(np.int32)
 
-def get_sparse_interacted(user_indices, item_indices, user_consumed, mode, num, np_rng):
-    interacted_indices = []
-    interacted_items = []
-    for j, (u, i) in enumerate(zip(user_indices, item_indices)):
-        consumed_items = user_consumed[u]
-        position = consumed_items.index(i)
-        if position == 0:  # first item, no history interaction
-            continue
-        elif position < num:
-            interacted_indices.extend([j] * position)
-            interacted_items.extend(consumed_items[:position])
-        elif position >= num and mode == "recent":
-            start_index = position - num
-            interacted_indices.extend([j] * num)
-            interacted_items.extend(consumed_items[start_index:position])
-        elif position >= num and mode == "random":
-            interacted_indices.extend([j] * num)
+    def user_seq(self, user):
+        return self.items[self.indptr[user] : self.indptr[user + 1]]
+
+
+def build_seq_history(user_consumed, n_users):
+    seq_lens = np.fromiter(
+        (len(user_consumed[u]) for u in range(n_users)), dtype=np.int64, count=n_users
+    )
+    indptr = np.zeros(n_users + 1, dtype=np.int64)
+    np.cumsum(seq_lens, out=indptr[1:])
+    items = np.fromiter(
+        itertools.chain.from_iterable(user_consumed[u] for u in range(n_users)),
+        dtype=np.int32,
+        count=int(indptr[-1]),
+    )
+    users = np.repeat(np.arange(n_users), seq_lens)
+    # sort by (user, item), the stable sort keeps the first occurrence of an item first
+    n_items = int(items.max(initial=0)) + 1
+    order = np.argsort(users * n_items + items, kind="stable")
+    sorted_users, sorted_items = users[order], items[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (sorted_users[1:] != sorted_users[:-1]) | (
+        sorted_items[1:] != sorted_items[:-1]
+    )
+    positions = (order - indptr[users[order]]).astype(np.int32)
+    sorted_indptr = np.zeros(n_users + 1, dtype=np.int64)
+    np.cumsum(
+        np.bincount(sorted_users[first], minlength=n_users), out=sorted_indptr[1:]
+    )
+    return SeqHistory(
+        indptr, items, sorted_items[first], positions[first], sorted_indptr
+    )
+
+
+def get_seq_positions(seq_history, user_indices, item_indices, positions=None):
+    """Get positions of items in user sequences.
+
+    If an item is not consumed by the user, e.g. a negative item,
+    a random position in the user's past interaction will be used.
+    """
+    if positions is None:
+        positions = seq_history.get_positions(user_indices, item_indices)
+    missing = np.flatnonzero(positions < 0)
+    if len(missing) > 0:
+        positions = positions.copy()
+        seq_lens = np.diff(seq_history.indptr)[np.asarray(user_indices)[missing]]
+        positions[missing] = [random.randrange(0, n) for n in seq_lens.tolist()]
+    return positions
+
+
+def gather_windows(seq_history, user_indices, ends, takes, max_len, pad_index):
+    """Gather the ``takes`` items before ``ends`` in each user sequence, left aligned."""
+    batch_size = len(user_indices)
+    seqs = np.full((batch_size, max_len), pad_index, dtype=np.int32)
+    col_range = np.arange(max_len)
+    mask = col_range < takes[:, None]
+    starts = seq_history.indptr[user_indices] + ends - takes
+    seqs[mask] = seq_history.items[(starts[:, None] + col_range)[mask]]
+    # empty sequences are filled with pad_index, and the length is set to 1
+    seq_lens = np.where(takes == 0, 1, takes).astype(np.int32)
+    return seqs, seq_lens
+
+
+def get_sparse_interacted(
+    user_indices, item_indices, seq_history, mode, num, np_rng, positions=None
+):
+    user_indices = np.asarray(user_indices)
+    if positions is None:
+        positions = seq_history.get_positions(user_indices, item_indices)
+    # items not in the user's sequence, e.g. new clicks in online training,
+    # are treated as the next interaction after the whole sequence
+    seq_lens = np.diff(seq_history.indptr)[user_indices]
+    positions = np.where(positions < 0, seq_lens, positions).astype(np.int64)
+    takes = np.minimum(positions, num)
+    total = int(takes.sum())
+    interacted_indices = np.repeat(np.arange(len(user_indices)), takes)
+    offsets = np.arange(total) - np.repeat(np.cumsum(takes) - takes, takes)
+    starts = seq_history.indptr[user_indices] + positions - takes
+    interacted_items = seq_history.items[np.repeat(starts, takes) + offsets]
+    if mode == "random":
+        value_starts = np.cumsum(takes) - takes
+        for j in np.flatnonzero(positions >= num):
+            consumed_items = seq_history.user_seq(user_indices[j])
             chosen_items = np_rng.choice(consumed_items, num, replace=False)
-            interacted_items.extend(chosen_items.tolist())
+            interacted_items[value_starts[j] : value_starts[j] + num] = chosen_items
 
-    interacted_indices = np.asarray(interacted_indices).reshape(-1, 1)
+    interacted_indices = interacted_indices.reshape(-1, 1)
     indices = np.concatenate(
         [interacted_indices, np.zeros_like(interacted_indices)], axis=1
     )
-    return indices, np.array(interacted_items), len(user_indices)
+    return indices, interacted_items, len(user_indices)
 
 
 def get_interacted_seqs(
     user_indices,
     item_indices,
-    user_consumed,
+    seq_history,
     pad_index,
     mode,
     max_seq_len,
-    user_consumed_set,
     np_rng,
+    positions=None,
 ):
-    batch_size = len(user_indices)
-    seqs = np.full((batch_size, max_seq_len), pad_index, dtype=np.int32)
-    seq_lens = []
-    for j, (u, i) in enumerate(zip(user_indices, item_indices)):
-        consumed_items = user_consumed[u]
-        consumed_len = len(consumed_items)
-        consumed_set = user_consumed_set[u]
-        # If `i` is a negative item, sample sequence from user's past interaction
-        position = (
-            consumed_items.index(i)
-            if i in consumed_set
-            else random.randrange(0, consumed_len)
-        )
-        if position == 0:
-            # first item has no historical interaction, fill in with pad_index
-            seq_lens.append(1)
-        elif position < max_seq_len:
-            seqs[j, :position] = consumed_items[:position]
-            seq_lens.append(position)
-        else:
-            if mode == "recent":
-                start_index = position - max_seq_len
-                seqs[j] = consumed_items[start_index:position]
-            elif mode == "random":
-                chosen_items = np_rng.choice(consumed_items, max_seq_len, replace=False)
-                seqs[j] = chosen_items
-            seq_lens.append(max_seq_len)
-
-    return seqs, np.array(seq_lens, dtype=np.int32)
+    user_indices = np.asarray(user_indices)
+    positions = get_seq_positions(seq_history, user_indices, item_indices, positions)
+    positions = positions.astype(np.int64)
+    takes = np.minimum(positions, max_seq_len)
+    seqs, seq_lens = gather_windows(
+        seq_history, user_indices, positions, takes, max_seq_len, pad_index
+    )
+    if mode == "random":
+        for j in np.flatnonzero(positions >= max_seq_len):
+            consumed_items = seq_history.user_seq(user_indices[j])
+            seqs[j] = np_rng.choice(consumed_items, max_seq_len, replace=False)
+    return seqs, seq_lens
 
 
 # most recent num items a user has interacted, assume already sorted by time.
@@ -94,57 +178,26 @@ def get_recent_seqs(n_users, user_consumed, pad_index, max_seq_len):
 def get_dual_seqs(
     user_indices,
     item_indices,
-    user_consumed,
+    seq_history,
     pad_index,
     long_max_len,
     short_max_len,
-    user_consumed_set,
+    positions=None,
 ):
-    batch_size = len(user_indices)
-    long_seqs = np.full((batch_size, long_max_len), pad_index, dtype=np.int32)
-    short_seqs = np.full((batch_size, short_max_len), pad_index, dtype=np.int32)
-    long_seq_lens, short_seq_lens = [], []
-    total_max_len = long_max_len + short_max_len
-    for j, (u, i) in enumerate(zip(user_indices, item_indices)):
-        consumed_items = user_consumed[u]
-        consumed_len = len(consumed_items)
-        consumed_set = user_consumed_set[u]
-        # If `i` is a negative item, sample sequence from user's past interaction
-        position = (
-            consumed_items.index(i)
-            if i in consumed_set
-            else random.randrange(0, consumed_len)
-        )
-        if position == 0:
-            # first item has no historical interaction, fill in with pad_index
-            long_seq_lens.append(1)
-            short_seq_lens.append(1)
-        elif position <= short_max_len:
-            long_seq_lens.append(1)
-            if position < short_max_len:
-                short_seqs[j, :position] = consumed_items[:position]
-            else:
-                short_seqs[j] = consumed_items[:position]
-            short_seq_lens.append(position)
-        else:
-            if position < total_max_len:
-                long_size = position - short_max_len
-                long_seqs[j, :long_size] = consumed_items[:long_size]
-                long_seq_lens.append(long_size)
-            else:
-                long_start = position - total_max_len
-                long_seqs[j] = consumed_items[long_start : long_start + long_max_len]
-                long_seq_lens.append(long_max_len)
-            short_start = position - short_max_len
-            short_seqs[j] = consumed_items[short_start:position]
-            short_seq_lens.append(short_max_len)
-
-    return (
-        long_seqs,
-        np.array(long_seq_lens, dtype=np.int32),
-        short_seqs,
-        np.array(short_seq_lens, dtype=np.int32),
+    user_indices = np.asarray(user_indices)
+    positions = get_seq_positions(seq_history, user_indices, item_indices, positions)
+    positions = positions.astype(np.int64)
+    # short sequence ends at the position, and long sequence ends before short sequence
+    short_takes = np.minimum(positions, short_max_len)
+    long_ends = np.maximum(positions - short_max_len, 0)
+    long_takes = np.minimum(long_ends, long_max_len)
+    long_seqs, long_seq_lens = gather_windows(
+        seq_history, user_indices, long_ends, long_takes, long_max_len, pad_index
+    )
+    short_seqs, short_seq_lens = gather_windows(
+        seq_history, user_indices, positions, short_takes, short_max_len, pad_index
     )
+    return long_seqs, long_seq_lens, short_seqs, short_seq_lens
 
 
 def get_recent_dual_seqs(
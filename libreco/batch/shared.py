@@ -0,0 +1,103 @@
+"""Read-only arrays shared by DataLoader workers through memory-mapped files."""
+
+import os
+import shutil
+import tempfile
+import weakref
+
+import numpy as np
+
+
+class SharedArrays:
+    """Store read-only arrays in memory-mapped ``.npy`` files.
+
+    The files are put in ``/dev/shm`` if it is available, so they live in memory.
+    When a DataLoader worker is started with ``spawn`` or ``forkserver``, the shared
+    arrays are pickled as file paths, and the worker maps the same pages instead of
+    receiving a copy. Workers started with ``fork`` already share the arrays of the
+    main process, so they don't need these files.
+
+    If an array can't be written, e.g. ``/dev/shm`` is full, the original array is
+    kept and it is pickled to the workers as usual.
+
+    The directory is removed when this object is garbage collected in the process
+    that created it, or when :meth:`close` is called.
+    """
+
+    def __init__(self):
+        shm_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        self.dir = tempfile.mkdtemp(prefix="libreco_shared_", dir=shm_dir)
+        self._finalizer = weakref.finalize(self, _remove_dir, self.dir, os.getpid())
+
+    def share(self, name, array, replace=False):
+        """Write the array to a file and return a read-only memory-mapped view.
+
+        If ``replace`` is True, an existing file with the same name is unlinked first.
+        The arrays already attached to it stay valid.
+        """
+        if array is None or getattr(array, "shared_path", None) is not None:
+            return array
+        path = os.path.join(self.dir, f"{name}.npy")
+        # overwriting a mapped file would truncate the arrays attached to it
+        if os.path.exists(path):
+            if not replace:
+                raise ValueError(f"shared array `{name}` already exists")
+            os.remove(path)
+        try:
+            np.save(path, np.ascontiguousarray(array), allow_pickle=False)
+        except OSError:
+            if os.path.exists(path):
+                os.remove(path)
+            return array
+        return attach_shared_array(path)
+
+    @property
+    def nbytes(self):
+        return sum(
+            os.path.getsize(os.path.join(self.dir, f)) for f in os.listdir(self.dir)
+        )
+
+    def close(self):
+        self._finalizer()
+
+
+class SharedArray(np.memmap):
+    """Memory-mapped array which is pickled as the path of its file.
+
+    Only the array returned by :func:`attach_shared_array` holds the path, views and
+    slices of it are pickled as normal arrays.
+    """
+
+    def __array_finalize__(self, obj):
+        super().__array_finalize__(obj)
+        self.shared_path = None
+
+    def __array_wrap__(self, arr, context=None):
+        arr = super().__array_wrap__(arr, context)
+        if self is arr:
+            return arr
+        # same as `np.memmap`, results of ufuncs are not memory-mapped
+        return arr[()] if arr.shape == () else arr.view(np.ndarray)
+
+    def __getitem__(self, index):
+        res = super().__getitem__(index)
+        if isinstance(res, SharedArray) and res._mmap is None:
+            return res.view(np.ndarray)
+        return res
+
+    def __reduce__(self):
+        if self.shared_path is None:
+            return np.array(self).__reduce__()
+        return attach_shared_array, (self.shared_path,)
+
+
+def attach_shared_array(path):
+    array = np.load(path, mmap_mode="r", allow_pickle=False).view(SharedArray)
+    array.shared_path = path
+    return array
+
+
+def _remove_dir(path, pid):
+    # forked workers inherit the finalizer, but only the creator removes the files
+    if os.getpid() == pid:
+        shutil.rmtree(path, ignore_errors=True)
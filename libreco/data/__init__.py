@@ -1,6 +1,7 @@
 from .data_info import DataInfo, MultiSparseInfo
 from .dataset import DatasetFeat, DatasetPure
-from .processing import process_data, split_multi_value
+from .dtypes import DtypePolicy
+from .processing import StreamingProcessor, process_data, split_multi_value
 from .split import (
     random_split,
     split_by_num,
@@ -14,8 +15,10 @@ __all__ = [
     "DatasetPure",
     "DatasetFeat",
     "DataInfo",
+    "DtypePolicy",
     "MultiSparseInfo",
     "process_data",
+    "StreamingProcessor",
     "split_multi_value",
     "split_by_num",
     "split_by_ratio",
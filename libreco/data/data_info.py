@@ -11,7 +11,10 @@ import numpy as np
 import pandas as pd
 
 from ..feature.update import (
+    fit_index_dtype,
+    get_changed_rows,
     get_row_id_masks,
+    get_unique_rows,
     update_new_dense_feats,
     update_new_sparse_feats,
 )
@@ -154,6 +157,7 @@ class DataInfo:
         self._popular_items = None
         # store old info for rebuild models
         self.old_info = None
+        self.dtype_report = None
         self.all_args = locals()
         self.add_oovs()
 
@@ -335,16 +339,33 @@ class DataInfo:
     def assign_user_features(self, user_data):
         """Assign user features to this ``data_info`` object from ``user_data``.
 
+        All the features are encoded with vectorized hash lookups and written
+        into ``user_sparse_unique`` and ``user_dense_unique`` in place, so it is
+        suitable for refreshing features of many users in bulk.
+
+        .. versionchanged:: 1.6.0
+           Return indices of the users whose features have changed.
+
         Parameters
         ----------
         user_data : pandas.DataFrame
             Data contains new user features.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted inner indices of the users whose features have changed, which can be
+            used to refresh user-related caches incrementally.
         """
         assert "user" in user_data.columns, "Data must contain `user` column."
         user_data = user_data.drop_duplicates(subset=["user"], keep="last")
         user_row_idx, user_id_mask = get_row_id_masks(
             user_data["user"], self.user_unique_vals
         )
+        rows = user_row_idx[user_id_mask]
+        old_rows = get_unique_rows(
+            rows, self.user_sparse_unique, self.user_dense_unique
+        )
         self.user_sparse_unique = update_new_sparse_feats(
             user_data,
             user_row_idx,
@@ -363,20 +384,40 @@ class DataInfo:
             self.user_dense_unique,
             self.user_dense_col,
         )
+        return get_changed_rows(
+            rows, old_rows, self.user_sparse_unique, self.user_dense_unique
+        )
 
     def assign_item_features(self, item_data):
         """Assign item features to this ``data_info`` object from ``item_data``.
 
+        All the features are encoded with vectorized hash lookups and written
+        into ``item_sparse_unique`` and ``item_dense_unique`` in place, so it is
+        suitable for refreshing features of many items in bulk.
+
+        .. versionchanged:: 1.6.0
+           Return indices of the items whose features have changed.
+
         Parameters
         ----------
         item_data : pandas.DataFrame
             Data contains new item features.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted inner indices of the items whose features have changed, which can be
+            used to refresh item-related caches incrementally.
         """
         assert "item" in item_data.columns, "Data must contain `item` column."
         item_data = item_data.drop_duplicates(subset=["item"], keep="last")
         item_row_idx, item_id_mask = get_row_id_masks(
             item_data["item"], self.item_unique_vals
         )
+        rows = item_row_idx[item_id_mask]
+        old_rows = get_unique_rows(
+            rows, self.item_sparse_unique, self.item_dense_unique
+        )
         self.item_sparse_unique = update_new_sparse_feats(
             item_data,
             item_row_idx,
@@ -395,13 +436,101 @@ class DataInfo:
             self.item_dense_unique,
             self.item_dense_col,
         )
+        return get_changed_rows(
+            rows, old_rows, self.item_sparse_unique, self.item_dense_unique
+        )
+
+    def add_users(self, users):
+        """Append unknown users to this ``data_info`` object.
+
+        New users are appended after existing users, which is the same as merging new
+        data. Their features are filled with oov values for sparse features and zeros
+        for dense features, and their consumed items are empty.
+
+        .. versionadded:: 1.6.0
+
+        Parameters
+        ----------
+        users : array_like
+            Original user ids, known users are ignored.
+
+        Returns
+        -------
+        numpy.ndarray
+            Inner ids of the appended users.
+        """
+        new_users = self._append_unknown_ids(users, is_user=True)
+        new_ids = np.arange(self.n_users, self.n_users + len(new_users))
+        if len(new_users) > 0:
+            self.user_unique_vals = np.concatenate([self.user_unique_vals, new_users])
+            self._n_users = self._user2id = self._id2user = None
+            for u in new_ids.tolist():
+                self.user_consumed[u] = []
+        return new_ids
+
+    def add_items(self, items):
+        """Append unknown items to this ``data_info`` object.
+
+        .. versionadded:: 1.6.0
+
+        Parameters
+        ----------
+        items : array_like
+            Original item ids, known items are ignored.
+
+        Returns
+        -------
+        numpy.ndarray
+            Inner ids of the appended items.
+
+        See Also
+        --------
+        add_users
+        """
+        new_items = self._append_unknown_ids(items, is_user=False)
+        new_ids = np.arange(self.n_items, self.n_items + len(new_items))
+        if len(new_items) > 0:
+            self.item_unique_vals = np.concatenate([self.item_unique_vals, new_items])
+            self._n_items = self._item2id = self._id2item = None
+            for i in new_ids.tolist():
+                self.item_consumed[i] = []
+        return new_ids
+
+    def _append_unknown_ids(self, ids, is_user):
+        id2index = self.user2id if is_user else self.item2id
+        unique_vals = self.user_unique_vals if is_user else self.item_unique_vals
+        new_ids = [i for i in dict.fromkeys(ids) if i not in id2index]
+        # raise before modifying anything if ids have a different type
+        new_ids = np.array(new_ids, dtype=unique_vals.dtype)
+        if len(new_ids) == 0:
+            return new_ids
+
+        n_new = len(new_ids)
+        if is_user:
+            sparse_col_idx = self.user_sparse_col.index
+            self.user_sparse_unique = _insert_before_oov(
+                self.user_sparse_unique, n_new, self.sparse_oov, sparse_col_idx
+            )
+            self.user_dense_unique = _insert_before_oov(self.user_dense_unique, n_new)
+        else:
+            sparse_col_idx = self.item_sparse_col.index
+            self.item_sparse_unique = _insert_before_oov(
+                self.item_sparse_unique, n_new, self.sparse_oov, sparse_col_idx
+            )
+            self.item_dense_unique = _insert_before_oov(self.item_dense_unique, n_new)
+        return new_ids
 
     def add_oovs(self):
         def _concat_oov(uniques, cols=None):
             if uniques is None:
                 return
-            oov = self.sparse_oov[cols] if cols else np.mean(uniques, axis=0)
-            return np.vstack([uniques, oov])
+            if cols:
+                oov = self.sparse_oov[cols]
+                dtype = fit_index_dtype(uniques.dtype, oov)
+            else:
+                oov, dtype = np.mean(uniques, axis=0), uniques.dtype
+            # keep the dtype of compact arrays
+            return np.vstack([uniques, oov]).astype(dtype, copy=False)
 
         self.user_sparse_unique = _concat_oov(
             self.user_sparse_unique, self.user_sparse_col.index
@@ -539,6 +668,18 @@ class DataInfo:
         return cls(**hparams)
 
 
+def _insert_before_oov(uniques, num, sparse_oov=None, cols=None):
+    """Insert ``num`` rows of default features before the last oov row."""
+    if uniques is None:
+        return
+    if cols:
+        dtype = fit_index_dtype(uniques.dtype, sparse_oov[cols])
+        new_vals = np.full([num, uniques.shape[1]], sparse_oov[cols], dtype)
+    else:
+        new_vals = np.zeros([num, uniques.shape[1]], uniques.dtype)
+    return np.vstack([uniques[:-1], new_vals, uniques[-1:]])
+
+
 @dataclass
 class OldInfo:
     n_users: int
@@ -6,6 +6,7 @@ import numpy as np
 
 from .consumed import interaction_consumed, update_consumed
 from .data_info import DataInfo, store_old_info
+from .dtypes import apply_dtype_policy, get_dtype_policy
 from .transformed import TransformedEvalSet, TransformedSet
 from ..feature.column_mapping import col_name2index
 from ..feature.multi_sparse import (
@@ -205,7 +206,7 @@ class DatasetPure(_Dataset):
     """
 
     @classmethod
-    def build_trainset(cls, train_data, shuffle=False, seed=42):
+    def build_trainset(cls, train_data, shuffle=False, seed=42, dtype_policy=None):
         """Build transformed train data and data_info from original data.
 
         .. versionchanged:: 1.0.0
@@ -224,6 +225,12 @@ class DatasetPure(_Dataset):
 
         seed: int, default: 42
             Random seed.
+        dtype_policy : {"compact"}, DtypePolicy or None, default: None
+            Dtypes of the data arrays. If it is "compact", indices will be downcast to
+            ``int32``, and dense values and labels will be ``float32``.
+            See :class:`~libreco.data.DtypePolicy`.
+
+            .. versionadded:: 1.6.0
 
         Returns
         -------
@@ -234,6 +241,7 @@ class DatasetPure(_Dataset):
         """
         cls._check_subclass()
         cls._check_col_names(train_data, is_train=True)
+        dtype_policy = get_dtype_policy(dtype_policy)
         cls.user_unique_vals = np.sort(train_data["user"].unique())
         cls.item_unique_vals = np.sort(train_data["item"].unique())
         if shuffle:
@@ -255,12 +263,22 @@ class DatasetPure(_Dataset):
             item_unique_vals=cls.item_unique_vals,
             seed=seed,
         )
+        if dtype_policy is not None:
+            *_, data_info.dtype_report = apply_dtype_policy(
+                dtype_policy, train_transformed, data_info.n_users, data_info.n_items
+            )
         cls.train_called = True
         return train_transformed, data_info
 
     @classmethod
     def merge_trainset(
-        cls, train_data, data_info, merge_behavior=True, shuffle=False, seed=42
+        cls,
+        train_data,
+        data_info,
+        merge_behavior=True,
+        shuffle=False,
+        seed=42,
+        dtype_policy=None,
     ):
         """Build transformed data by merging new train data with old data.
 
@@ -282,6 +300,12 @@ class DatasetPure(_Dataset):
             Whether to fully shuffle data.
         seed: int, default: 42
             Random seed.
+        dtype_policy : {"compact"}, DtypePolicy or None, default: None
+            Dtypes of the data arrays. If it is "compact", indices will be downcast to
+            ``int32``, and dense values and labels will be ``float32``.
+            See :class:`~libreco.data.DtypePolicy`.
+
+            .. versionadded:: 1.6.0
 
         Returns
         -------
@@ -292,6 +316,7 @@ class DatasetPure(_Dataset):
         """
         assert isinstance(data_info, DataInfo), "Invalid passed `data_info`."
         cls._check_col_names(train_data, is_train=True)
+        dtype_policy = get_dtype_policy(dtype_policy)
         cls.user_unique_vals, cls.item_unique_vals = update_id_unique(
             train_data, data_info
         )
@@ -322,6 +347,13 @@ class DatasetPure(_Dataset):
             item_unique_vals=cls.item_unique_vals,
             seed=seed,
         )
+        if dtype_policy is not None:
+            *_, new_data_info.dtype_report = apply_dtype_policy(
+                dtype_policy,
+                merge_transformed,
+                new_data_info.n_users,
+                new_data_info.n_items,
+            )
         new_data_info.old_info = store_old_info(data_info)
         cls.train_called = True
         return merge_transformed, new_data_info
@@ -396,6 +428,7 @@ class DatasetFeat(_Dataset):
         pad_val="missing",
         shuffle=False,
         seed=42,
+        dtype_policy=None,
     ):
         """Build transformed feat train data and data_info from original data.
 
@@ -436,6 +469,12 @@ class DatasetFeat(_Dataset):
 
         seed: int, default: 42
             Random seed.
+        dtype_policy : {"compact"}, DtypePolicy or None, default: None
+            Dtypes of the data arrays. If it is "compact", indices will be downcast to
+            ``int32``, and dense values and labels will be ``float32``.
+            See :class:`~libreco.data.DtypePolicy`.
+
+            .. versionadded:: 1.6.0
 
         Returns
         -------
@@ -453,6 +492,7 @@ class DatasetFeat(_Dataset):
         cls._check_col_names(train_data, is_train=True)
         cls._set_feature_col(sparse_col, dense_col, multi_sparse_col)
         cls._check_feature_cols(user_col, item_col)
+        dtype_policy = get_dtype_policy(dtype_policy)
         cls.user_unique_vals = np.sort(train_data["user"].unique())
         cls.item_unique_vals = np.sort(train_data["item"].unique())
         cls.sparse_unique_vals = _get_sparse_unique_vals(cls.sparse_col, train_data)
@@ -521,6 +561,22 @@ class DatasetFeat(_Dataset):
         if cls.multi_sparse_col:
             col_name_mapping["multi_sparse"] = multi_sparse_col_map(multi_sparse_col)
 
+        dtype_report = None
+        if dtype_policy is not None:
+            (
+                (user_sparse_unique, item_sparse_unique),
+                (user_dense_unique, item_dense_unique),
+                dtype_report,
+            ) = apply_dtype_policy(
+                dtype_policy,
+                train_transformed,
+                len(cls.user_unique_vals),
+                len(cls.item_unique_vals),
+                _sparse_size(sparse_oov),
+                (user_sparse_unique, item_sparse_unique),
+                (user_dense_unique, item_dense_unique),
+            )
+
         interaction_data = train_data[["user", "item", "label"]]
         user_consumed, item_consumed = interaction_consumed(user_indices, item_indices)
         data_info = DataInfo(
@@ -541,12 +597,19 @@ class DatasetFeat(_Dataset):
             multi_sparse_info,
             seed,
         )
+        data_info.dtype_report = dtype_report
         cls.train_called = True
         return train_transformed, data_info
 
     @classmethod
     def merge_trainset(
-        cls, train_data, data_info, merge_behavior=True, shuffle=False, seed=42
+        cls,
+        train_data,
+        data_info,
+        merge_behavior=True,
+        shuffle=False,
+        seed=42,
+        dtype_policy=None,
     ):
         """Build transformed data by merging new train data with old data.
 
@@ -568,6 +631,12 @@ class DatasetFeat(_Dataset):
             Whether to fully shuffle data.
         seed: int, default: 42
             Random seed.
+        dtype_policy : {"compact"}, DtypePolicy or None, default: None
+            Dtypes of the data arrays. If it is "compact", indices will be downcast to
+            ``int32``, and dense values and labels will be ``float32``.
+            See :class:`~libreco.data.DtypePolicy`.
+
+            .. versionadded:: 1.6.0
 
         Returns
         -------
@@ -578,6 +647,7 @@ class DatasetFeat(_Dataset):
         """
         assert isinstance(data_info, DataInfo), "Invalid passed `data_info`."
         cls._check_col_names(train_data, is_train=True)
+        dtype_policy = get_dtype_policy(dtype_policy)
         cls.user_unique_vals, cls.item_unique_vals = update_id_unique(
             train_data, data_info
         )
@@ -643,6 +713,21 @@ class DatasetFeat(_Dataset):
         item_sparse_unique, item_dense_unique = _update_func(
             unique_ids=cls.item_unique_vals, is_user=False
         )
+        dtype_report = None
+        if dtype_policy is not None:
+            (
+                (user_sparse_unique, item_sparse_unique),
+                (user_dense_unique, item_dense_unique),
+                dtype_report,
+            ) = apply_dtype_policy(
+                dtype_policy,
+                merge_transformed,
+                len(cls.user_unique_vals),
+                len(cls.item_unique_vals),
+                _sparse_size(sparse_oov),
+                (user_sparse_unique, item_sparse_unique),
+                (user_dense_unique, item_dense_unique),
+            )
 
         interaction_data = train_data[["user", "item", "label"]]
         user_consumed, item_consumed = update_consumed(
@@ -672,11 +757,17 @@ class DatasetFeat(_Dataset):
             multi_sparse_info,
             seed,
         )
+        new_data_info.dtype_report = dtype_report
         new_data_info.old_info = store_old_info(data_info)
         cls.train_called = True
         return merge_transformed, new_data_info
 
 
+def _sparse_size(sparse_oov):
+    # oov is the last index of each sparse feature
+    return int(np.max(sparse_oov)) + 1 if sparse_oov is not None else None
+
+
 def _get_sparse_unique_vals(sparse_col, train_data):
     if not sparse_col:
         return
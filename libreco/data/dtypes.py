@@ -0,0 +1,154 @@
+"""Dtype Policy for Compacting Data Arrays."""
+from dataclasses import dataclass
+
+import numpy as np
+
+UINT16_MAX = np.iinfo(np.uint16).max
+
+
+# noinspection PyUnresolvedReferences
+@dataclass
+class DtypePolicy:
+    """`dataclasses <https://docs.python.org/3/library/dataclasses.html>`_
+    for specifying the dtypes of arrays in ``TransformedSet`` and ``DataInfo``.
+
+    Downcasting indices is lossless, so model outputs remain unchanged.
+    The compact arrays are fed into models directly, and TensorFlow
+    will cast them to the dtypes of the placeholders.
+
+    Attributes
+    ----------
+    index : {"int32", "auto"}, default: "int32"
+        Dtype of user, item and sparse indices. If it is "auto", ``uint16`` will be
+        used when the vocabulary contains no more than 65535 values, otherwise ``int32``.
+    dense : {"float32", "float16"}, default: "float32"
+        Dtype of dense values.
+
+        .. Warning::
+            ``float16`` loses precision, so model outputs may change slightly.
+    """
+
+    index: str = "int32"
+    dense: str = "float32"
+
+    def __post_init__(self):
+        if self.index not in ("int32", "auto"):
+            raise ValueError(f"index dtype must be `int32` or `auto`, got {self.index}")
+        if self.dense not in ("float32", "float16"):
+            raise ValueError(
+                f"dense dtype must be `float32` or `float16`, got {self.dense}"
+            )
+
+    def index_dtype(self, vocab_size):
+        if self.index == "auto" and vocab_size <= UINT16_MAX:
+            return np.uint16
+        return np.int32
+
+    def dense_dtype(self):
+        return np.float16 if self.dense == "float16" else np.float32
+
+
+@dataclass
+class DtypeReport:
+    """Memory usage of the data arrays before and after applying ``DtypePolicy``."""
+
+    bytes_before: int
+    bytes_after: int
+
+    @property
+    def bytes_saved(self):
+        return self.bytes_before - self.bytes_after
+
+    def __str__(self):
+        mb = 1024**2
+        return (
+            f"dtype policy memory: {self.bytes_before / mb:.2f} MB -> "
+            f"{self.bytes_after / mb:.2f} MB, saved {self.bytes_saved / mb:.2f} MB"
+        )
+
+
+def get_dtype_policy(dtype_policy):
+    if dtype_policy is None or isinstance(dtype_policy, DtypePolicy):
+        return dtype_policy
+    if dtype_policy == "compact":
+        return DtypePolicy()
+    raise ValueError(
+        f"`dtype_policy` must be None, `compact` or `DtypePolicy`, got {dtype_policy}"
+    )
+
+
+def _nbytes(*arrays):
+    return sum(a.nbytes for a in arrays if a is not None)
+
+
+def _cast(array, dtype):
+    if array is None:
+        return
+    return array.astype(dtype, copy=False)
+
+
+def apply_dtype_policy(
+    policy,
+    data,
+    n_users,
+    n_items,
+    sparse_size=None,
+    sparse_uniques=(),
+    dense_uniques=(),
+):
+    """Cast arrays in ``TransformedSet`` and unique feature matrices in place.
+
+    Parameters
+    ----------
+    policy : DtypePolicy
+        The dtype policy to apply.
+    data : TransformedSet
+        Transformed train data.
+    n_users : int
+        Number of users, one extra index is reserved for oov.
+    n_items : int
+        Number of items, one extra index is reserved for oov.
+    sparse_size : int or None, default: None
+        Number of all the sparse indices, including oov.
+    sparse_uniques : tuple of numpy.ndarray
+        Unique sparse feature matrices of users and items.
+    dense_uniques : tuple of numpy.ndarray
+        Unique dense feature matrices of users and items.
+
+    Returns
+    -------
+    sparse_uniques : tuple of numpy.ndarray
+        Compact unique sparse feature matrices.
+    dense_uniques : tuple of numpy.ndarray
+        Compact unique dense feature matrices.
+    report : DtypeReport
+        Memory usage before and after compacting.
+    """
+    data_arrays = (
+        data.user_indices,
+        data.item_indices,
+        data.labels,
+        data.sparse_indices,
+        data.dense_values,
+    )
+    bytes_before = _nbytes(*data_arrays, *sparse_uniques, *dense_uniques)
+
+    sparse_dtype = policy.index_dtype(sparse_size) if sparse_size else None
+    dense_dtype = policy.dense_dtype()
+    data._user_indices = _cast(data.user_indices, policy.index_dtype(n_users + 1))
+    data._item_indices = _cast(data.item_indices, policy.index_dtype(n_items + 1))
+    data._labels = _cast(data.labels, np.float32)
+    data._sparse_indices = _cast(data.sparse_indices, sparse_dtype)
+    data._dense_values = _cast(data.dense_values, dense_dtype)
+    sparse_uniques = tuple(_cast(u, sparse_dtype) for u in sparse_uniques)
+    dense_uniques = tuple(_cast(u, dense_dtype) for u in dense_uniques)
+
+    data_arrays = (
+        data.user_indices,
+        data.item_indices,
+        data.labels,
+        data.sparse_indices,
+        data.dense_values,
+    )
+    bytes_after = _nbytes(*data_arrays, *sparse_uniques, *dense_uniques)
+    return sparse_uniques, dense_uniques, DtypeReport(bytes_before, bytes_after)
@@ -1,3 +1,7 @@
+import json
+import re
+from pathlib import Path
+
 import numpy as np
 from sklearn.preprocessing import (
     MinMaxScaler,
@@ -140,13 +144,7 @@ def split_multi_value(
     user_sparse_col, item_sparse_col, multi_sparse_col = [], [], []
     for j, col in enumerate(multi_value_col):
         sparse_col = []
-        data[col] = (
-            data[col]
-            .str.strip(sep + " ")
-            .str.replace("\\s+", "", regex=True)
-            .str.lower()
-        )
-        data.loc[data[col] == "", col] = pad_val[j]
+        data[col] = _clean_multi_value(data[col], sep, pad_val[j])
         split_col = data[col].str.split(sep)
         col_len = int(split_col.str.len().max()) if max_len is None else max_len[j]
         for i in range(col_len):
@@ -163,3 +161,336 @@ def split_multi_value(
 
     data = data.fillna(pad_val[0]).drop(multi_value_col, axis=1)
     return data, multi_sparse_col, user_sparse_col, item_sparse_col
+
+
+def _clean_multi_value(values, sep, pad_val):
+    values = values.str.strip(sep + " ").str.replace("\\s+", "", regex=True).str.lower()
+    values[values == ""] = pad_val
+    return values
+
+
+class StreamingProcessor:
+    """Feature preprocessing pipeline that is fitted and applied chunk by chunk.
+
+    This is the streaming counterpart of :func:`process_data` and
+    :func:`split_multi_value`. Statistics are learned with ``partial_fit``, so the
+    whole feature table never needs to be loaded, and each chunk is transformed in
+    place lazily.
+
+    .. versionadded:: 1.6.0
+
+    Parameters
+    ----------
+    dense_col : list of str or None, default: None
+        Dense column names to normalize.
+    normalizer : {"min_max", "standard"}, default: "min_max"
+        Normalizer for dense features. Only scalers supporting ``partial_fit``
+        can be used.
+    transformer : tuple of {"log", "sqrt", "square"} or None, default: ("log", "sqrt", "square")
+        Extra transformed dense features. Same as :func:`process_data`, a column is
+        transformed only if its normalized minimum value in training data is not negative.
+        Negative values in later chunks are clipped to 0 before transforming.
+    multi_value_col : list of str or None, default: None
+        Multi-value columns names.
+    sep : str or None, default: None
+        Delimiter of multi-value features.
+    max_len : list or tuple of int or None, default: None
+        The maximum number of sub-features after transformation.
+        If it is None, the maximum length seen in ``partial_fit`` will be used.
+    pad_val : Any or list of Any, default: "missing"
+        The padding value used for missing multi-value features.
+    user_col : list of str or None, default: None
+        User column names.
+    item_col : list of str or None, default: None
+        Item column names.
+
+    Raises
+    ------
+    ValueError
+        If ``normalizer`` doesn't support ``partial_fit``.
+
+    Examples
+    --------
+    >>> processor = StreamingProcessor(dense_col=["age"], multi_value_col=["genre"], sep="|")
+    >>> for chunk in pd.read_csv("data.csv", chunksize=100000):
+    ...     processor.partial_fit(chunk)
+    >>> chunks = processor.transform_chunks(pd.read_csv("data.csv", chunksize=100000))
+    """
+
+    def __init__(
+        self,
+        dense_col=None,
+        normalizer="min_max",
+        transformer=("log", "sqrt", "square"),
+        multi_value_col=None,
+        sep=None,
+        max_len=None,
+        pad_val="missing",
+        user_col=None,
+        item_col=None,
+    ):
+        if dense_col is not None and not isinstance(dense_col, list):
+            raise ValueError("dense_col must be a list...")
+        if normalizer.lower() not in ("min_max", "standard"):
+            raise ValueError(
+                f"normalizer `{normalizer}` doesn't support partial_fit, "
+                f"use `min_max` or `standard`."
+            )
+        multi_value_col = multi_value_col or []
+        if multi_value_col and sep is None:
+            raise ValueError("must provide `sep` for multi_value_col")
+        if max_len is not None:
+            assert isinstance(max_len, (list, tuple)), "`max_len` must be list or tuple"
+            assert len(max_len) == len(multi_value_col), (
+                "`max_len` must have same length as `multi_value_col`"
+            )  # fmt: skip
+        if not isinstance(pad_val, (list, tuple)):
+            pad_val = [pad_val] * len(multi_value_col)
+
+        self.dense_col = dense_col or []
+        self.normalizer = normalizer.lower()
+        self.transformer = list(transformer) if transformer else []
+        self.multi_value_col = multi_value_col
+        self.sep = sep
+        self.max_len = list(max_len) if max_len is not None else None
+        self.pad_val = list(pad_val)
+        self.user_col = user_col
+        self.item_col = item_col
+        self.scaler = self._build_scaler()
+        self.data_min = None
+        self.n_samples_seen = 0
+        self.seen_max_len = [0] * len(multi_value_col)
+
+    def _build_scaler(self):
+        return MinMaxScaler() if self.normalizer == "min_max" else StandardScaler()
+
+    def partial_fit(self, chunk):
+        """Update statistics with a chunk of training data.
+
+        Parameters
+        ----------
+        chunk : pandas.DataFrame
+            Chunk of training data.
+
+        Returns
+        -------
+        self : StreamingProcessor
+        """
+        if self.dense_col:
+            values = chunk[self.dense_col].to_numpy(dtype=np.float64)
+            self.scaler.partial_fit(values)
+            chunk_min = np.nanmin(values, axis=0)
+            if self.data_min is None:
+                self.data_min = chunk_min
+            else:
+                self.data_min = np.minimum(self.data_min, chunk_min)
+        for j, col in enumerate(self.multi_value_col):
+            values = _clean_multi_value(chunk[col], self.sep, self.pad_val[j])
+            lens = values.str.count(re.escape(self.sep)) + 1
+            self.seen_max_len[j] = max(self.seen_max_len[j], int(lens.max()))
+        self.n_samples_seen += len(chunk)
+        return self
+
+    def fit(self, chunks):
+        """Fit statistics on all the chunks of training data.
+
+        Parameters
+        ----------
+        chunks : iterable of pandas.DataFrame
+            Chunks of training data, e.g. ``pd.read_csv(..., chunksize=n)``.
+
+        Returns
+        -------
+        self : StreamingProcessor
+        """
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        return self
+
+    def _check_fitted(self):
+        if self.n_samples_seen == 0:
+            raise RuntimeError("StreamingProcessor must be fitted before transform")
+
+    @property
+    def transformable_col(self):
+        """Dense columns whose normalized training values are not negative."""
+        if not self.dense_col or not self.transformer:
+            return []
+        self._check_fitted()
+        scaled_min = self.scaler.transform(self.data_min[np.newaxis, :])[0]
+        return [col for col, m in zip(self.dense_col, scaled_min) if m >= 0.0]
+
+    @property
+    def dense_col_transformed(self):
+        """All dense column names after transformation."""
+        dense_col_transformed = self.dense_col.copy()
+        for col in self.transformable_col:
+            dense_col_transformed.extend(f"{col}_{t}" for t in self.transformer)
+        return dense_col_transformed
+
+    @property
+    def col_lens(self):
+        """Number of sub-features of each multi-value column."""
+        return self.max_len if self.max_len is not None else self.seen_max_len
+
+    @property
+    def multi_sparse_col(self):
+        """Transformed multi-sparse column names."""
+        return [
+            [f"{col}_{i+1}" for i in range(col_len)]
+            for col, col_len in zip(self.multi_value_col, self.col_lens)
+        ]
+
+    @property
+    def user_sparse_col(self):
+        """Transformed user multi-sparse columns."""
+        return self._sparse_col_in(self.user_col)
+
+    @property
+    def item_sparse_col(self):
+        """Transformed item multi-sparse columns."""
+        return self._sparse_col_in(self.item_col)
+
+    def _sparse_col_in(self, feat_col):
+        sparse_col = []
+        if feat_col is not None:
+            for col, sub_cols in zip(self.multi_value_col, self.multi_sparse_col):
+                if col in feat_col:
+                    sparse_col.extend(sub_cols)
+        return sparse_col
+
+    def transform(self, chunk):
+        """Transform a chunk of data in place.
+
+        Parameters
+        ----------
+        chunk : pandas.DataFrame
+            Chunk of data.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Transformed chunk.
+        """
+        self._check_fitted()
+        if self.dense_col:
+            values = chunk[self.dense_col].to_numpy(dtype=np.float64)
+            chunk[self.dense_col] = self.scaler.transform(values).astype(np.float32)
+            for col in self.transformable_col:
+                values = np.clip(chunk[col].to_numpy(), 0.0, None)
+                if "log" in self.transformer:
+                    chunk[col + "_log"] = np.log1p(values)
+                if "sqrt" in self.transformer:
+                    chunk[col + "_sqrt"] = np.sqrt(values)
+                if "square" in self.transformer:
+                    chunk[col + "_square"] = np.square(values)
+        if self.multi_value_col:
+            chunk, *_ = split_multi_value(
+                chunk,
+                self.multi_value_col,
+                self.sep,
+                max_len=self.col_lens,
+                pad_val=self.pad_val,
+                user_col=self.user_col,
+                item_col=self.item_col,
+            )
+        return chunk
+
+    def transform_chunks(self, chunks):
+        """Lazily transform chunks of data.
+
+        Parameters
+        ----------
+        chunks : iterable of pandas.DataFrame
+            Chunks of data.
+
+        Yields
+        ------
+        pandas.DataFrame
+            Transformed chunk.
+        """
+        for chunk in chunks:
+            yield self.transform(chunk)
+
+    def save(self, path, model_name):
+        """Save :class:`StreamingProcessor`, typically in the same folder as :class:`DataInfo`.
+
+        Parameters
+        ----------
+        path : str
+            File folder path to save :class:`StreamingProcessor`.
+        model_name : str
+            Name of the saved file.
+        """
+        path = Path(path)
+        if not path.is_dir():
+            print(f"file folder {path} doesn't exists, creating a new one...")
+            path.mkdir()
+        config = {
+            "dense_col": self.dense_col,
+            "normalizer": self.normalizer,
+            "transformer": self.transformer,
+            "multi_value_col": self.multi_value_col,
+            "sep": self.sep,
+            "max_len": self.max_len,
+            "pad_val": self.pad_val,
+            "user_col": self.user_col,
+            "item_col": self.item_col,
+            "n_samples_seen": self.n_samples_seen,
+            "seen_max_len": self.seen_max_len,
+        }
+        with open(path / f"{model_name}_processor.json", "w") as f:
+            json.dump(config, f, separators=(",", ":"), indent=4)
+
+        stats = dict()
+        if self.dense_col and self.n_samples_seen > 0:
+            stats["data_min"] = self.data_min
+            for attr in _SCALER_ATTRS[self.normalizer]:
+                stats[attr] = getattr(self.scaler, attr)
+        np.savez_compressed(path / f"{model_name}_processor", **stats)
+
+    @classmethod
+    def load(cls, path, model_name):
+        """Load saved :class:`StreamingProcessor`.
+
+        Parameters
+        ----------
+        path : str
+            File folder path to save :class:`StreamingProcessor`.
+        model_name : str
+            Name of the saved file.
+        """
+        path = Path(path)
+        if not path.exists():
+            raise OSError(f"file folder {path} doesn't exists...")
+        with open(path / f"{model_name}_processor.json", "r") as f:
+            config = json.load(f)
+        n_samples_seen = config.pop("n_samples_seen")
+        seen_max_len = config.pop("seen_max_len")
+        processor = cls(**config)
+        processor.n_samples_seen = n_samples_seen
+        processor.seen_max_len = seen_max_len
+
+        stats = np.load(path / f"{model_name}_processor.npz")
+        if "data_min" in stats:
+            processor.data_min = stats["data_min"]
+            for attr in _SCALER_ATTRS[processor.normalizer]:
+                value = stats[attr]
+                setattr(
+                    processor.scaler, attr, value.item() if value.ndim == 0 else value
+                )
+        return processor
+
+
+_SCALER_ATTRS = {
+    "min_max": (
+        "n_features_in_",
+        "n_samples_seen_",
+        "data_min_",
+        "data_max_",
+        "data_range_",
+        "scale_",
+        "min_",
+    ),
+    "standard": ("n_features_in_", "n_samples_seen_", "mean_", "var_", "scale_"),
+}
@@ -80,20 +80,14 @@ def random_split(
 
 def _filter_unknown_user_item(data_list):
     train_data = data_list[0]
-    unique_users = set(train_data["user"].tolist())
-    unique_items = set(train_data["item"].tolist())
+    unique_users = train_data["user"].unique()
+    unique_items = train_data["item"].unique()
 
     split_data_all = [train_data]
     for test_data in data_list[1:]:
-        oov_user_indices = [
-            j for j, v in enumerate(test_data["user"]) if v not in unique_users
-        ]
-        oov_item_indices = [
-            j for j, v in enumerate(test_data["item"]) if v not in unique_items
-        ]
-        oov_indices = list(set(oov_user_indices + oov_item_indices))
-        mask = np.arange(len(test_data))
-        test_data_clean = test_data[~np.isin(mask, oov_indices)]
+        known_mask = test_data["user"].isin(unique_users).to_numpy()
+        known_mask &= test_data["item"].isin(unique_items).to_numpy()
+        test_data_clean = test_data[known_mask]
         split_data_all.append(test_data_clean)
     return split_data_all
 
@@ -175,23 +169,21 @@ def split_by_ratio(
     assert "user" in data.columns, "data must contains user column"
     ratios, n_splits = _check_and_convert_ratio(test_size, multi_ratios)
 
-    n_users = data.user.nunique()
     user_indices = data.user.to_numpy()
-    user_split_indices = _groupby_user(user_indices, order)
-
-    cum_ratios = np.cumsum(ratios).tolist()[:-1]
-    split_indices_all = [[] for _ in range(n_splits)]
-    for u in range(n_users):
-        u_data = user_split_indices[u]
-        u_data_len = len(u_data)
-        if u_data_len <= 3:  # keep items of rare users in trainset
-            split_indices_all[0].extend(u_data)
-        else:
-            u_split_data = np.split(
-                u_data, [round(cum * u_data_len) for cum in cum_ratios]
-            )
-            for i in range(n_splits):
-                split_indices_all[i].extend(list(u_split_data[i]))
+    sorted_indices, group_starts, group_lens = _groupby_user(user_indices, order)
+
+    # keep items of rare users in trainset
+    normal_groups = group_lens > 3
+    starts, lens = group_starts[normal_groups], group_lens[normal_groups]
+    # mark split boundaries and reset them at the end of each user group,
+    # then the cumulative sum becomes the split id of every row.
+    # `np.rint` rounds half to even, which is consistent with python `round`
+    marks = np.zeros(len(sorted_indices) + 1, dtype=np.int8)
+    for cum in np.cumsum(ratios)[:-1]:
+        np.add.at(marks, starts + np.rint(cum * lens).astype(np.int64), 1)
+    np.subtract.at(marks, starts + lens, n_splits - 1)
+    split_ids = np.cumsum(marks[:-1], dtype=np.int8)
+    split_indices_all = [sorted_indices[split_ids == i] for i in range(n_splits)]
 
     if shuffle:
         np_rng = np.random.default_rng(seed)
@@ -263,24 +255,19 @@ def split_by_num(
     assert isinstance(test_size, int), "test_size must be int value"
     assert 0 < test_size < len(data), "test_size must be in (0, len(data))"
 
-    n_users = data.user.nunique()
     user_indices = data.user.to_numpy()
-    user_split_indices = _groupby_user(user_indices, order)
-
-    train_indices = []
-    test_indices = []
-    for u in range(n_users):
-        u_data = user_split_indices[u]
-        u_data_len = len(u_data)
-        if u_data_len <= 3:  # keep items of rare users in trainset
-            train_indices.extend(u_data)
-        elif u_data_len <= test_size:
-            train_indices.extend(u_data[:-1])
-            test_indices.extend(u_data[-1:])
-        else:
-            k = test_size
-            train_indices.extend(u_data[: (u_data_len - k)])
-            test_indices.extend(u_data[-k:])
+    sorted_indices, group_starts, group_lens = _groupby_user(user_indices, order)
+
+    # keep items of rare users in trainset, and leave at least one item in trainset
+    test_nums = np.where(group_lens <= test_size, 1, test_size)
+    test_nums[group_lens <= 3] = 0
+    group_ends = group_starts + group_lens
+    marks = np.zeros(len(sorted_indices) + 1, dtype=np.int8)
+    np.add.at(marks, group_ends - test_nums, 1)
+    np.subtract.at(marks, group_ends, 1)
+    test_mask = np.cumsum(marks[:-1], dtype=np.int8).astype(bool)
+    train_indices = sorted_indices[~test_mask]
+    test_indices = sorted_indices[test_mask]
 
     if shuffle:
         np_rng = np.random.default_rng(seed)
@@ -383,14 +370,32 @@ def split_by_num_chrono(data, order=True, shuffle=False, test_size=1, seed=42):
 
 
 def _groupby_user(user_indices, order):
-    sort_kind = "mergesort" if order else "quicksort"
-    _, user_position, user_counts = np.unique(
-        user_indices, return_inverse=True, return_counts=True
-    )
-    user_split_indices = np.split(
-        np.argsort(user_position, kind=sort_kind), np.cumsum(user_counts)[:-1]
-    )
-    return user_split_indices
+    """Group row indices by user with a single sort, without creating per-user arrays.
+
+    Returns
+    -------
+    sorted_indices : numpy.ndarray
+        Row indices grouped by user, users are in ascending order.
+    group_starts : numpy.ndarray
+        Start position of each user group in ``sorted_indices``.
+    group_lens : numpy.ndarray
+        Number of rows of each user group.
+    """
+    if order:
+        # stable sort on original values is equivalent to stable sort on unique positions
+        sorted_indices = np.argsort(user_indices, kind="stable")
+        sorted_users = user_indices[sorted_indices]
+        group_starts = np.flatnonzero(sorted_users[1:] != sorted_users[:-1]) + 1
+    else:
+        _, user_position = np.unique(user_indices, return_inverse=True)
+        sorted_indices = np.argsort(user_position, kind="quicksort")
+        sorted_position = user_position[sorted_indices]
+        group_starts = np.flatnonzero(np.diff(sorted_position)) + 1
+
+    n = len(sorted_indices)
+    group_starts = np.concatenate([[0], group_starts]).astype(np.int64)
+    group_lens = np.diff(group_starts, append=n)
+    return sorted_indices, group_starts, group_lens
 
 
 def _check_and_convert_ratio(test_size, multi_ratios):
@@ -7,7 +7,12 @@ import pandas as pd
 from scipy.sparse import csr_matrix
 
 from .consumed import interaction_consumed
-from ..sampling import negatives_from_unconsumed
+from ..sampling import (
+    AliasSampler,
+    negatives_from_unconsumed,
+    negatives_from_unconsumed_csr,
+)
+from ..utils.sparse import build_sorted_csr
 
 
 class TransformedSet:
@@ -134,9 +139,14 @@ class TransformedEvalSet:
                 user_consumed[u].append(i)
         return {u: np.unique(items).tolist() for u, items in user_consumed.items()}
 
-    def build_negatives(self, n_items, num_neg, seed):
+    def build_negatives(
+        self, n_items, num_neg, seed, vectorized=True, item_weights=None
+    ):
         """Perform negative sampling on all the data contained.
 
+        .. versionchanged:: 1.6.0
+           Add ``vectorized`` and ``item_weights`` parameters.
+
         Parameters
         ----------
         n_items : int
@@ -145,13 +155,33 @@ class TransformedEvalSet:
             Number of negative samples for each positive sample.
         seed : int
             Random seed.
+        vectorized : bool, default: True
+            Whether to sample all the negatives at once with NumPy.
+            If False, the legacy loop sampling will be used, which yields
+            the same negatives as previous versions for the same ``seed``.
+        item_weights : array_like or None, default: None
+            Sampling weights of all items, e.g. item popularity. Negatives are drawn in
+            proportion to the weights through an alias table. If None, negatives are drawn
+            uniformly. Only used when ``vectorized`` is True.
         """
-        set_random_seed(seed)
         self.has_sampled = True
         # use original users and items to sample
-        items_neg = self._sample_neg_items(
-            self.user_indices, self.item_indices, n_items, num_neg
-        )
+        if vectorized:
+            np_rng = np.random.default_rng(seed)
+            alias_sampler = None if item_weights is None else AliasSampler(item_weights)
+            items_neg = self._sample_neg_items_vectorized(
+                np_rng,
+                self.user_indices,
+                self.item_indices,
+                n_items,
+                num_neg,
+                alias_sampler,
+            )
+        else:
+            set_random_seed(seed)
+            items_neg = self._sample_neg_items(
+                self.user_indices, self.item_indices, n_items, num_neg
+            )
         self.user_indices = np.repeat(self.user_indices, num_neg + 1)
         self.item_indices = np.repeat(self.item_indices, num_neg + 1)
         self.labels = np.zeros_like(self.item_indices, dtype=np.float32)
@@ -168,6 +198,26 @@ class TransformedEvalSet:
             user_consumed_set, users, items, n_items, num_neg
         )
 
+    def _sample_neg_items_vectorized(
+        self, np_rng, users, items, n_items, num_neg, alias_sampler=None
+    ):
+        # eval data may contain oov users and items
+        n_rows = int(np.max(self.user_indices)) + 1
+        n_cols = max(n_items, int(np.max(self.item_indices)) + 1)
+        consumed_indptr, consumed_indices = build_sorted_csr(
+            self.user_indices, self.item_indices, n_rows, n_cols
+        )
+        return negatives_from_unconsumed_csr(
+            np_rng,
+            consumed_indptr,
+            consumed_indices,
+            users,
+            items,
+            n_items,
+            num_neg,
+            alias_sampler=alias_sampler,
+        )
+
     def __len__(self):
         return len(self.labels)
 
@@ -1,8 +1,7 @@
 from collections import defaultdict
 
 import numpy as np
-
-from .sparse import column_sparse_indices
+import pandas as pd
 
 
 def update_unique_vals(data, old_unique_vals, pad_val=None):
@@ -138,11 +137,17 @@ def get_sparse_feats(data_info, sparse_offset, sparse_oov, new_num, col_idxs, is
     if new_num > len(old_sp):
         diff = new_num - len(old_sp)
         oovs = sparse_oov[col_idxs]
-        new_vals = np.full([diff, old_sp.shape[1]], oovs, old_sp.dtype)
+        dtype = fit_index_dtype(new_sp.dtype, oovs)
+        new_vals = np.full([diff, old_sp.shape[1]], oovs, dtype)
         new_sp = np.vstack([new_sp, new_vals])
     return new_sp
 
 
+def fit_index_dtype(dtype, indices):
+    """Widen the dtype of compact sparse indices if it can't hold ``indices``."""
+    return np.result_type(dtype, np.min_scalar_type(np.max(indices)))
+
+
 def get_dense_feats(data_info, new_num, is_user):
     old_ds = data_info.user_dense_unique if is_user else data_info.item_dense_unique
     if old_ds is None:
@@ -171,12 +176,29 @@ def update_oovs(data_info, old_sparse, new_sparse, sparse_oov, col_idxs):
 
 
 def get_row_id_masks(data_ids, unique_ids):
-    id_mask = np.isin(data_ids, unique_ids)
-    id_mapping = dict(zip(unique_ids, range(len(unique_ids))))
-    row_idxs = np.array([id_mapping[i] if i in id_mapping else -1 for i in data_ids])
+    row_idxs = encode_values(data_ids, unique_ids)
+    id_mask = row_idxs != -1
     return row_idxs, id_mask
 
 
+def encode_values(values, unique_vals):
+    """Map values to their positions in ``unique_vals`` through a hash table, -1 if absent."""
+    return pd.Index(unique_vals).get_indexer(values)
+
+
+def get_unique_rows(rows, *unique_matrices):
+    return [m[rows] if m is not None else None for m in unique_matrices]
+
+
+def get_changed_rows(rows, old_rows, *unique_matrices):
+    """Find rows whose values in any unique feature matrix differ from ``old_rows``."""
+    changed = np.zeros(len(rows), dtype=bool)
+    for old, matrix in zip(old_rows, unique_matrices):
+        if matrix is not None:
+            changed |= np.any(matrix[rows] != old, axis=1)
+    return np.sort(rows[changed])
+
+
 def update_new_sparse_feats(
     data,
     row_idxs,
@@ -203,15 +225,12 @@ def update_new_sparse_feats(
             unique_vals = sparse_unique_vals[col]
 
         # used in `data_info.assign_features()`, new data may contain oov values.
-        col_values = data[col].to_numpy()
-        col_mask = id_mask & np.isin(col_values, unique_vals)
-        indices, values = row_idxs[col_mask], col_values[col_mask]
-        assert np.all(indices != -1)  # oov is marked as -1 in `id_mask`
-
-        sparse_indices = column_sparse_indices(
-            values, unique_vals, is_train=True, is_ordered=False
+        sparse_indices = encode_values(data[col].to_numpy(), unique_vals)
+        col_mask = id_mask & (sparse_indices != -1)
+        indices = row_idxs[col_mask]
+        unique_matrix[indices, feat_idx] = (
+            sparse_offset[col_index] + sparse_indices[col_mask]
         )
-        unique_matrix[indices, feat_idx] = sparse_offset[col_index] + sparse_indices
     return unique_matrix
 
 
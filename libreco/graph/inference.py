@@ -3,6 +3,7 @@ from torch.nn import functional as F
 from tqdm import tqdm
 
 from .from_dgl import build_i2i_homo_graph
+from ..batch.batch_unit import tensor_from_numpy
 
 
 def full_neighbor_embeddings(model):
@@ -78,10 +79,10 @@ def _compute_features(torch_model, data_info, n_items, batch_size, device):
         items = all_items[i : i + batch_size]
         sparse_indices, dense_values = None, None
         if data_info.item_sparse_unique is not None:
-            sparse_indices = torch.from_numpy(data_info.item_sparse_unique[items])
+            sparse_indices = tensor_from_numpy(data_info.item_sparse_unique[items])
             sparse_indices = sparse_indices.to(device)
         if data_info.item_dense_unique is not None:
-            dense_values = torch.from_numpy(data_info.item_dense_unique[items])
+            dense_values = tensor_from_numpy(data_info.item_dense_unique[items])
             dense_values = dense_values.to(device)
         items = torch.tensor(items, dtype=torch.long, device=device)
         features.append(
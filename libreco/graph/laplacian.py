@@ -0,0 +1,246 @@
+"""Normalized adjacency matrices of the user-item bipartite graph."""
+import hashlib
+import itertools
+import os
+import tempfile
+
+import numpy as np
+import torch
+from scipy import sparse as ssp
+
+from ..utils.sparse import build_sorted_csr
+
+
+def build_normalized_adjacency(
+    user_indices, item_indices, n_users, n_items, norm="symmetric", self_loop=False
+):
+    """Build the normalized adjacency matrix of the user-item graph.
+
+    Users occupy the first ``n_users`` nodes and items the following ``n_items``
+    nodes. Duplicate interactions are counted once.
+
+    Parameters
+    ----------
+    user_indices : array_like
+        User index of every interaction.
+    item_indices : array_like
+        Item index of every interaction.
+    n_users : int
+        Number of users.
+    n_items : int
+        Number of items.
+    norm : {'symmetric', 'left'}, default: 'symmetric'
+        ``'symmetric'`` computes :math:`D^{-1/2} A D^{-1/2}`, which is used in LightGCN.
+        ``'left'`` computes :math:`D^{-1} A`, which is used in NGCF.
+    self_loop : bool, default: False
+        Whether to add the identity matrix to the adjacency matrix before normalization.
+
+    Returns
+    -------
+    scipy.sparse.coo_matrix
+        Normalized adjacency matrix, with rows and columns sorted.
+    """
+    if norm not in ("symmetric", "left"):
+        raise ValueError(f"unknown norm: {norm}")
+    n_nodes = n_users + n_items
+    indptr, indices = build_sorted_csr(user_indices, item_indices, n_users, n_items)
+    values = np.ones(len(indices), dtype=np.float32)
+    interactions = ssp.csr_matrix((values, indices, indptr), shape=(n_users, n_items))
+    # transposing in csr format sorts users of every item in compiled code
+    adj_matrix = ssp.bmat(
+        [[None, interactions], [interactions.T.tocsr(), None]], format="csr"
+    )
+    if self_loop:
+        adj_matrix = adj_matrix + ssp.identity(n_nodes, np.float32, format="csr")
+    adj_matrix.sort_indices()
+
+    # all the elements are 1, so the degree of a node is the length of its row
+    degrees = np.diff(adj_matrix.indptr).astype(np.float32)
+    rows = np.repeat(np.arange(n_nodes), np.diff(adj_matrix.indptr))
+    cols = adj_matrix.indices
+    with np.errstate(divide="ignore"):
+        exponent = -0.5 if norm == "symmetric" else -1.0
+        diag_inv = np.power(degrees, exponent)
+    diag_inv[np.isinf(diag_inv)] = 0.0
+    if norm == "symmetric":
+        data = diag_inv[rows] * diag_inv[cols]
+    else:
+        data = diag_inv[rows]
+    return ssp.coo_matrix((data, (rows, cols)), shape=(n_nodes, n_nodes))
+
+
+def interactions_from_consumed(user_consumed, n_users):
+    """Flatten ``user_consumed`` into user and item indices."""
+    consumed_lens = np.fromiter(
+        (len(user_consumed[u]) for u in range(n_users)), dtype=np.int64, count=n_users
+    )
+    item_indices = np.fromiter(
+        itertools.chain.from_iterable(user_consumed[u] for u in range(n_users)),
+        dtype=np.int64,
+        count=int(consumed_lens.sum()),
+    )
+    user_indices = np.repeat(np.arange(n_users), consumed_lens)
+    return user_indices, item_indices
+
+
+def data_fingerprint(user_indices, item_indices, n_users, n_items, *extra):
+    """Hash of the interactions and graph options, used as the cache key."""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(repr((n_users, n_items, *extra)).encode())
+    hasher.update(np.ascontiguousarray(user_indices, dtype=np.int64).tobytes())
+    hasher.update(np.ascontiguousarray(item_indices, dtype=np.int64).tobytes())
+    return hasher.hexdigest()
+
+
+def load_laplacian_matrix(
+    user_consumed,
+    n_users,
+    n_items,
+    device,
+    norm="symmetric",
+    self_loop=False,
+    cache_dir=None,
+):
+    """Build the normalized adjacency matrix as a torch sparse tensor.
+
+    If ``cache_dir`` is provided, the matrix is loaded from the file named by the
+    fingerprint of the interactions when it exists, otherwise it is built and saved
+    there. So the matrix is only built once for the same training data, e.g. when a
+    model is built again for retraining or with other hyperparameters.
+
+    Returns
+    -------
+    torch.Tensor
+        Sparse COO tensor of shape ``(n_users + n_items, n_users + n_items)``.
+    """
+    user_indices, item_indices = interactions_from_consumed(user_consumed, n_users)
+    cache_path = None
+    if cache_dir is not None:
+        fingerprint = data_fingerprint(
+            user_indices, item_indices, n_users, n_items, norm, self_loop
+        )
+        cache_path = os.path.join(cache_dir, f"laplacian_{fingerprint}.npz")
+
+    if cache_path is not None and os.path.exists(cache_path):
+        with np.load(cache_path) as cache:
+            rows, cols, data = cache["rows"], cache["cols"], cache["data"]
+    else:
+        coo = build_normalized_adjacency(
+            user_indices, item_indices, n_users, n_items, norm, self_loop
+        )
+        rows, cols, data = coo.row, coo.col, coo.data
+        if cache_path is not None:
+            _save_cache(cache_dir, cache_path, rows=rows, cols=cols, data=data)
+
+    n_nodes = n_users + n_items
+    indices = torch.from_numpy(np.vstack([rows, cols]).astype(np.int64))
+    values = torch.from_numpy(data)
+    return torch.sparse_coo_tensor(
+        indices, values, (n_nodes, n_nodes), dtype=torch.float32, device=device
+    )
+
+
+def _save_cache(cache_dir, cache_path, **arrays):
+    os.makedirs(cache_dir, exist_ok=True)
+    # write to a temporary file first, so that readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class PropagationSampler:
+    """Sample the multi-hop neighborhood of nodes from the normalized adjacency matrix.
+
+    Each layer of propagation only needs the rows of the target nodes, so
+    training on a batch requires the ``n_layers``-hop neighborhood of the batch
+    instead of the whole graph.
+
+    Parameters
+    ----------
+    laplacian_matrix : torch.Tensor
+        Sparse COO tensor returned by :func:`load_laplacian_matrix`, whose rows are sorted.
+    n_layers : int
+        Number of propagation layers.
+    num_neighbors : int or None, default: None
+        Max number of neighbors sampled for every node in each layer. Nodes with more
+        neighbors are sampled with replacement and the weights are scaled accordingly,
+        which keeps the propagation unbiased. None means using all the neighbors.
+    device : torch.device
+        Device of the sampled blocks.
+    seed : int, default: 42
+        Random seed.
+    """
+
+    def __init__(self, laplacian_matrix, n_layers, num_neighbors, device, seed=42):
+        n_nodes = laplacian_matrix.shape[0]
+        indices = laplacian_matrix._indices().cpu().numpy()
+        self.indices = indices[1]
+        self.data = laplacian_matrix._values().cpu().numpy()
+        self.indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices[0], minlength=n_nodes), out=self.indptr[1:])
+        self.n_layers = n_layers
+        self.num_neighbors = num_neighbors
+        self.device = device
+        self.np_rng = np.random.default_rng(seed)
+
+    def __call__(self, nodes):
+        """Sample propagation blocks for the target nodes.
+
+        Parameters
+        ----------
+        nodes : numpy.ndarray
+            Unique target nodes.
+
+        Returns
+        -------
+        input_nodes : numpy.ndarray
+            Nodes whose embeddings are fed into the first layer.
+        blocks : list of torch.Tensor
+            Sparse matrix of shape ``(n_dst_nodes, n_src_nodes)`` in each layer, ordered
+            from the first layer to the last one. The destination nodes of a block
+            are the first ``n_dst_nodes`` source nodes, so ``nodes`` are always the
+            first ``len(nodes)`` nodes in every layer.
+        """
+        blocks = []
+        dst_nodes = np.asarray(nodes, dtype=np.int64)
+        for _ in range(self.n_layers):
+            src_nodes, block = self._sample_block(dst_nodes)
+            blocks.append(block)
+            dst_nodes = src_nodes
+        return dst_nodes, blocks[::-1]
+
+    def _sample_block(self, dst_nodes):
+        starts = self.indptr[dst_nodes]
+        degrees = self.indptr[dst_nodes + 1] - starts
+        counts = degrees
+        if self.num_neighbors is not None:
+            counts = np.minimum(degrees, self.num_neighbors)
+        row = np.repeat(np.arange(len(dst_nodes)), counts)
+        offsets = np.arange(len(row)) - np.repeat(np.cumsum(counts) - counts, counts)
+        scales = np.ones(len(row), dtype=np.float32)
+        if self.num_neighbors is not None:
+            sampled = np.repeat(degrees > self.num_neighbors, counts)
+            sampled_degrees = np.repeat(degrees, counts)[sampled]
+            random_offsets = self.np_rng.random(len(sampled_degrees)) * sampled_degrees
+            offsets[sampled] = random_offsets.astype(np.int64)
+            scales[sampled] = sampled_degrees / self.num_neighbors
+        edges = np.repeat(starts, counts) + offsets
+        neighbors = self.indices[edges]
+        values = self.data[edges] * scales
+
+        new_nodes = np.setdiff1d(neighbors, dst_nodes)
+        src_nodes = np.concatenate([dst_nodes, new_nodes])
+        sorter = np.argsort(src_nodes, kind="stable")
+        col = sorter[np.searchsorted(src_nodes, neighbors, sorter=sorter)]
+        block = torch.sparse_coo_tensor(
+            torch.from_numpy(np.vstack([row, col])),
+            torch.from_numpy(values.astype(np.float32, copy=False)),
+            (len(dst_nodes), len(src_nodes)),
+            device=self.device,
+        )
+        return src_nodes, block
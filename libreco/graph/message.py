@@ -4,6 +4,7 @@ from typing import Iterable, List, Optional
 import numpy as np
 import torch
 
+from ..batch.batch_unit import tensor_from_numpy
 from ..batch.enums import Backend
 
 
@@ -11,7 +12,9 @@ def to_cpu_tensor(data, dtype=None):
     if data is None:
         return
     elif isinstance(data, np.ndarray):
-        return torch.from_numpy(data)
+        return tensor_from_numpy(data)
+    elif isinstance(data, torch.Tensor):
+        return data.to(dtype=dtype) if dtype is not None else data
     else:
         assert dtype is not None
         return torch.tensor(data, dtype=dtype)
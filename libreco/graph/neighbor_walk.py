@@ -1,7 +1,12 @@
+import numpy as np
 import torch
 
 from .message import ItemMessage, ItemMessageDGL, UserMessage
-from ..sampling import bipartite_neighbors, bipartite_neighbors_with_weights
+from ..sampling import (
+    bipartite_neighbors,
+    bipartite_neighbors_with_weights,
+    build_bipartite_graph,
+)
 
 
 class NeighborWalker:
@@ -10,8 +15,9 @@ class NeighborWalker:
         self.num_layers = model.num_layers
         self.num_neighbors = model.num_neighbors
         self.remove_edges = model.remove_edges
-        self.user_consumed = data_info.user_consumed
-        self.item_consumed = data_info.item_consumed
+        self.seed = model.seed
+        self.np_rng = None
+        self.bipartite_graph = self._build_bipartite_graph(data_info)
         self.user_sparse_unique = data_info.user_sparse_unique
         self.user_dense_unique = data_info.user_dense_unique
         self.item_sparse_unique = data_info.item_sparse_unique
@@ -33,13 +39,28 @@ class NeighborWalker:
             nodes, sparse, dense, nbs, nbs_sparse, nbs_dense, offsets, weights
         )
 
+    def _build_bipartite_graph(self, data_info):
+        # build in the main process, so that all the DataLoader workers share the arrays
+        return build_bipartite_graph(
+            data_info.user_consumed,
+            data_info.item_consumed,
+            data_info.n_users,
+            data_info.n_items,
+        )
+
+    def _get_rng(self):
+        # the collator sets the generator seeded for each worker
+        if self.np_rng is None:
+            self.np_rng = np.random.default_rng(self.seed)
+        return self.np_rng
+
     def sample_graphsage(self, items):
         neighbors, neighbors_sparse, neighbors_dense, offsets = [], [], [], []
         nodes = items
         weights = None
         for _ in range(self.num_layers):
             nbs, offs = bipartite_neighbors(
-                nodes, self.user_consumed, self.item_consumed, self.num_neighbors
+                self._get_rng(), self.bipartite_graph, nodes, self.num_neighbors
             )
             nbs, sparse, dense = self.get_item_feats(nbs)
             neighbors.append(nbs)
@@ -54,14 +75,14 @@ class NeighborWalker:
         offsets, weights = [], []
         nodes = items
         if self.paradigm == "i2i" and self.remove_edges and items_pos is not None:
-            item_indices = list(range(len(items)))
+            item_indices = np.arange(len(items))
         else:
             item_indices = None
         for _ in range(self.num_layers):
             nbs, ws, offs, item_indices_in_samples = bipartite_neighbors_with_weights(
+                self._get_rng(),
+                self.bipartite_graph,
                 nodes,
-                self.user_consumed,
-                self.item_consumed,
                 self.num_neighbors,
                 self.num_walks,
                 self.walk_length,
@@ -81,6 +102,9 @@ class NeighborWalker:
         return neighbors, neighbors_sparse, neighbors_dense, offsets, weights
 
     def get_item_feats(self, items):
+        # Return the original tensor ids. A numpy view of a tensor becomes dangling
+        # once DataLoader workers move the tensor storage into shared memory.
+        nodes = items
         if isinstance(items, torch.Tensor):
             items = items.detach().cpu().numpy()
         sparse, dense = None, None
@@ -88,9 +112,10 @@ class NeighborWalker:
             sparse = self.item_sparse_unique[items]
         if self.item_dense_unique is not None:
             dense = self.item_dense_unique[items]
-        return items, sparse, dense
+        return nodes, sparse, dense
 
     def get_user_feats(self, users):
+        nodes = users
         if isinstance(users, torch.Tensor):
             users = users.detach().cpu().numpy()
         sparse, dense = None, None
@@ -98,7 +123,7 @@ class NeighborWalker:
             sparse = self.user_sparse_unique[users]
         if self.user_dense_unique is not None:
             dense = self.user_dense_unique[users]
-        return UserMessage(users, sparse, dense)
+        return UserMessage(nodes, sparse, dense)
 
 
 class NeighborWalkerDGL(NeighborWalker):
@@ -106,6 +131,10 @@ class NeighborWalkerDGL(NeighborWalker):
         super().__init__(model, data_info)
         self.graph = model.hetero_g if self.use_pinsage else model.homo_g
 
+    def _build_bipartite_graph(self, data_info):
+        # neighbors are sampled from the DGL graph
+        return None
+
     def __call__(self, items, target_nodes=None):
         import dgl
 
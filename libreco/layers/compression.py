@@ -0,0 +1,260 @@
+"""Compressed embedding tables for high-cardinality ids and sparse features.
+
+A compressed table is made up of blocks, and each block stores the embeddings of an
+id or sparse field whose indices range in ``[start, start + size)``. A block is either
+
+- ``'none'``: one row for every index, the same as a normal embedding table.
+- ``'hash'``: ``num_buckets`` rows, an index is mapped to ``num_hashes`` rows by
+  different hash functions and the rows are summed.
+- ``'qr'``: quotient-remainder trick, ``num_buckets`` remainder rows followed by
+  ``ceil(size / num_buckets)`` quotient rows, and the two rows of an index are
+  multiplied element-wise.
+
+Since the quotient rows are placed last, a `qr` block can grow with new indices
+while keeping the old rows in place, which is needed when retraining with new data.
+"""
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from ..tfops import tf
+
+HASH_PRIME = 2**31 - 1
+MAX_HASHES = 8
+# fixed parameters of the universal hash functions `((a * x + b) mod p) mod m`,
+# so that the same index is always mapped to the same rows after loading
+HASH_PARAMS = np.random.default_rng(20231212).integers(
+    1, HASH_PRIME, size=(2, MAX_HASHES), dtype=np.int64
+)
+
+METHODS = ("none", "hash", "qr")
+
+
+@dataclass
+class CompressedTable:
+    """Row layout of a compressed embedding table.
+
+    Attributes
+    ----------
+    starts : numpy.ndarray
+        First index of each block, in ascending order.
+    sizes : numpy.ndarray
+        Number of indices of each block.
+    methods : list of str
+        Compression method of each block, one of ``'none'``, ``'hash'``, ``'qr'``.
+    num_buckets : numpy.ndarray
+        Number of hash buckets in `hash` block, or remainder rows in `qr` block.
+    num_hashes : numpy.ndarray
+        Number of hash functions in `hash` block.
+    row_offsets : numpy.ndarray
+        First row of each block in the table.
+    n_rows : int
+        Number of rows of the table.
+    """
+
+    starts: np.ndarray
+    sizes: np.ndarray
+    methods: List[str]
+    num_buckets: np.ndarray
+    num_hashes: np.ndarray
+    row_offsets: np.ndarray
+    n_rows: int
+
+    @property
+    def num_components(self):
+        """Maximum number of rows that an index is mapped to."""
+        components = [
+            n if m == "hash" else 2 if m == "qr" else 1
+            for m, n in zip(self.methods, self.num_hashes)
+        ]
+        return max(components)
+
+
+def block_rows(size, method, num_buckets):
+    if method == "hash":
+        return num_buckets
+    elif method == "qr":
+        return num_buckets + -(-size // num_buckets)
+    return size
+
+
+def build_compressed_table(sizes, specs):
+    """Build the layout of consecutive blocks from their sizes and compression specs.
+
+    ``specs`` contains a dict or None for each block, None means no compression.
+    """
+    methods, num_buckets, num_hashes, rows = [], [], [], []
+    for size, spec in zip(sizes, specs):
+        spec = spec or {"method": "none"}
+        method = spec["method"]
+        buckets = spec.get("num_buckets", 1)
+        methods.append(method)
+        num_buckets.append(buckets)
+        num_hashes.append(spec.get("num_hashes", 2) if method == "hash" else 1)
+        rows.append(block_rows(size, method, buckets))
+
+    sizes = np.asarray(sizes, dtype=np.int64)
+    row_offsets = np.cumsum([0, *rows], dtype=np.int64)
+    return CompressedTable(
+        starts=np.cumsum([0, *sizes[:-1]], dtype=np.int64),
+        sizes=sizes,
+        methods=methods,
+        num_buckets=np.array(num_buckets, dtype=np.int64),
+        num_hashes=np.array(num_hashes, dtype=np.int64),
+        row_offsets=row_offsets[:-1],
+        n_rows=int(row_offsets[-1]),
+    )
+
+
+def check_compression_spec(name, spec):
+    if not isinstance(spec, dict) or spec.get("method") not in ("hash", "qr"):
+        raise ValueError(
+            f"compression of `{name}` must be a dict with `method` "
+            f"in ('hash', 'qr'), got {spec}"
+        )
+    num_buckets = spec.get("num_buckets")
+    if not isinstance(num_buckets, int) or num_buckets <= 0:
+        raise ValueError(
+            f"`num_buckets` of `{name}` must be positive int, got {num_buckets}"
+        )
+    if spec["method"] == "hash":
+        num_hashes = spec.get("num_hashes", 2)
+        if not isinstance(num_hashes, int) or not 1 <= num_hashes <= MAX_HASHES:
+            raise ValueError(
+                f"`num_hashes` of `{name}` must be int in [1, {MAX_HASHES}], "
+                f"got {num_hashes}"
+            )
+
+
+def get_compressed_tables(data_info, embed_compression, use_old_info=False):
+    """Build the compressed tables of user, item and sparse features.
+
+    Parameters
+    ----------
+    data_info : :class:`~libreco.data.DataInfo` object
+        Object that contains useful information for training and inference.
+    embed_compression : dict or None
+        Compression specs keyed by ``'user'``, ``'item'`` or sparse column names.
+    use_old_info : bool, default: False
+        Whether to build the tables of the data before merging new data,
+        which is used in retraining.
+
+    Returns
+    -------
+    dict of {str : CompressedTable or None}
+        Tables of ``'user'``, ``'item'`` and ``'sparse'``, None means no compression.
+    """
+    tables = {"user": None, "item": None, "sparse": None}
+    if not embed_compression:
+        return tables
+    if not isinstance(embed_compression, dict):
+        raise ValueError(
+            f"`embed_compression` must be dict or None, got {embed_compression}"
+        )
+    sparse_cols = data_info.sparse_col.name
+    for name, spec in embed_compression.items():
+        if name not in ("user", "item") and name not in sparse_cols:
+            raise ValueError(f"unknown column `{name}` in `embed_compression`")
+        check_compression_spec(name, spec)
+
+    if use_old_info:
+        old_info = data_info.old_info
+        n_users, n_items = old_info.n_users, old_info.n_items
+    else:
+        n_users, n_items = data_info.n_users, data_info.n_items
+    # plus one for oov
+    for name, n in (("user", n_users + 1), ("item", n_items + 1)):
+        if name in embed_compression:
+            tables[name] = build_compressed_table([n], [embed_compression[name]])
+
+    if any(name in sparse_cols for name in embed_compression):
+        # columns of a multi_sparse field share the same offset and block
+        block_specs = dict()
+        for col, offset in zip(sparse_cols, data_info.sparse_offset):
+            if block_specs.get(offset) is None:
+                block_specs[offset] = embed_compression.get(col)
+        offsets = sorted(block_specs)
+        if use_old_info:
+            sizes = [size + 1 for size in old_info.sparse_len if size != -1]
+        else:
+            sizes = np.diff([*offsets, np.max(data_info.sparse_oov) + 1]).tolist()
+        specs = [block_specs[offset] for offset in offsets]
+        tables["sparse"] = build_compressed_table(sizes, specs)
+    return tables
+
+
+def compressed_row_mapping(old_table, new_table):
+    """Rows in the old table and the corresponding rows in the new table.
+
+    The new table is built from the same specs after new indices are appended to
+    the blocks, so all the old rows can be copied in retraining.
+    """
+    if old_table.methods != new_table.methods or not np.array_equal(
+        old_table.num_buckets, new_table.num_buckets
+    ):
+        raise ValueError("compression of the old and new model doesn't match")
+
+    old_rows, new_rows = [], []
+    for i, method in enumerate(old_table.methods):
+        if method == "none":
+            # remove oov
+            n_rows = old_table.sizes[i] - 1
+        else:
+            n_rows = block_rows(old_table.sizes[i], method, old_table.num_buckets[i])
+        old_rows.append(old_table.row_offsets[i] + np.arange(n_rows))
+        new_rows.append(new_table.row_offsets[i] + np.arange(n_rows))
+    return np.concatenate(old_rows), np.concatenate(new_rows)
+
+
+def compressed_embedding_lookup(embed_var, indices, table):
+    """Look up embeddings of the indices from a compressed table.
+
+    ``embed_var`` can be 1-D or 2-D, and the output shape is the same as
+    ``tf.nn.embedding_lookup(embed_var, indices)`` on the uncompressed table.
+    """
+    indices = tf.cast(indices, tf.int64)
+    starts = tf.constant(table.starts, dtype=tf.int64)
+    if len(table.starts) == 1:
+        block = tf.zeros_like(indices)
+    else:
+        block = tf.reduce_sum(
+            tf.cast(indices[..., tf.newaxis] >= starts[1:], tf.int64), axis=-1
+        )
+
+    def block_param(values):
+        return tf.gather(tf.constant(values, dtype=tf.int64), block)
+
+    local = indices - block_param(table.starts)
+    row_offset = block_param(table.row_offsets)
+    buckets = block_param(table.num_buckets)
+    num_hashes = block_param(table.num_hashes)
+    method = block_param([METHODS.index(m) for m in table.methods])
+    is_hash, is_qr = tf.equal(method, 1), tf.equal(method, 2)
+
+    embed_sum, embed_prod = 0.0, 1.0
+    for k in range(table.num_components):
+        a, b = HASH_PARAMS[:, k]
+        hash_rows = (a * local + b) % HASH_PRIME % buckets
+        qr_rows = local % buckets if k == 0 else buckets + local // buckets
+        rows = tf.where(is_hash, hash_rows, tf.where(is_qr, qr_rows, local))
+        # rows of unused components are masked
+        qr_valid = tf.fill(tf.shape(indices), k < 2)
+        none_valid = tf.fill(tf.shape(indices), k == 0)
+        valid = tf.where(is_hash, num_hashes > k, tf.where(is_qr, qr_valid, none_valid))
+        rows = tf.where(valid, row_offset + rows, row_offset)
+        embeds = tf.nn.embedding_lookup(embed_var, rows)
+        mask = _expand_as(tf.cast(valid, tf.float32), embeds)
+        embed_sum += mask * embeds
+        embed_prod *= mask * embeds + (1.0 - mask)
+
+    if "qr" not in table.methods:
+        return embed_sum
+    qr_mask = _expand_as(tf.cast(is_qr, tf.float32), embed_sum)
+    return qr_mask * embed_prod + (1.0 - qr_mask) * embed_sum
+
+
+def _expand_as(mask, embeds):
+    if embeds.get_shape().ndims > mask.get_shape().ndims:
+        return mask[..., tf.newaxis]
+    return mask
@@ -1,3 +1,4 @@
+from .compression import compressed_embedding_lookup
 from ..tfops import tf
 
 
@@ -10,8 +11,11 @@ def embedding_lookup(
     reuse_layer=None,
     embed_var=None,
     scope_name="embedding",
+    compression=None,
 ):
     reuse = tf.AUTO_REUSE if reuse_layer else None
+    if compression is not None and var_shape is not None:
+        var_shape = (compression.n_rows, *var_shape[1:])
     with tf.variable_scope(scope_name, reuse=reuse):
         if embed_var is None:
             embed_var = tf.get_variable(
@@ -21,6 +25,8 @@ def embedding_lookup(
                 regularizer=regularizer,
                 dtype=tf.float32
             )
+        if compression is not None:
+            return compressed_embedding_lookup(embed_var, indices, compression)
         return tf.nn.embedding_lookup(embed_var, indices)
 
 
@@ -62,8 +68,11 @@ def seq_embeds_pooling(
     regularizer=None,
     reuse_layer=None,
     scope_name="seq_embeds_pooling",
+    compression=None,
 ):
     reuse = tf.AUTO_REUSE if reuse_layer else None
+    if compression is not None:
+        var_shape = (compression.n_rows, *var_shape[1:])
     with tf.variable_scope(scope_name, reuse=reuse):
         embed_var = tf.get_variable(
             name=var_name,
@@ -72,13 +81,20 @@ def seq_embeds_pooling(
             regularizer=regularizer,
         )
         # unknown items are padded to 0-vector
-        embed_size = var_shape[1]
-        zero_padding_op = tf.scatter_update(
-            embed_var, n_items, tf.zeros([embed_size], dtype=tf.float32)
-        )
-        with tf.control_dependencies([zero_padding_op]):
-            # B * seq * K
-            multi_item_embed = tf.nn.embedding_lookup(embed_var, seq_indices)
+        if compression is not None:
+            # oov row may be shared in compressed table, so mask the embeddings instead
+            padding_mask = tf.cast(tf.not_equal(seq_indices, n_items), tf.float32)
+            multi_item_embed = padding_mask[:, :, tf.newaxis] * (
+                compressed_embedding_lookup(embed_var, seq_indices, compression)
+            )
+        else:
+            embed_size = var_shape[1]
+            zero_padding_op = tf.scatter_update(
+                embed_var, n_items, tf.zeros([embed_size], dtype=tf.float32)
+            )
+            with tf.control_dependencies([zero_padding_op]):
+                # B * seq * K
+                multi_item_embed = tf.nn.embedding_lookup(embed_var, seq_indices)
 
         return tf.div_no_nan(
             tf.reduce_sum(multi_item_embed, axis=1),
@@ -1,24 +1,40 @@
+from .alias import AliasSampler
 from .negatives import (
+    build_consumed_csr,
+    item_frequency,
     neg_probs_from_frequency,
     negatives_from_out_batch,
     negatives_from_popular,
     negatives_from_random,
     negatives_from_unconsumed,
+    negatives_from_unconsumed_csr,
     pos_probs_from_frequency,
 )
 from .random_walks import (
+    BipartiteGraph,
     bipartite_neighbors,
     bipartite_neighbors_with_weights,
+    build_bipartite_graph,
+    build_transition_csr,
+    item_random_walks,
     pairs_from_random_walk,
 )
 
 __all__ = [
+    "AliasSampler",
+    "BipartiteGraph",
     "bipartite_neighbors",
     "bipartite_neighbors_with_weights",
+    "build_bipartite_graph",
+    "build_consumed_csr",
+    "build_transition_csr",
+    "item_frequency",
+    "item_random_walks",
     "negatives_from_out_batch",
     "negatives_from_popular",
     "negatives_from_random",
     "negatives_from_unconsumed",
+    "negatives_from_unconsumed_csr",
     "neg_probs_from_frequency",
     "pairs_from_random_walk",
     "pos_probs_from_frequency",
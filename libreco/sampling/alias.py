@@ -0,0 +1,61 @@
+import numpy as np
+
+
+class AliasSampler:
+    """Sampling from a discrete distribution in O(1) time per draw.
+
+    The alias table is built with Vose's method, but the pairing of small and large
+    columns is computed with cumulative sums instead of a python loop.
+    A column is first chosen uniformly, then either itself or its alias is returned.
+
+    Parameters
+    ----------
+    weights : array_like
+        Non-negative weights of all the elements, which don't need to be normalized.
+    """
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        assert weights.ndim == 1 and len(weights) > 0, "weights must be a 1-d array"
+        assert np.all(weights >= 0) and weights.sum() > 0, "invalid weights"
+        self.n = len(weights)
+        self.prob, self.alias = _build_alias_table(weights / weights.sum() * self.n)
+
+    def sample(self, np_rng, size):
+        columns = np_rng.integers(0, self.n, size=size)
+        accept = np_rng.random(size=size) < self.prob[columns]
+        return np.where(accept, columns, self.alias[columns])
+
+
+def _build_alias_table(scaled_probs):
+    n = len(scaled_probs)
+    prob = np.ones(n, dtype=np.float64)
+    alias = np.arange(n)
+    small = np.flatnonzero(scaled_probs < 1.0)
+    large = np.flatnonzero(scaled_probs >= 1.0)
+    # all the columns are (nearly) full if there is no large column
+    if len(small) == 0 or len(large) == 0:
+        return prob, alias
+
+    # Lay the deficits of small columns and the excesses of large columns on the same
+    # line. A small column takes its deficit from the large one containing its start.
+    # A large column becomes small once its excess is used up, and immediately takes
+    # the overshoot from the next large column.
+    deficit_ends = np.cumsum(1.0 - scaled_probs[small])
+    deficit_starts = deficit_ends - (1.0 - scaled_probs[small])
+    excess_ends = np.cumsum(scaled_probs[large] - 1.0)
+    last_large = len(large) - 1
+
+    owners = np.searchsorted(excess_ends, deficit_starts, side="right")
+    prob[small] = scaled_probs[small]
+    alias[small] = large[np.minimum(owners, last_large)]
+
+    straddle = np.searchsorted(deficit_ends, excess_ends, side="right")
+    straddle = np.minimum(straddle, len(small) - 1)
+    overshoots = deficit_ends[straddle] - excess_ends
+    exhausted = (deficit_starts[straddle] < excess_ends) & (overshoots > 0)
+    exhausted[last_large] = False  # floating point errors on the last column
+    exhausted_large = np.flatnonzero(exhausted)
+    prob[large[exhausted_large]] = np.clip(1.0 - overshoots[exhausted_large], 0.0, 1.0)
+    alias[large[exhausted_large]] = large[exhausted_large + 1]
+    return prob, alias
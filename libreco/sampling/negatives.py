@@ -1,8 +1,12 @@
+import functools
+import itertools
 import math
 import random
 
 import numpy as np
 
+from ..utils.sparse import build_sorted_csr, csr_contains
+
 
 def _check_invalid_negatives(negatives, items_pos, items=None):
     if items is not None and len(items) > 0:
@@ -31,15 +35,24 @@ def negatives_from_random(
     return negatives
 
 
-def negatives_from_popular(np_rng, n_items, items_pos, num_neg, items=None, probs=None):
+def negatives_from_popular(
+    np_rng, n_items, items_pos, num_neg, items=None, probs=None, alias_sampler=None
+):
+    """Sample negatives based on popularity.
+
+    If an :class:`AliasSampler` is provided, each draw costs O(1) instead of the O(n_items)
+    cumulative sum in ``np_rng.choice(p=probs)``.
+    """
     items_pos = np.repeat(items_pos, num_neg) if num_neg > 1 else items_pos
     items = np.repeat(items, num_neg) if num_neg > 1 and items is not None else items
-    negatives = np_rng.choice(n_items, size=len(items_pos), replace=True, p=probs)
+    if alias_sampler is not None:
+        draw = functools.partial(alias_sampler.sample, np_rng)
+    else:
+        draw = functools.partial(np_rng.choice, n_items, replace=True, p=probs)
+    negatives = draw(size=len(items_pos))
     invalid_indices = _check_invalid_negatives(negatives, items_pos, items)
     if invalid_indices:
-        negatives[invalid_indices] = np_rng.choice(
-            n_items, size=len(invalid_indices), replace=True, p=probs
-        )
+        negatives[invalid_indices] = draw(size=len(invalid_indices))
     return negatives
 
 
@@ -82,21 +95,137 @@ def negatives_from_unconsumed(
     return np.array(negatives)
 
 
+def build_consumed_csr(user_consumed, n_users, n_items):
+    """Convert ``user_consumed`` into sorted CSR rows for membership checking.
+
+    Unlike a list of python sets, the two flat arrays are cheap to pickle and can be
+    shared read-only by all the DataLoader workers.
+    """
+    consumed_lens = np.fromiter(
+        (len(user_consumed[u]) for u in range(n_users)), dtype=np.int64, count=n_users
+    )
+    consumed_items = np.fromiter(
+        itertools.chain.from_iterable(user_consumed[u] for u in range(n_users)),
+        dtype=np.int64,
+        count=int(consumed_lens.sum()),
+    )
+    consumed_users = np.repeat(np.arange(n_users), consumed_lens)
+    return build_sorted_csr(consumed_users, consumed_items, n_users, n_items)
+
+
+def negatives_from_unconsumed_csr(
+    np_rng,
+    consumed_indptr,
+    consumed_indices,
+    users,
+    items,
+    n_items,
+    num_neg,
+    tolerance=10,
+    alias_sampler=None,
+):
+    """Vectorized version of `negatives_from_unconsumed`.
+
+    Candidates for all the positive samples are drawn at once, and membership is checked
+    in bulk against the sorted CSR consumed rows. Only the rejected cells are resampled.
+    Same as the loop version, if a cell still fails after `tolerance` rounds,
+    the consumed constraint will be dropped. If `alias_sampler` is provided,
+    candidates are drawn from its distribution instead of the uniform one.
+    """
+    users = np.asarray(users)
+    items = np.asarray(items)
+    if alias_sampler is not None:
+        draw = functools.partial(alias_sampler.sample, np_rng)
+    else:
+        draw = functools.partial(np_rng.integers, 0, n_items)
+    negatives = draw(size=(len(users), num_neg))
+    flat_negatives = negatives.reshape(-1)
+    pending = None  # all the cells are checked in the first round
+    pending_mask = None
+    for check_consumed in [True] * tolerance + [False] * tolerance:
+        invalid = _invalid_negatives(
+            negatives,
+            pending,
+            pending_mask,
+            users,
+            items,
+            consumed_indptr,
+            consumed_indices,
+            check_consumed,
+        )
+        if pending is None:
+            pending_mask = invalid
+            pending = np.flatnonzero(invalid)
+        else:
+            pending_mask.reshape(-1)[pending[~invalid]] = False
+            pending = pending[invalid]
+        if len(pending) == 0:
+            break
+        flat_negatives[pending] = draw(size=len(pending))
+    return flat_negatives
+
+
+def _invalid_negatives(
+    negatives,
+    pending,
+    pending_mask,
+    users,
+    items,
+    consumed_indptr,
+    consumed_indices,
+    check_consumed,
+):
+    num_neg = negatives.shape[1]
+    if pending is None:
+        sampled = negatives
+        rows = np.broadcast_to(users[:, None], negatives.shape)
+        invalid = negatives == items[:, None]
+        # each negative should be unique among the negatives of the same sample
+        for j in range(1, num_neg):
+            invalid[:, j] |= np.any(negatives[:, :j] == negatives[:, j : j + 1], axis=1)
+    else:
+        sample_indices, cols = np.divmod(pending, num_neg)
+        sampled = negatives.reshape(-1)[pending]
+        rows = users[sample_indices]
+        invalid = sampled == items[sample_indices]
+        # compare with the earlier negatives and the later accepted negatives,
+        # the later pending ones will be compared with this one when they are checked.
+        col_range = np.arange(num_neg)
+        compared = col_range < cols[:, None]
+        compared |= (col_range > cols[:, None]) & ~pending_mask[sample_indices]
+        duplicates = negatives[sample_indices] == sampled[:, None]
+        invalid |= np.any(duplicates & compared, axis=1)
+    if check_consumed:
+        invalid |= csr_contains(consumed_indptr, consumed_indices, rows, sampled)
+    return invalid
+
+
+def item_frequency(item_consumed, n_items):
+    """Number of unique users that have consumed each item, counted with `np.bincount`."""
+    item_lens = np.fromiter(
+        (len(item_consumed[i]) for i in range(n_items)), dtype=np.int64, count=n_items
+    )
+    users = np.fromiter(
+        itertools.chain.from_iterable(item_consumed[i] for i in range(n_items)),
+        dtype=np.int64,
+        count=int(item_lens.sum()),
+    )
+    if len(users) == 0:
+        return np.zeros(n_items, dtype=np.int64)
+    items = np.repeat(np.arange(n_items), item_lens)
+    # deduplicate (item, user) pairs before counting
+    n_users = int(users.max()) + 1
+    pairs = np.unique(items * n_users + users)
+    return np.bincount(pairs // n_users, minlength=n_items)
+
+
 def neg_probs_from_frequency(item_consumed, n_items, temperature):
-    freqs = []
-    for i in range(n_items):
-        freq = len(set(item_consumed[i]))
-        if temperature != 1.0:
-            freq = pow(freq, temperature)
-        freqs.append(freq)
-    freqs = np.array(freqs)
+    freqs = item_frequency(item_consumed, n_items).astype(np.float64)
+    if temperature != 1.0:
+        freqs = np.power(freqs, temperature)
     return freqs / np.sum(freqs)
 
 
 def pos_probs_from_frequency(item_consumed, n_users, n_items, alpha):
-    probs = []
-    for i in range(n_items):
-        prob = len(set(item_consumed[i])) / n_users
-        prob = (math.sqrt(prob / alpha) + 1) * (alpha / prob)
-        probs.append(prob)
-    return probs
+    probs = item_frequency(item_consumed, n_items) / n_users
+    return (np.sqrt(probs / alpha) + 1) * (alpha / probs)
@@ -1,80 +1,234 @@
 import itertools
-import operator
-import random
-from collections import Counter
+from dataclasses import dataclass
 
 import numpy as np
 
 
-def has_no_neighbor(user_consumed, item_consumed, item):
-    for u in item_consumed[item]:
-        if len(user_consumed[u]) > 1:
-            return False
-    return True
+# noinspection PyUnresolvedReferences
+@dataclass
+class BipartiteGraph:
+    """User-item bipartite graph in CSR format, used for vectorized random walks.
 
+    Duplicate interactions are kept, so neighbors are sampled with the same
+    probabilities as choosing from the lists in ``user_consumed`` and ``item_consumed``.
 
-def bipartite_one_walk(user_consumed, item_consumed, item):
-    user = random.choice(item_consumed[item])
-    return random.choice(user_consumed[user])
+    Attributes
+    ----------
+    user_indptr : numpy.ndarray
+        Row pointers of users in ``user_items``.
+    user_items : numpy.ndarray
+        Consumed items of all users.
+    item_indptr : numpy.ndarray
+        Row pointers of items in ``item_users``.
+    item_users : numpy.ndarray
+        Users who consumed each item.
+    has_neighbor : numpy.ndarray
+        Whether each item can reach another item through one of its users.
+    """
+
+    user_indptr: np.ndarray
+    user_items: np.ndarray
+    item_indptr: np.ndarray
+    item_users: np.ndarray
+    has_neighbor: np.ndarray
+
+    @property
+    def n_items(self):
+        return len(self.item_indptr) - 1
+
+    def walk(self, np_rng, items):
+        """Advance one step item -> user -> item for all the items simultaneously.
+
+        Items without any user stay where they are.
+        """
+        items = np.asarray(items)
+        users = _sample_adjacent(np_rng, self.item_indptr, self.item_users, items)
+        next_items = _sample_adjacent(np_rng, self.user_indptr, self.user_items, users)
+        isolated = self.item_indptr[items + 1] == self.item_indptr[items]
+        return np.where(isolated, items, next_items)
+
+
+def _sample_adjacent(np_rng, indptr, indices, nodes):
+    starts = indptr[nodes]
+    degrees = indptr[nodes + 1] - starts
+    offsets = (np_rng.random(nodes.shape) * degrees).astype(np.int64)
+    # nodes without any neighbor get an arbitrary value, which should be masked
+    return indices[np.minimum(starts + offsets, len(indices) - 1)]
+
+
+def _consumed_csr(consumed, n_rows):
+    rows = np.array(sorted(consumed), dtype=np.int64)
+    lens = np.zeros(n_rows, dtype=np.int64)
+    lens[rows] = [len(consumed[r]) for r in rows.tolist()]
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(lens, out=indptr[1:])
+    indices = np.fromiter(
+        itertools.chain.from_iterable(consumed[r] for r in rows.tolist()),
+        dtype=np.int32,
+        count=indptr[-1],
+    )
+    return indptr, indices
+
+
+def build_bipartite_graph(user_consumed, item_consumed, n_users, n_items):
+    """Build the CSR bipartite graph from consumed dicts.
+
+    Parameters
+    ----------
+    user_consumed : dict
+        Consumed items of each user.
+    item_consumed : dict
+        Users who consumed each item.
+    n_users : int
+        Number of users.
+    n_items : int
+        Number of items.
+
+    Returns
+    -------
+    BipartiteGraph
+    """
+    user_indptr, user_items = _consumed_csr(user_consumed, n_users)
+    item_indptr, item_users = _consumed_csr(item_consumed, n_items)
+    # an item has neighbors if one of its users consumed more than one item
+    edge_items = np.repeat(np.arange(n_items), np.diff(item_indptr))
+    user_lens = np.diff(user_indptr)
+    has_neighbor = np.zeros(n_items, dtype=bool)
+    has_neighbor[edge_items[user_lens[item_users] > 1]] = True
+    return BipartiteGraph(
+        user_indptr, user_items, item_indptr, item_users, has_neighbor
+    )
+
+
+def build_transition_csr(user_consumed, n_users, n_items):
+    """Build the directed item graph from consumed dicts in CSR format.
+
+    There is an edge from every item to the next item consumed by the same user.
+    Duplicate edges are kept, so the neighbors are sampled proportionally to the
+    number of transitions.
+
+    Returns
+    -------
+    indptr : numpy.ndarray
+        Row pointers of the items.
+    indices : numpy.ndarray
+        Next items of each item.
+    """
+    user_indptr, items = _consumed_csr(user_consumed, n_users)
+    # every position except the last of each user has a next item
+    has_next = np.ones(len(items), dtype=bool)
+    has_next[user_indptr[1:][np.diff(user_indptr) > 0] - 1] = False
+    src = items[has_next]
+    dst = items[1:][has_next[:-1]]
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n_items + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n_items), out=indptr[1:])
+    return indptr, dst[order]
+
+
+def item_random_walks(np_rng, indptr, indices, start_nodes, walk_length):
+    """Generate random walks on a directed item graph, all the walks advance simultaneously.
+
+    A walk stops early when it reaches an item without any next item.
+
+    Returns
+    -------
+    walks : numpy.ndarray
+        Walks of shape (len(start_nodes), walk_length), padded with -1 after the
+        stopped walks.
+    """
+    start_nodes = np.asarray(start_nodes, dtype=np.int64)
+    walks = np.full((len(start_nodes), walk_length), -1, dtype=np.int32)
+    walks[:, 0] = start_nodes
+    walk_indices = np.arange(len(start_nodes))
+    cur_nodes = start_nodes
+    for i in range(1, walk_length):
+        alive = indptr[cur_nodes + 1] > indptr[cur_nodes]
+        walk_indices, cur_nodes = walk_indices[alive], cur_nodes[alive]
+        if len(cur_nodes) == 0:
+            break
+        cur_nodes = _sample_adjacent(np_rng, indptr, indices, cur_nodes)
+        walks[walk_indices, i] = cur_nodes
+    return walks
 
 
 def pairs_from_random_walk(
-    start_nodes, user_consumed, item_consumed, num_walks, walk_length, focus_start
-):
-    items, items_pos = [], []
-    for node in start_nodes:
-        if has_no_neighbor(user_consumed, item_consumed, node):
-            print(f"no neighbor to walk for item node {node}")
-            items.append(node)
-            items_pos.append(node)
-        for _ in range(num_walks):
-            cur_node = node
-            for _ in range(walk_length):
-                next_node = bipartite_one_walk(user_consumed, item_consumed, cur_node)
-                if focus_start and next_node != node:
-                    items.append(node)
-                    items_pos.append(next_node)
-                elif not focus_start and next_node != cur_node:
-                    items.append(cur_node)
-                    items_pos.append(next_node)
-                cur_node = next_node
-    return np.array(items), np.array(items_pos)
-
-
-def bipartite_neighbors(
-    nodes, user_consumed, item_consumed, num_neighbors, tolerance=5
+    np_rng, graph, start_nodes, num_walks, walk_length, focus_start
 ):
-    batch_neighbors, neighbor_lens = [], []
-    for node in nodes:
-        neighbors = []
-        for _ in range(num_neighbors):
-            n = bipartite_one_walk(user_consumed, item_consumed, node)
-            if n == node or n in neighbors:
-                success = False
-                for _ in range(tolerance):
-                    n = bipartite_one_walk(user_consumed, item_consumed, node)
-                    if n != node and n not in neighbors:
-                        success = True
-                        break
-                if not success:
-                    for _ in range(tolerance):
-                        n = bipartite_one_walk(user_consumed, item_consumed, node)
-                        if n != node:
-                            success = True
-                            break
-                if not success:
-                    n = bipartite_one_walk(user_consumed, item_consumed, node)
-                    # print(f"possible not enough neighbors for item {node}.")
-            neighbors.append(n)
-        batch_neighbors.extend(neighbors)
-        neighbor_lens.append(len(neighbors))
-    return batch_neighbors, compute_offsets(neighbor_lens)
+    """Collect item pairs along random walks, all the walks advance simultaneously.
+
+    Each step yields a pair unless the walk stays on the same node. With
+    ``focus_start``, pairs are formed between the start node and every visited node,
+    otherwise between consecutive nodes. A start node without any neighbor
+    forms a pair with itself.
+
+    Returns
+    -------
+    items : numpy.ndarray
+    items_pos : numpy.ndarray
+    """
+    start_nodes = np.asarray(start_nodes, dtype=np.int64)
+    n_nodes = len(start_nodes)
+    starts = np.repeat(start_nodes, num_walks)
+    src = np.empty((len(starts), walk_length), dtype=np.int64)
+    dst = np.empty((len(starts), walk_length), dtype=np.int64)
+    cur_nodes = starts
+    for i in range(walk_length):
+        next_nodes = graph.walk(np_rng, cur_nodes)
+        src[:, i] = starts if focus_start else cur_nodes
+        dst[:, i] = next_nodes
+        cur_nodes = next_nodes
+
+    # the self pair of an isolated node comes before its walks
+    isolated = ~graph.has_neighbor[start_nodes]
+    src = np.column_stack([start_nodes, src.reshape(n_nodes, -1)])
+    dst = np.column_stack([start_nodes, dst.reshape(n_nodes, -1)])
+    mask = dst != src
+    mask[:, 0] = isolated
+    return src[mask], dst[mask]
+
+
+def bipartite_neighbors(np_rng, graph, nodes, num_neighbors, tolerance=5):
+    """Sample neighbors of each node through one user.
+
+    ``num_neighbors * (tolerance + 1)`` candidates are drawn for every node. Distinct
+    candidates other than the node itself are preferred in the order they are drawn,
+    followed by the repeated ones, and the node itself is used as the last resort.
+
+    Returns
+    -------
+    neighbors : numpy.ndarray
+        Neighbors of all the nodes, ``num_neighbors`` for each node.
+    offsets : numpy.ndarray
+        Start position of each node's neighbors.
+    """
+    nodes = np.asarray(nodes, dtype=np.int64)
+    n_nodes = len(nodes)
+    n_candidates = num_neighbors * (tolerance + 1)
+    candidates = graph.walk(np_rng, np.repeat(nodes, n_candidates))
+    rows = np.repeat(np.arange(n_nodes), n_candidates)
+    positions = np.tile(np.arange(n_candidates), n_nodes)
+
+    # sort-based dedupe, mark the first occurrence of each candidate in a row
+    keys = rows * graph.n_items + candidates
+    order = np.argsort(keys, kind="stable")
+    first = np.ones(len(keys), dtype=bool)
+    first[order[1:]] = keys[order[1:]] != keys[order[:-1]]
+    priority = np.where(first, 0, 1)
+    priority[candidates == nodes[rows]] = 2
+
+    # every row contains `n_candidates` elements, so rows stay aligned after sorting
+    rank_keys = (rows * 3 + priority) * n_candidates + positions
+    chosen = np.argsort(rank_keys).reshape(n_nodes, n_candidates)[:, :num_neighbors]
+    neighbors = candidates[chosen.ravel()]
+    offsets = np.arange(n_nodes, dtype=np.int64) * num_neighbors
+    return neighbors, offsets
 
 
 def bipartite_neighbors_with_weights(
+    np_rng,
+    graph,
     nodes,
-    user_consumed,
-    item_consumed,
     num_neighbors,
     num_walks,
     walk_length,
@@ -85,75 +239,95 @@ def bipartite_neighbors_with_weights(
 ):
     """Simulate PinSage-like random walk from a bipartite graph.
 
+    All the walks of all the nodes advance simultaneously, and each walk terminates
+    with ``termination_prob`` after its first step. Visit counts are the importance
+    weights, and the ``num_neighbors`` most visited nodes are kept.
+
     The process will try to remove self item node during i2i training.
     However, if the item node has no neighbor, then itself will be returned.
     If the item node only has one neighbor, then that neighbor will be returned.
     Otherwise, next walk will be sampled randomly from neighbors.
+
+    Returns
+    -------
+    neighbors : numpy.ndarray
+        Important neighbors of all the nodes.
+    weights : numpy.ndarray
+        Normalized importance weights of the neighbors.
+    offsets : numpy.ndarray
+        Start position of each node's neighbors.
+    original_item_indices : numpy.ndarray or None
+        Index in ``items`` of the node each neighbor belongs to.
     """
+    nodes = np.asarray(nodes, dtype=np.int64)
+    n_nodes = len(nodes)
+    visits = np.empty((n_nodes, num_walks, walk_length), dtype=np.int64)
+    alive = np.ones((n_nodes, num_walks, walk_length), dtype=bool)
+    cur_nodes = np.repeat(nodes, num_walks)
+    for i in range(walk_length):
+        if i > 0:
+            continue_walk = np_rng.random((n_nodes, num_walks)) >= termination_prob
+            alive[:, :, i] = alive[:, :, i - 1] & continue_walk
+        cur_nodes = graph.walk(np_rng, cur_nodes)
+        visits[:, :, i] = cur_nodes.reshape(n_nodes, num_walks)
+    # walks, then steps in each walk, same order as visiting
+    visits = visits.reshape(n_nodes, -1)
+    alive = alive.reshape(n_nodes, -1)
 
-    def compute_weights(neighbors):
-        if len(neighbors) == 1:
-            return [neighbors[0]], [1.0]
-        important_neighbors, weights = [], []
-        for n, w in Counter(neighbors).most_common(num_neighbors):
-            important_neighbors.append(n)
-            weights.append(w)
-        total_weights = sum(weights)
-        importance_weights = [i / total_weights for i in weights]
-        return important_neighbors, importance_weights
-
-    batch_neighbors, batch_weights, neighbor_lens = [], [], []
-    original_item_indices = [] if item_indices else None
-    for i, node in enumerate(nodes):
-        if has_no_neighbor(user_consumed, item_consumed, node):
-            neighbors, weights = [node], [1.0]
-        else:
-            neighbors = []
-            for _ in range(num_walks):
-                walk = []
-                for _ in range(walk_length):
-                    if not walk:
-                        # first walk
-                        walk.append(
-                            bipartite_one_walk(user_consumed, item_consumed, node)
-                        )
-                    elif random.random() >= termination_prob:
-                        walk.append(
-                            bipartite_one_walk(user_consumed, item_consumed, walk[-1])
-                        )
-                    else:
-                        break
-                assert len(walk) > 0
-                neighbors.extend(walk)
-            neighbors = remove_target_node(neighbors, node)
-            if items is not None and item_indices is not None and items_pos is not None:
-                index = item_indices[i]
-                if items[index] == node:
-                    neighbors = remove_target_node(neighbors, items_pos[index])
-            neighbors, weights = compute_weights(neighbors)
-        batch_neighbors.extend(neighbors)
-        batch_weights.extend(weights)
-        neighbor_lens.append(len(neighbors))
-        if original_item_indices is not None:
-            original_item_indices.extend([item_indices[i]] * len(neighbors))
+    # a node falls back to itself if it has no neighbor or all the visits are itself
+    mask = alive & (visits != nodes[:, None])
+    fallbacks = nodes.copy()
+    fallback_mask = ~graph.has_neighbor[nodes] | ~np.any(mask, axis=1)
+    if items is not None and item_indices is not None and items_pos is not None:
+        item_indices = np.asarray(item_indices)
+        items, items_pos = np.asarray(items), np.asarray(items_pos)
+        is_target = items[item_indices] == nodes
+        targets = np.where(is_target, items_pos[item_indices], -1)
+        pos_mask = mask & (visits != targets[:, None])
+        # keep the positive item if it is the only neighbor
+        only_pos = ~fallback_mask & ~np.any(pos_mask, axis=1)
+        fallbacks[only_pos] = targets[only_pos]
+        fallback_mask |= only_pos
+        mask = pos_mask
+    mask[fallback_mask] = False
 
+    rows, cols = np.nonzero(mask)
+    keys, first_index, counts = np.unique(
+        rows * graph.n_items + visits[rows, cols],
+        return_index=True,
+        return_counts=True,
+    )
+    fallback_rows = np.flatnonzero(fallback_mask)
+    rows = np.concatenate([keys // graph.n_items, fallback_rows])
+    neighbors = np.concatenate([keys % graph.n_items, fallbacks[fallback_rows]])
+    counts = np.concatenate([counts, np.ones(len(fallback_rows), dtype=np.int64)])
+    first_index = np.concatenate(
+        [first_index, np.zeros(len(fallback_rows), dtype=np.int64)]
+    )
+
+    # most visited first, ties are broken by the first visit, same as `most_common`
+    order = np.lexsort((first_index, -counts, rows))
+    rows, neighbors, counts = rows[order], neighbors[order], counts[order]
+    row_starts = np.searchsorted(rows, np.arange(n_nodes))
+    ranks = np.arange(len(rows)) - row_starts[rows]
+    keep = ranks < num_neighbors
+    rows, neighbors, counts = rows[keep], neighbors[keep], counts[keep]
+
+    totals = np.bincount(rows, weights=counts, minlength=n_nodes)
+    weights = (counts / totals[rows]).astype(np.float32)
+    neighbor_lens = np.bincount(rows, minlength=n_nodes)
+    original_item_indices = (
+        np.repeat(item_indices, neighbor_lens) if item_indices is not None else None
+    )
     return (
-        batch_neighbors,
-        batch_weights,
+        neighbors,
+        weights,
         compute_offsets(neighbor_lens),
         original_item_indices,
     )
 
 
-def remove_target_node(neighbors, node):
-    num = neighbors.count(node)
-    if num == 0:
-        return neighbors
-    elif num == len(neighbors):
-        return [node]
-    return [i for i in neighbors if i != node]
-
-
 def compute_offsets(neighbor_lens):
-    cumsum = list(itertools.accumulate(neighbor_lens, operator.add))
-    return [0] + cumsum[:-1]
+    offsets = np.zeros(len(neighbor_lens), dtype=np.int64)
+    np.cumsum(neighbor_lens[:-1], out=offsets[1:])
+    return offsets
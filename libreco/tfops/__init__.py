@@ -6,7 +6,7 @@ from .configs import (
     sess_config,
 )
 from .loss import choose_tf_loss
-from .rebuild import rebuild_tf_model
+from .rebuild import rebuild_tf_model, warm_start_tf_model
 from .variables import get_variable_from_graph, modify_variable_names, var_list_by_name
 from .version import TF_VERSION, get_tf_version, tf
 
@@ -18,6 +18,7 @@ __all__ = [
     "reg_config",
     "sess_config",
     "rebuild_tf_model",
+    "warm_start_tf_model",
     "choose_tf_loss",
     "modify_variable_names",
     "var_list_by_name",
@@ -1,6 +1,7 @@
 from .variables import get_variable_from_graph
 from .version import tf
 from ..layers import embedding_lookup, layer_normalization
+from ..layers.compression import compressed_embedding_lookup
 
 
 def compute_sparse_feats(
@@ -14,7 +15,10 @@ def compute_sparse_feats(
     reuse_layer=None,
     scope_name="embedding",
     flatten=False,
+    compression=None,
 ):
+    if compression is not None:
+        var_shape = (compression.n_rows, *var_shape[1:])
     reuse = tf.AUTO_REUSE if reuse_layer else None
     with tf.variable_scope(scope_name, reuse=reuse):
         embed_var = tf.get_variable(
@@ -35,17 +39,24 @@ def compute_sparse_feats(
             all_sparse_indices,
             multi_sparse_combiner,
             embed_size,
+            compression,
         )
     else:
-        sparse_embeds = tf.nn.embedding_lookup(embed_var, all_sparse_indices)
+        sparse_embeds = _lookup(embed_var, all_sparse_indices, compression)
 
     if flatten:
         sparse_embeds = tf.keras.layers.Flatten()(sparse_embeds)
     return sparse_embeds
 
 
+def _lookup(embed_var, indices, compression):
+    if compression is not None:
+        return compressed_embedding_lookup(embed_var, indices, compression)
+    return tf.nn.embedding_lookup(embed_var, indices)
+
+
 def multi_sparse_combine_embedding(
-    data_info, embed_var, all_sparse_indices, combiner, embed_size
+    data_info, embed_var, all_sparse_indices, combiner, embed_size, compression=None
 ):
     field_offsets = data_info.multi_sparse_combine_info.field_offset
     field_lens = data_info.multi_sparse_combine_info.field_len
@@ -62,11 +73,12 @@ def multi_sparse_combine_embedding(
             field_offsets[0],
             field_lens[0],
             feat_oovs[0],
+            compression,
         )
     else:
         if sparse_end > 0:
             sparse_indices = all_sparse_indices[:, :sparse_end]
-            sparse_embedding = tf.nn.embedding_lookup(embed_var, sparse_indices)
+            sparse_embedding = _lookup(embed_var, sparse_indices, compression)
             result = [sparse_embedding]
         else:
             result = []
@@ -81,6 +93,7 @@ def multi_sparse_combine_embedding(
                     offset,
                     length,
                     oov,
+                    compression,
                 )
             )
         result = tf.concat(result, axis=1)
@@ -88,18 +101,33 @@ def multi_sparse_combine_embedding(
 
 
 def multi_sparse_alone(
-    embed_var, all_sparse_indices, combiner, embed_size, offset, length, oov
+    embed_var,
+    all_sparse_indices,
+    combiner,
+    embed_size,
+    offset,
+    length,
+    oov,
+    compression=None,
 ):
     variable_dim = len(embed_var.get_shape().as_list())
-    # oov feats are padded to 0-vector
-    oov_indices = [oov] if variable_dim == 1 else oov
-    zero_padding_op = tf.scatter_update(
-        embed_var, oov_indices, tf.zeros([embed_size], dtype=tf.float32)
-    )
     multi_sparse_indices = all_sparse_indices[:, offset : offset + length]
-
-    with tf.control_dependencies([zero_padding_op]):
-        multi_sparse_embed = tf.nn.embedding_lookup(embed_var, multi_sparse_indices)
+    # oov feats are padded to 0-vector
+    if compression is not None:
+        # oov row may be shared in compressed table, so mask the embeddings instead
+        oov_mask = tf.cast(tf.not_equal(multi_sparse_indices, oov), tf.float32)
+        if variable_dim == 2:
+            oov_mask = oov_mask[:, :, tf.newaxis]
+        multi_sparse_embed = oov_mask * compressed_embedding_lookup(
+            embed_var, multi_sparse_indices, compression
+        )
+    else:
+        oov_indices = [oov] if variable_dim == 1 else oov
+        zero_padding_op = tf.scatter_update(
+            embed_var, oov_indices, tf.zeros([embed_size], dtype=tf.float32)
+        )
+        with tf.control_dependencies([zero_padding_op]):
+            multi_sparse_embed = tf.nn.embedding_lookup(embed_var, multi_sparse_indices)
 
     res_embed = tf.reduce_sum(multi_sparse_embed, axis=1, keepdims=True)
     if combiner in ("mean", "sqrtn"):
@@ -148,7 +176,7 @@ def compute_dense_feats(
     return dense_embeds
 
 
-def combine_seq_features(data_info, feat_agg_mode):
+def combine_seq_features(data_info, feat_agg_mode, compressed_tables=None):
     """Aggregate all item features together for sequence attention.
 
     This operation assumes all variables have been initialized before.
@@ -158,14 +186,18 @@ def combine_seq_features(data_info, feat_agg_mode):
     data_info : `DataInfo` object.
     feat_agg_mode : str
         "concat" or "elementwise"
+    compressed_tables : dict or None
+        Compressed tables of item and sparse features.
     Returns
     -------
     Shape: V * K, where V is the total item num.
     """
+    compressed_tables = compressed_tables or {}
     item_embeds = embedding_lookup(
         indices=tf.range(data_info.n_items + 1, dtype=tf.int32),
         var_name="item_embeds_var",
         reuse_layer=True,
+        compression=compressed_tables.get("item"),
     )
     if data_info.item_sparse_unique is not None:
         # contains unique sparse field indices for each item
@@ -177,6 +209,7 @@ def combine_seq_features(data_info, feat_agg_mode):
             indices=item_sparse_fields,
             var_name="sparse_embeds_var",
             reuse_layer=True,
+            compression=compressed_tables.get("sparse"),
         )
     else:
         sparse_embeds = None
@@ -24,16 +24,54 @@ def rebuild_tf_model(self, path, model_name, full_assign=True):
     full_assign : bool, default: True
         Whether to also restore the variables of Adam optimizer.
     """
+    variable_path = os.path.join(path, f"{model_name}_tf_variables.npz")
+    variables = np.load(variable_path)
+    variables = dict(variables.items())
+    assign_old_variables(self, variables, full_assign)
+
+
+# noinspection PyIncorrectDocstring
+def warm_start_tf_model(self, old_model, full_assign=True):
+    """Assign the variables of the old model in memory to the newly initialized model.
+
+    Same as ``rebuild_model``, but the variables are fetched from the session of
+    ``old_model`` directly, so the old model doesn't need to be saved and loaded.
+    The new model should be constructed in a new graph, i.e. after calling
+    ``tf.compat.v1.reset_default_graph()``.
+
+    .. versionadded:: 1.6.0
+
+    Parameters
+    ----------
+    old_model : Base
+        Trained model whose ``data_info`` has been merged into the ``data_info`` of
+        the new model by ``merge_trainset``.
+    full_assign : bool, default: True
+        Whether to also restore the variables of Adam optimizer.
+    """
+    from ..utils.validate import check_warm_start_model
+
+    check_warm_start_model(self, old_model)
+    old_graph = old_model.sess.graph
+    if self.sess.graph is old_graph:
+        raise ValueError(
+            "The new model must be constructed in a new graph, "
+            "call `tf.compat.v1.reset_default_graph()` before constructing it."
+        )
+    with old_graph.as_default():
+        old_variables = tf.global_variables()
+    values = old_model.sess.run(old_variables)
+    variables = {v.name: value for v, value in zip(old_variables, values)}
+    assign_old_variables(self, variables, full_assign)
+
+
+def assign_old_variables(self, variables, full_assign):
     from ..training.dispatch import get_trainer
 
     self.model_built = True
     self.build_model()
     self.trainer = get_trainer(self)
 
-    variable_path = os.path.join(path, f"{model_name}_tf_variables.npz")
-    variables = np.load(variable_path)
-    variables = dict(variables.items())
-
     (
         user_variables,
         item_variables,
@@ -46,18 +84,32 @@ def rebuild_tf_model(self, path, model_name, full_assign=True):
     old_n_users, old_n_items, old_sparse_len, old_sparse_oov, _ = astuple(
         self.data_info.old_info
     )
+    compressed_variables = _compressed_variables(self, variables)
+    feed_dict = dict()
+
+    def feed(value):
+        # feed old values rather than embedding them into the graph as constants
+        placeholder = tf.placeholder(value.dtype, shape=value.shape)
+        feed_dict[placeholder] = value
+        return placeholder
 
     update_ops = []
     for v in tf.trainable_variables():
+        if v.name in compressed_variables:
+            old_var, indices = compressed_variables[v.name]
+            compressed_op = tf.IndexedSlices(feed(old_var), indices)
+            update_ops.append(v.scatter_update(compressed_op))
+            continue
+
         if user_variables is not None and v.name in user_variables:
             # remove oov values
             old_var = variables[v.name][:old_n_users]
-            user_op = tf.IndexedSlices(old_var, tf.range(len(old_var)))
+            user_op = tf.IndexedSlices(feed(old_var), tf.range(len(old_var)))
             update_ops.append(v.scatter_update(user_op))
 
         if item_variables is not None and v.name in item_variables:
             old_var = variables[v.name][:old_n_items]
-            item_op = tf.IndexedSlices(old_var, tf.range(len(old_var)))
+            item_op = tf.IndexedSlices(feed(old_var), tf.range(len(old_var)))
             update_ops.append(v.scatter_update(item_op))
 
         if sparse_variables is not None and v.name in sparse_variables:
@@ -68,13 +120,13 @@ def rebuild_tf_model(self, path, model_name, full_assign=True):
             for offset, size in zip(sparse_offset, old_sparse_len):
                 if size != -1:
                     indices.extend(range(offset, offset + size))
-            sparse_op = tf.IndexedSlices(old_var, indices)
+            sparse_op = tf.IndexedSlices(feed(old_var), indices)
             update_ops.append(v.scatter_update(sparse_op))
 
         if dense_variables is not None and v.name in dense_variables:
             # dense values are same, no need to scatter_update
             old_var = variables[v.name]
-            update_ops.append(v.assign(old_var))
+            update_ops.append(v.assign(feed(old_var)))
 
     if full_assign:
         (
@@ -89,12 +141,17 @@ def rebuild_tf_model(self, path, model_name, full_assign=True):
             v for v in tf.global_variables() if v.name not in manual_variables
         ]
         for v in other_variables:
-            if (
+            if v.name in compressed_variables:
+                old_var, indices = compressed_variables[v.name]
+                compressed_op = tf.IndexedSlices(feed(old_var), indices)
+                update_ops.append(v.scatter_update(compressed_op))
+
+            elif (
                 optimizer_user_variables is not None
                 and v.name in optimizer_user_variables
             ):
                 old_var = variables[v.name][:old_n_users]
-                user_op = tf.IndexedSlices(old_var, tf.range(len(old_var)))
+                user_op = tf.IndexedSlices(feed(old_var), tf.range(len(old_var)))
                 update_ops.append(v.scatter_update(user_op))
 
             elif (
@@ -102,7 +159,7 @@ def rebuild_tf_model(self, path, model_name, full_assign=True):
                 and v.name in optimizer_item_variables
             ):
                 old_var = variables[v.name][:old_n_items]
-                item_op = tf.IndexedSlices(old_var, tf.range(len(old_var)))
+                item_op = tf.IndexedSlices(feed(old_var), tf.range(len(old_var)))
                 update_ops.append(v.scatter_update(item_op))
 
             elif (
@@ -116,7 +173,7 @@ def rebuild_tf_model(self, path, model_name, full_assign=True):
                 for offset, size in zip(sparse_offset, old_sparse_len):
                     if size != -1:
                         indices.extend(range(offset, offset + size))
-                sparse_op = tf.IndexedSlices(old_var, indices)
+                sparse_op = tf.IndexedSlices(feed(old_var), indices)
                 update_ops.append(v.scatter_update(sparse_op))
 
             elif (
@@ -124,7 +181,7 @@ def rebuild_tf_model(self, path, model_name, full_assign=True):
                 and v.name in optimizer_dense_variables
             ):
                 old_var = variables[v.name]
-                update_ops.append(v.assign(old_var))
+                update_ops.append(v.assign(feed(old_var)))
 
             elif v.name in variables:
                 old_var = variables[v.name]
@@ -134,6 +191,29 @@ def rebuild_tf_model(self, path, model_name, full_assign=True):
                         f"doesn't match, will be skipped."
                     )
                     continue
-                update_ops.append(v.assign(old_var))
+                update_ops.append(v.assign(feed(old_var)))
+
+    self.sess.run(update_ops, feed_dict=feed_dict)
 
-    self.sess.run(update_ops)
+
+def _compressed_variables(model, variables):
+    """Old values and new row indices of compressed variables and optimizer slots."""
+    from ..layers.compression import compressed_row_mapping, get_compressed_tables
+
+    compressed_tables = getattr(model, "compressed_tables", None)
+    if not compressed_tables or not any(compressed_tables.values()):
+        return dict()
+    old_tables = get_compressed_tables(
+        model.data_info, model.embed_compression, use_old_info=True
+    )
+    result = dict()
+    for key, table in compressed_tables.items():
+        if table is None or not hasattr(model, f"{key}_variables"):
+            continue
+        old_rows, new_rows = compressed_row_mapping(old_tables[key], table)
+        for name in getattr(model, f"{key}_variables"):
+            for suffix in ("", "/Adam", "/Adam_1", "/Ftrl", "/Ftrl_1"):
+                var_name = f"{name}{suffix}:0"
+                if var_name in variables:
+                    result[var_name] = (variables[var_name][old_rows], new_rows)
+    return result
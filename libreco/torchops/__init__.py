@@ -8,7 +8,7 @@ from .loss import (
     pairwise_bce_loss,
     pairwise_focal_loss,
 )
-from .rebuild import rebuild_torch_model
+from .rebuild import rebuild_torch_model, warm_start_torch_model
 
 __all__ = [
     "binary_cross_entropy_loss",
@@ -22,4 +22,5 @@ __all__ = [
     "pairwise_focal_loss",
     "rebuild_torch_model",
     "set_torch_seed",
+    "warm_start_torch_model",
 ]
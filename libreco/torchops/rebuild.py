@@ -1,11 +1,12 @@
 """Rebuild PyTorch models."""
+import copy
 from dataclasses import astuple
 
 import torch
 from torch import nn
 
 from ..utils.save_load import load_torch_state_dict
-from ..utils.validate import sparse_feat_size
+from ..utils.validate import check_warm_start_model, sparse_feat_size
 
 
 # noinspection PyIncorrectDocstring
@@ -23,15 +24,42 @@ def rebuild_torch_model(self, path, model_name):
     model_name : str
         Name of the saved model file.
     """
+    model_state_dict, optimizer_state_dict = load_torch_state_dict(
+        path, model_name, self.device
+    )
+    assign_old_states(self, model_state_dict, optimizer_state_dict)
+
+
+# noinspection PyIncorrectDocstring
+@torch.no_grad()
+def warm_start_torch_model(self, old_model):
+    """Assign the parameters of the old model in memory to the newly initialized model.
+
+    Same as ``rebuild_model``, but the parameters and optimizer states are taken from
+    ``old_model`` directly, so the old model doesn't need to be saved and loaded.
+
+    .. versionadded:: 1.6.0
+
+    Parameters
+    ----------
+    old_model : Base
+        Trained model whose ``data_info`` has been merged into the ``data_info`` of
+        the new model by ``merge_trainset``.
+    """
+    check_warm_start_model(self, old_model)
+    model_state_dict = old_model.torch_model.state_dict()
+    # optimizer states are updated in place, so they can't be shared with old model
+    optimizer_state_dict = copy.deepcopy(old_model.trainer.optimizer.state_dict())
+    assign_old_states(self, model_state_dict, optimizer_state_dict)
+
+
+def assign_old_states(self, model_state_dict, optimizer_state_dict):
     from ..training.dispatch import get_trainer
 
     self.model_built = True
     self.build_model()
     self.trainer = get_trainer(self)
 
-    model_state_dict, optimizer_state_dict = load_torch_state_dict(
-        path, model_name, self.device
-    )
     user_param_indices, item_param_indices = list(), list()
     user_params, item_params = dict(), dict()
     sparse_param_indices, sparse_params = list(), dict()
@@ -0,0 +1,78 @@
+import queue
+import threading
+
+_END = object()
+
+
+class _Failure:
+    def __init__(self, exc):
+        self.exc = exc
+
+
+def prefetch(iterable, num_batches, transform=None):
+    """Prepare batches in a background thread ahead of the training steps.
+
+    Collation, negative sampling and feed construction then overlap with
+    the computation in the session or torch model, which both release the GIL.
+
+    Parameters
+    ----------
+    iterable : Iterable
+        Source of batches, e.g. the ``DataLoader``.
+    num_batches : int
+        Maximum number of ready batches kept in the queue. If it is 0,
+        batches are prepared in the current thread.
+    transform : callable or None, default: None
+        Function applied to each batch in the background thread.
+
+    Yields
+    ------
+    Prepared batches in the original order.
+    """
+    if transform is None:
+        transform = _identity
+    if num_batches <= 0:
+        for batch in iterable:
+            yield transform(batch)
+        return
+
+    buffer = queue.Queue(maxsize=num_batches)
+    stop = threading.Event()
+
+    def _put(item):
+        # check `stop` periodically, so the thread exits if the consumer goes away
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce():
+        try:
+            for batch in iterable:
+                if not _put(transform(batch)):
+                    return
+        except Exception as e:
+            _put(_Failure(e))
+        else:
+            _put(_END)
+
+    producer = threading.Thread(target=_produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                break
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def _identity(batch):
+    return batch
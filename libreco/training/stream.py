@@ -0,0 +1,41 @@
+"""Encode streaming data for online training."""
+import numpy as np
+import pandas as pd
+
+from ..data import TransformedSet
+from ..prediction.preprocess import convert_id, get_original_feats
+from ..utils.constants import FeatModels
+from ..utils.validate import check_dense_values, check_sparse_indices
+
+
+def build_stream_data(model, data):
+    """Encode new rows with the current ``data_info`` of the model.
+
+    Rows with unknown users or items are dropped, since they have no embeddings
+    in the model. Features are taken from ``data_info``, the same as prediction.
+    Returns None if all the rows are dropped.
+    """
+    if not isinstance(data, pd.DataFrame):
+        raise ValueError(f"`data` must be `pandas.DataFrame`, got {type(data)}")
+    missing_cols = {"user", "item", "label"}.difference(data.columns)
+    if missing_cols:
+        raise ValueError(f"`data` misses columns: {sorted(missing_cols)}")
+
+    user, item = convert_id(model, data["user"], data["item"], inner_id=False)
+    known = (user != model.n_users) & (item != model.n_items)
+    if not np.any(known):
+        return None
+
+    user, item = user[known], item[known]
+    labels = data["label"].to_numpy(dtype=np.float32)[known]
+    sparse_indices, dense_values = None, None
+    if FeatModels.contains(model.model_name):
+        data_info = model.data_info
+        _, _, sparse_indices, dense_values = get_original_feats(
+            data_info,
+            user,
+            item,
+            check_sparse_indices(data_info),
+            check_dense_values(data_info),
+        )
+    return TransformedSet(user, item, labels, sparse_indices, dense_values)
@@ -1,6 +1,9 @@
+import itertools
+
 import numpy as np
 from tqdm import tqdm
 
+from .prefetch import prefetch
 from .trainer import BaseTrainer
 from ..batch import get_batch_loader, get_tf_feeds
 from ..evaluation import print_metrics
@@ -55,6 +58,7 @@ class TensorFlowTrainer(BaseTrainer):
         eval_batch_size,
         eval_user_num,
         num_workers,
+        prefetch_batches=0,
     ):
         data_loader = get_batch_loader(
             self.model,
@@ -74,9 +78,11 @@ class TensorFlowTrainer(BaseTrainer):
             with time_block(f"Epoch {epoch}", verbose):
                 disable = True if verbose <= 0 else False
                 train_total_loss = []
-                for batch_data in tqdm(data_loader, desc="train", disable=disable):
+                feed_dicts = prefetch(data_loader, prefetch_batches, self._get_feeds)
+                for feed_dict in tqdm(
+                    feed_dicts, desc="train", total=len(data_loader), disable=disable
+                ):
                     fetches = (self.loss, self.training_op)
-                    feed_dict = get_tf_feeds(self.model, batch_data, is_training=True)
                     train_loss, _ = self.sess.run(fetches, feed_dict)
                     train_total_loss.append(train_loss)
 
@@ -100,6 +106,18 @@ class TensorFlowTrainer(BaseTrainer):
                 )
                 print("=" * 30)
 
+    def partial_run(self, train_data, neg_sampling, max_steps=None):
+        data_loader = self.stream_loader(train_data, neg_sampling)
+        train_total_loss = []
+        for batch_data in itertools.islice(data_loader, max_steps):
+            fetches = (self.loss, self.training_op)
+            train_loss, _ = self.sess.run(fetches, self._get_feeds(batch_data))
+            train_total_loss.append(train_loss)
+        return float(np.mean(train_total_loss)) if train_total_loss else None
+
+    def _get_feeds(self, batch_data):
+        return get_tf_feeds(self.model, batch_data, is_training=True)
+
     def _build_train_ops(self, **kwargs):
         self.loss = choose_tf_loss(self.model, self.task, self.loss_type)
         if self.use_reg:
@@ -1,3 +1,4 @@
+import itertools
 import math
 from statistics import mean
 
@@ -6,6 +7,7 @@ from torch.optim import Adam
 from torch.optim.lr_scheduler import CosineAnnealingWarmRestarts
 from tqdm import tqdm
 
+from .prefetch import prefetch
 from .trainer import BaseTrainer
 from ..batch import get_batch_loader
 from ..batch.batch_unit import PairwiseBatch, PointwiseBatch
@@ -86,6 +88,7 @@ class TorchTrainer(BaseTrainer):
         eval_batch_size,
         eval_user_num,
         num_workers,
+        prefetch_batches=0,
     ):
         self._check_params()
         data_loader = get_batch_loader(
@@ -108,8 +111,9 @@ class TorchTrainer(BaseTrainer):
                 self.torch_model.train()
                 disable = True if verbose <= 0 else False
                 train_total_loss = []
+                batches = prefetch(data_loader, prefetch_batches)
                 for i, batch_data in enumerate(
-                    tqdm(data_loader, desc="train", disable=disable)
+                    tqdm(batches, desc="train", total=len(data_loader), disable=disable)
                 ):
                     loss = self._compute_loss(batch_data)
                     self.optimizer.zero_grad()
@@ -137,13 +141,24 @@ class TorchTrainer(BaseTrainer):
                 )
                 print("=" * 30)
 
+    def partial_run(self, train_data, neg_sampling, max_steps=None):
+        self._check_params()
+        data_loader = self.stream_loader(train_data, neg_sampling)
+        self.torch_model.train()
+        train_total_loss = []
+        for batch_data in itertools.islice(data_loader, max_steps):
+            loss = self._compute_loss(batch_data)
+            self.optimizer.zero_grad()
+            loss.backward()
+            self.optimizer.step()
+            train_total_loss.append(loss.detach().cpu().item())
+        return mean(train_total_loss) if train_total_loss else None
+
     def _compute_loss(self, data):
         if "cpu" not in self.device.type:  # pragma: no cover
             data.to_device(self.device)
-        user_embeds, item_embeds = self.torch_model(use_dropout=True)
         if isinstance(data, PointwiseBatch):
-            users, items = data.users, data.items
-            users, items = user_embeds[users], item_embeds[items]
+            users, items = self.torch_model(data.users, data.items, use_dropout=True)
             logits = torch.sum(torch.mul(users, items), dim=1)
             labels = torch.as_tensor(data.labels, dtype=torch.float, device=self.device)
             if self.loss_type == "cross_entropy":
@@ -151,9 +166,11 @@ class TorchTrainer(BaseTrainer):
             else:
                 return focal_loss(logits, labels)
         elif isinstance(data, PairwiseBatch):
-            users = user_embeds[data.queries]
             items_pos, items_neg = data.item_pairs[0], data.item_pairs[1]
-            items_pos, items_neg = item_embeds[items_pos], item_embeds[items_neg]
+            users, items = self.torch_model(
+                data.queries, torch.cat([items_pos, items_neg]), use_dropout=True
+            )
+            items_pos, items_neg = torch.split(items, [len(items_pos), len(items_neg)])
             pos_scores, neg_scores = compute_pair_scores(users, items_pos, items_neg)
             if self.loss_type == "bpr":
                 return bpr_loss(pos_scores, neg_scores)
@@ -1,6 +1,6 @@
 import abc
 
-from ..batch import adjust_batch_size
+from ..batch import adjust_batch_size, get_collate_fn, get_stream_loader
 from ..utils.validate import is_listwise_training
 
 
@@ -28,6 +28,7 @@ class BaseTrainer(abc.ABC):
         self.batch_size = adjust_batch_size(model, batch_size)
         self.sampler = sampler
         self.num_neg = num_neg
+        self.stream_collators = dict()
 
     def _check_params(self):
         if not is_listwise_training(self.model):
@@ -42,6 +43,15 @@ class BaseTrainer(abc.ABC):
                     f"got {self.sampler}"
                 )
 
+    def stream_loader(self, train_data, neg_sampling):
+        # reuse collators across `partial_fit` calls
+        if neg_sampling not in self.stream_collators:
+            self.stream_collators[neg_sampling] = get_collate_fn(
+                self.model, neg_sampling, num_workers=0
+            )
+        collate_fn = self.stream_collators[neg_sampling]
+        return get_stream_loader(self.model, train_data, self.batch_size, collate_fn)
+
     @abc.abstractmethod
     def run(self, *args, **kwargs):
         raise NotImplementedError
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import List
 
+import numpy as np
 from scipy.sparse import csr_matrix
 
 
@@ -18,3 +19,104 @@ def build_sparse(matrix: csr_matrix, transpose: bool = False):
         m.indptr.tolist(),
         m.data.tolist(),
     )
+
+
+def build_sorted_csr(row_indices, col_indices, n_rows, n_cols):
+    """Build CSR rows that contain unique and sorted column indices.
+
+    Parameters
+    ----------
+    row_indices : array_like
+        Row index of every element, e.g. user indices.
+    col_indices : array_like
+        Column index of every element, e.g. item indices.
+    n_rows : int
+        Number of rows, which should be larger than the max row index.
+    n_cols : int
+        Number of columns, which should be larger than the max column index.
+
+    Returns
+    -------
+    indptr : numpy.ndarray
+        Row pointers of the CSR rows.
+    indices : numpy.ndarray
+        Sorted column indices in each row.
+    """
+    row_indices = np.asarray(row_indices)
+    col_indices = np.asarray(col_indices)
+    values = np.ones(len(row_indices), dtype=np.int8)
+    matrix = csr_matrix((values, (row_indices, col_indices)), shape=(n_rows, n_cols))
+    # `sum_duplicates` also sorts indices in every row
+    matrix.sum_duplicates()
+    return matrix.indptr, matrix.indices
+
+
+def csr_contains(indptr, indices, rows, values):
+    """Check whether each value exists in the corresponding sorted CSR row.
+
+    All the rows are searched simultaneously by binary search,
+    so the time complexity is O(len(values) * log(max_row_len)).
+
+    Parameters
+    ----------
+    indptr : numpy.ndarray
+        Row pointers of the CSR rows.
+    indices : numpy.ndarray
+        Column indices in each row, which must be sorted.
+    rows : numpy.ndarray
+        Row to search for every value.
+    values : numpy.ndarray
+        Values to search, must have the same shape as ``rows``.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean mask with the same shape as ``values``.
+    """
+    found, _ = csr_search(indptr, indices, rows, values)
+    return found
+
+
+def csr_search(indptr, indices, rows, values):
+    """Find the location of each value in the corresponding sorted CSR row.
+
+    Parameters
+    ----------
+    indptr : numpy.ndarray
+        Row pointers of the CSR rows.
+    indices : numpy.ndarray
+        Column indices in each row, which must be sorted.
+    rows : numpy.ndarray
+        Row to search for every value.
+    values : numpy.ndarray
+        Values to search, must have the same shape as ``rows``.
+
+    Returns
+    -------
+    found : numpy.ndarray
+        Boolean mask with the same shape as ``values``.
+    locations : numpy.ndarray
+        Positions in ``indices`` of the found values, only meaningful where ``found``.
+    """
+    values = np.asarray(values)
+    shape = values.shape
+    rows = np.asarray(rows).ravel()
+    values = values.ravel()
+    if len(indices) == 0:
+        return np.zeros(shape, dtype=bool), np.zeros(shape, dtype=np.int64)
+
+    # branchless binary search, `base` and `size` delimit the remaining search range.
+    base = indptr[rows]
+    size = indptr[rows + 1] - base
+    max_row_len = int(np.max(size, initial=0))
+    last = len(indices) - 1
+    for _ in range(max_row_len.bit_length()):
+        half = size >> 1
+        go_right = indices[np.minimum(base + half, last)] <= values
+        base += go_right * half
+        size -= half
+
+    locations = np.minimum(base, last)
+    found = size > 0
+    found &= indices[locations] == values
+    return found.reshape(shape), locations.reshape(shape)
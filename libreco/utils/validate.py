@@ -161,6 +161,38 @@ def check_retrain_loaded_model(model):
         )
 
 
+def check_partial_fitting(model, neg_sampling):
+    check_neg_sampling(model, neg_sampling)
+    check_retrain_loaded_model(model)
+    if not model.model_built:
+        raise RuntimeError(
+            "The model must be trained by `fit`, or assigned by `rebuild_model` "
+            "or `warm_start_from` before `partial_fit`."
+        )
+    if not hasattr(model.trainer, "partial_run"):
+        raise ValueError(f"`{model.model_name}` doesn't support `partial_fit`.")
+
+
+def check_warm_start_model(model, old_model):
+    old_info = model.data_info.old_info
+    if old_info is None:
+        raise ValueError(
+            "`data_info` of the new model must be the merged one returned by "
+            "`merge_trainset`."
+        )
+    if not old_model.model_built:
+        raise RuntimeError(
+            "The old model must be trained in the current process, "
+            "use `rebuild_model` for saved models."
+        )
+    if (old_info.n_users, old_info.n_items) != (old_model.n_users, old_model.n_items):
+        raise ValueError(
+            f"Old model has {old_model.n_users} users and {old_model.n_items} items, "
+            f"but `data_info` was merged from {old_info.n_users} users and "
+            f"{old_info.n_items} items."
+        )
+
+
 def check_eval(eval_data, k, n_items):
     if eval_data is not None and k > n_items:
         raise ValueError(f"eval `k` {k} exceeds num of items {n_items}")
@@ -82,6 +82,14 @@ extensions = [
         extra_compile_args=compile_args,
         extra_link_args=link_args,
     ),
+    Extension(
+        "libreco.algorithms._svd",
+        [os.path.join("libreco", "algorithms", "_svd.pyx")],
+        include_dirs=[np.get_include()],
+        language="c++",
+        extra_compile_args=compile_args,
+        extra_link_args=link_args,
+    ),
     Extension(
         "libreco.utils._similarities",
         [os.path.join("libreco", "utils", "_similarities.pyx")],
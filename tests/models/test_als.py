@@ -1,4 +1,6 @@
+import numpy as np
 import pytest
+from scipy.sparse import csr_matrix
 
 from libreco.algorithms import ALS
 from libreco.algorithms.als import least_squares, least_squares_cg
@@ -153,9 +155,98 @@ def test_als(pure_data_small, task, neg_sampling, reg, alpha):
             )
 
 
+@pytest.mark.parametrize("task", ["rating", "ranking"])
+def test_als_fold_in(pure_data_small, task):
+    pd_data, train_data, _, data_info = pure_data_small
+    model = ALS(task, data_info, embed_size=16, n_epochs=2, reg=0.1, use_cg=False)
+    model.fit(train_data, neg_sampling=task == "ranking", verbose=0)
+    with pytest.raises(ValueError):
+        model.fold_in_users([1, 2], [[1, 2]])
+    if task == "rating":
+        with pytest.raises(ValueError):
+            model.fold_in_users([1], [[1, 2]])
+
+    user_data = pd_data[pd_data["user"] == pd_data["user"].iloc[0]]
+    user, items, labels = (
+        user_data["user"].iloc[0],
+        user_data["item"],
+        user_data["label"],
+    )
+    labels = labels if task == "rating" else np.ones(len(items))
+    model.fold_in_users([user], [items.tolist()], [labels.tolist()])
+    item_ids = [data_info.item2id[i] for i in items]
+    expected = np.zeros((1, 16), dtype=np.float32)
+    least_squares(
+        csr_matrix(
+            (
+                labels * 10 + 1 if task == "ranking" else labels,
+                ([0] * len(items), item_ids),
+            ),
+            shape=(1, data_info.n_items),
+            dtype=np.float32,
+        ),
+        X=expected,
+        Y=model.item_embeds_np[:-1],
+        reg=0.1,
+        embed_size=16,
+        num=1,
+        mode="implicit" if task == "ranking" else "explicit",
+    )
+    user_embed = model.user_embeds_np[data_info.user2id[user]]
+    np.testing.assert_allclose(user_embed, expected[0], rtol=1e-3, atol=1e-4)
+
+    n_users = data_info.n_users
+    new_labels = [[5.0, 4.0], [3.0]] if task == "rating" else None
+    model.fold_in_users([-1, -2], [items[:2].tolist(), [-1]], new_labels)
+    assert model.n_users == data_info.n_users == n_users + 2
+    assert model.user_embeds_np.shape == (n_users + 3, 16)
+    assert data_info.user_consumed[n_users] == item_ids[:2]
+    assert data_info.user_consumed[n_users + 1] == []
+    assert data_info.item_consumed[item_ids[0]][-1] == n_users
+    assert data_info.item_consumed[item_ids[1]].count(n_users) == 1
+    assert not np.any(np.isin(model.recommend_user(-1, 10)[-1], items[:2]))
+
+    n_items = data_info.n_items
+    item_labels = [[4.0]] if task == "rating" else None
+    model.fold_in_items([-1], [[-1]], item_labels)
+    assert model.item_embeds_np.shape == (n_items + 2, 16)
+    assert data_info.item_consumed[n_items] == [n_users]
+    assert data_info.user_consumed[n_users] == [*item_ids[:2], n_items]
+    with pytest.raises(ValueError):
+        model.fold_in_users(["str_id"], [[-1]], [[1.0]])
+    ptest_preds(model, task, pd_data, with_feats=False)
+
+
 # def test_failed_import(monkeypatch):
 #    with monkeypatch.context() as m:
 #        m.delitem(sys.modules, "libreco.algorithms.als")
 #        m.setitem(sys.modules, "libreco.algorithms._als", None)
 #        with pytest.raises((ImportError, ModuleNotFoundError)):
 #            from libreco.algorithms.als import ALS
+
+
+@pytest.mark.parametrize("task", ["rating", "ranking"])
+def test_als_subspace_solver(pure_data_small, task):
+    pd_data, train_data, _, data_info = pure_data_small
+    with pytest.raises(ValueError):
+        ALS(task, data_info, reg=0.1, solver="whatever")
+    with pytest.raises(ValueError):
+        ALS(task, data_info, reg=0.1, solver="subspace", block_size=0)
+
+    params = dict(task=task, data_info=data_info, embed_size=16, n_epochs=1, reg=0.1)
+    exact_model = ALS(**params, use_cg=False)
+    exact_model.fit(train_data, neg_sampling=task == "ranking", verbose=0)
+    # a single block of all the dimensions is equivalent to the exact solver
+    model = ALS(**params, solver="subspace", block_size=16)
+    model.fit(train_data, neg_sampling=task == "ranking", verbose=0)
+    np.testing.assert_allclose(
+        model.user_embeds_np, exact_model.user_embeds_np, rtol=1e-3, atol=1e-4
+    )
+    np.testing.assert_allclose(
+        model.item_embeds_np, exact_model.item_embeds_np, rtol=1e-3, atol=1e-4
+    )
+
+    model = ALS(**params, solver="subspace", block_size=5)
+    model.fit(train_data, neg_sampling=task == "ranking", verbose=0)
+    ptest_preds(model, task, pd_data, with_feats=False)
+    ptest_recommends(model, data_info, pd_data, with_feats=False)
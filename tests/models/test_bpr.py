@@ -1,9 +1,13 @@
 import sys
 
+import numpy as np
+import pandas as pd
 import pytest
 import tensorflow as tf
 
 from libreco.algorithms import BPR
+from libreco.data import DatasetPure, random_split
+from libreco.evaluation import evaluate
 from tests.models.utils_tf import ptest_tf_variables
 from tests.utils_data import remove_path
 from tests.utils_metrics import get_metrics
@@ -114,6 +118,65 @@ def test_bpr(
             remove_path("not_existed_path")
 
 
+@pytest.fixture
+def latent_factor_data():
+    """Users consume the items with high latent scores, among many candidates."""
+    np_rng = np.random.default_rng(42)
+    n_users, n_items, n_consumed = 500, 1000, 20
+    user_factors = np_rng.normal(size=(n_users, 8))
+    item_factors = np_rng.normal(size=(n_items, 8))
+    noise = np_rng.gumbel(size=(n_users, n_items))
+    scores = 1.5 * user_factors @ item_factors.T + noise
+    items = np.argsort(-scores, axis=1)[:, :n_consumed]
+    data = pd.DataFrame(
+        {
+            "user": np.repeat(np.arange(n_users), n_consumed),
+            "item": items.ravel(),
+            "label": 1,
+        }
+    )
+    train_data, eval_data = random_split(data, test_size=0.2, seed=42)
+    train_data, data_info = DatasetPure.build_trainset(train_data)
+    eval_data = DatasetPure.build_evalset(eval_data)
+    return train_data, eval_data, data_info
+
+
+def test_bpr_adaptive_negatives(latent_factor_data):
+    tf.compat.v1.reset_default_graph()
+    train_data, eval_data, data_info = latent_factor_data
+    with pytest.raises(ValueError):
+        BPR(data_info=data_info, loss_type="warp", use_tf=True)
+    with pytest.raises(ValueError):
+        BPR(data_info=data_info, use_tf=False, neg_candidates=0)
+    with pytest.raises(ValueError):
+        BPR(data_info=data_info, use_tf=True, neg_candidates=5)
+    with pytest.raises(ValueError):
+        BPR(data_info=data_info, loss_type="warp", use_tf=False, optimizer="adam").fit(
+            train_data, neg_sampling=True
+        )
+
+    def fit_recall(loss_type, neg_candidates, n_epochs, optimizer="sgd"):
+        model = BPR(
+            data_info=data_info,
+            loss_type=loss_type,
+            embed_size=16,
+            n_epochs=n_epochs,
+            lr=0.05 if optimizer == "sgd" else 0.005,
+            use_tf=False,
+            optimizer=optimizer,
+            neg_candidates=neg_candidates,
+        )
+        model.fit(train_data, neg_sampling=True, verbose=0)
+        result = evaluate(model, eval_data, neg_sampling=True, metrics=["recall"])
+        return result["recall"]
+
+    uniform_recall = fit_recall("bpr", 1, n_epochs=20)
+    # hard negatives reach a higher recall with fewer epochs
+    assert fit_recall("bpr", 5, n_epochs=15) > uniform_recall
+    assert fit_recall("warp", None, n_epochs=5) > uniform_recall
+    assert fit_recall("warp", 10, n_epochs=5, optimizer="momentum") > uniform_recall
+
+
 # def test_failed_import(monkeypatch):
 #    with monkeypatch.context() as m:
 #        m.delitem(sys.modules, "libreco.algorithms.bpr")
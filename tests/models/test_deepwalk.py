@@ -60,3 +60,32 @@ def test_deepwalk(
         ptest_recommends(loaded_model, loaded_data_info, pd_data, with_feats=False)
         model.save("not_existed_path", "deepwalk2")
         remove_path("not_existed_path")
+
+
+def test_deepwalk_corpus_file(pure_data_small, tmp_path):
+    tf.compat.v1.reset_default_graph()
+    pd_data, train_data, eval_data, data_info = pure_data_small
+    model = DeepWalk(
+        "ranking",
+        data_info,
+        embed_size=16,
+        n_epochs=2,
+        n_walks=4,
+        walk_length=6,
+        n_threads=2,
+        corpus_dir=str(tmp_path),
+        walk_workers=2,
+    )
+    model.fit(train_data, neg_sampling=True, verbose=2, eval_data=eval_data)
+    ptest_preds(model, "ranking", pd_data, with_feats=False)
+    ptest_recommends(model, data_info, pd_data, with_feats=False)
+
+    # every consecutive pair of a walk is a transition in the consumed sequences
+    transitions = set()
+    for items in data_info.user_consumed.values():
+        transitions.update(zip(items[:-1], items[1:]))
+    with open(model.data) as f:
+        walks = [list(map(int, line.split())) for line in f]
+    assert len(walks) == 4 * data_info.n_items
+    assert all(1 <= len(walk) <= 6 for walk in walks)
+    assert all(pair in transitions for walk in walks for pair in zip(walk, walk[1:]))
@@ -174,11 +174,6 @@ def test_graphsage_dgl(
     elif loss_type == "cross_entropy" and neg_sampling and num_neg <= 0:
         with pytest.raises(AssertionError):
             GraphSageDGL(**params).fit(train_data, neg_sampling)
-    elif num_workers != 0:
-        with pytest.raises(AssertionError):
-            GraphSageDGL(**params).fit(
-                train_data, neg_sampling, num_workers=num_workers
-            )
     else:
         model = GraphSageDGL(
             task=task,
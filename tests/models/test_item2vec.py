@@ -1,3 +1,6 @@
+import gc
+import os
+
 import pytest
 import tensorflow as tf
 
@@ -53,3 +56,35 @@ def test_item2vec(pure_data_small, task, norm_embed, window_size, neg_sampling):
         ptest_recommends(loaded_model, loaded_data_info, pd_data, with_feats=False)
         model.save("not_existed_path", "item2vec2")
         remove_path("not_existed_path")
+
+
+def test_item2vec_corpus_file(pure_data_small, tmp_path):
+    tf.compat.v1.reset_default_graph()
+    pd_data, train_data, eval_data, data_info = pure_data_small
+    model = Item2Vec(
+        "ranking",
+        data_info,
+        embed_size=16,
+        n_epochs=2,
+        n_threads=2,
+        corpus_dir=str(tmp_path),
+    )
+    model.fit(train_data, neg_sampling=True, verbose=2, eval_data=eval_data)
+    ptest_preds(model, "ranking", pd_data, with_feats=False)
+    ptest_recommends(model, data_info, pd_data, with_feats=False)
+
+    with open(model.data) as f:
+        item_seqs = [list(map(int, line.split())) for line in f]
+    assert item_seqs == [
+        list(items) for items in data_info.user_consumed.values() if len(items) > 0
+    ]
+
+    # the model owns a single corpus file
+    model.data = model.build_corpus()
+    assert os.listdir(tmp_path) == [os.path.basename(model.data)]
+    model.remove_corpus()
+    assert model.data is None and not os.listdir(tmp_path)
+    model.data = model.build_corpus()
+    del model
+    gc.collect()
+    assert not os.listdir(tmp_path)
@@ -1,9 +1,12 @@
 import sys
 
+import numpy as np
 import pytest
 import tensorflow as tf
+import torch
 
 from libreco.algorithms import LightGCN
+from libreco.graph.laplacian import load_laplacian_matrix
 from tests.utils_data import remove_path, set_ranking_labels
 from tests.utils_metrics import get_metrics
 from tests.utils_pred import ptest_preds
@@ -118,3 +121,70 @@ def test_lightgcn(
             loaded_model.fit(train_data, neg_sampling)
         model.save("not_existed_path", "lightgcn2")
         remove_path("not_existed_path")
+
+
+@pytest.mark.parametrize(
+    "norm, self_loop, power", [("symmetric", False, -0.5), ("left", True, -1.0)]
+)
+def test_laplacian_matrix(pure_data_small, tmp_path, norm, self_loop, power):
+    _, _, _, data_info = pure_data_small
+    n_users, n_items = data_info.n_users, data_info.n_items
+    n_nodes = n_users + n_items
+    R = np.zeros((n_users, n_items), dtype=np.float32)
+    for u in range(n_users):
+        R[u, data_info.user_consumed[u]] = 1.0
+    adj = np.zeros((n_nodes, n_nodes), dtype=np.float32)
+    adj[:n_users, n_users:] = R
+    adj[n_users:, :n_users] = R.T
+    if self_loop:
+        adj += np.eye(n_nodes, dtype=np.float32)
+    with np.errstate(divide="ignore"):
+        diag_inv = np.power(adj.sum(axis=1), power)
+    diag_inv[np.isinf(diag_inv)] = 0.0
+    expected = diag_inv[:, None] * adj
+    if norm == "symmetric":
+        expected *= diag_inv[None, :]
+
+    args = (data_info.user_consumed, n_users, n_items, "cpu", norm, self_loop)
+    matrix = load_laplacian_matrix(*args, cache_dir=str(tmp_path))
+    np.testing.assert_allclose(matrix.to_dense().numpy(), expected, rtol=1e-6)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    cached_matrix = load_laplacian_matrix(*args, cache_dir=str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 1
+    assert torch.equal(cached_matrix.to_dense(), matrix.to_dense())
+
+
+def test_lightgcn_subgraph_sampling(pure_data_small):
+    tf.compat.v1.reset_default_graph()
+    pd_data, train_data, eval_data, data_info = pure_data_small
+    model = LightGCN(
+        "ranking", data_info, n_epochs=1, subgraph_sampling=True, device="cpu"
+    )
+    model.build_model()
+    users = torch.tensor([0, 3, 3, 7])
+    items = torch.tensor([1, 2, 5, 5, 0])
+    user_embeds, item_embeds = model.torch_model(users, items, use_dropout=False)
+    full_user_embeds, full_item_embeds = model.torch_model.embedding_propagation(
+        use_dropout=False
+    )
+    torch.testing.assert_close(user_embeds, full_user_embeds[users])
+    torch.testing.assert_close(item_embeds, full_item_embeds[items])
+
+    with pytest.raises(ValueError):
+        LightGCN("ranking", data_info, num_neighbors=0)
+
+    model = LightGCN(
+        "ranking",
+        data_info,
+        loss_type="bpr",
+        n_epochs=1,
+        batch_size=40,
+        dropout_rate=0.2,
+        subgraph_sampling=True,
+        num_neighbors=2,
+        device="cpu",
+    )
+    model.fit(train_data, neg_sampling=True, verbose=2, eval_data=eval_data)
+    ptest_preds(model, "ranking", pd_data, with_feats=False)
+    ptest_recommends(model, data_info, pd_data, with_feats=False)
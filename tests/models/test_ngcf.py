@@ -2,6 +2,7 @@ import sys
 
 import pytest
 import tensorflow as tf
+import torch
 
 from libreco.algorithms import NGCF
 from tests.utils_data import remove_path, set_ranking_labels
@@ -124,3 +125,33 @@ def test_ngcf(
         ptest_recommends(loaded_model, loaded_data_info, pd_data, with_feats=False)
         model.save("not_existed_path", "ngcf2")
         remove_path("not_existed_path")
+
+
+def test_ngcf_subgraph_sampling(pure_data_small):
+    tf.compat.v1.reset_default_graph()
+    pd_data, train_data, eval_data, data_info = pure_data_small
+    model = NGCF("ranking", data_info, n_epochs=1, subgraph_sampling=True, device="cpu")
+    model.build_model()
+    users = torch.tensor([0, 3, 3, 7])
+    items = torch.tensor([1, 2, 5, 5, 0])
+    user_embeds, item_embeds = model.torch_model(users, items, use_dropout=False)
+    full_user_embeds, full_item_embeds = model.torch_model.embedding_propagation(
+        use_dropout=False
+    )
+    torch.testing.assert_close(user_embeds, full_user_embeds[users])
+    torch.testing.assert_close(item_embeds, full_item_embeds[items])
+
+    model = NGCF(
+        "ranking",
+        data_info,
+        n_epochs=1,
+        batch_size=40,
+        node_dropout=0.2,
+        message_dropout=0.2,
+        subgraph_sampling=True,
+        num_neighbors=2,
+        device="cpu",
+    )
+    model.fit(train_data, neg_sampling=True, verbose=2, eval_data=eval_data)
+    ptest_preds(model, "ranking", pd_data, with_feats=False)
+    ptest_recommends(model, data_info, pd_data, with_feats=False)
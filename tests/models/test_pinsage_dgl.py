@@ -179,9 +179,6 @@ def test_pinsage_dgl(
     elif loss_type == "cross_entropy" and neg_sampling and num_neg <= 0:
         with pytest.raises(AssertionError):
             PinSageDGL(**params).fit(train_data, neg_sampling)
-    elif num_workers != 0:
-        with pytest.raises(AssertionError):
-            PinSageDGL(**params).fit(train_data, neg_sampling, num_workers=num_workers)
     else:
         model = PinSageDGL(
             task=task,
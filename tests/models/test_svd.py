@@ -1,11 +1,13 @@
 import sys
 
+import numpy as np
 import pytest
 import tensorflow as tf
 
 from libreco.algorithms import SVD
+from libreco.data import DatasetPure
 from tests.models.utils_tf import ptest_tf_variables
-from tests.utils_data import set_ranking_labels
+from tests.utils_data import SAVE_PATH, set_ranking_labels
 from tests.utils_metrics import get_metrics
 from tests.utils_pred import ptest_preds
 from tests.utils_reco import ptest_recommends
@@ -94,3 +96,64 @@ def test_svd(
         loaded_model, loaded_data_info = save_load_model(SVD, model, data_info)
         ptest_preds(loaded_model, task, pd_data, with_feats=False)
         ptest_recommends(loaded_model, loaded_data_info, pd_data, with_feats=False)
+
+
+@pytest.mark.parametrize(
+    "task, neg_sampling", [("rating", False), ("ranking", True), ("ranking", False)]
+)
+def test_svd_cython(pure_data_small, task, neg_sampling):
+    pd_data, train_data, eval_data, data_info = pure_data_small
+    if task == "ranking" and not neg_sampling:
+        set_ranking_labels(train_data)
+        set_ranking_labels(eval_data)
+    with pytest.raises(ValueError):
+        SVD(task, data_info, backend="whatever")
+    with pytest.raises(ValueError):
+        SVD("ranking", data_info, loss_type="focal", backend="cython")
+    with pytest.raises(ValueError):
+        SVD(task, data_info, backend="cython", norm_embed=True)
+
+    model = SVD(
+        task=task,
+        data_info=data_info,
+        embed_size=4,
+        n_epochs=2,
+        lr=0.01,
+        reg=0.01,
+        num_neg=2,
+        backend="cython",
+        num_threads=2,
+    )
+    model.fit(
+        train_data,
+        neg_sampling,
+        verbose=2,
+        eval_data=eval_data,
+        metrics=get_metrics(task),
+    )
+    assert model.user_embeds_np.shape == (data_info.n_users + 1, 4 + 2)
+    ptest_preds(model, task, pd_data, with_feats=False)
+    ptest_recommends(model, data_info, pd_data, with_feats=False)
+
+    loaded_model, loaded_data_info = save_load_model(SVD, model, data_info)
+    ptest_preds(loaded_model, task, pd_data, with_feats=False)
+    ptest_recommends(loaded_model, loaded_data_info, pd_data, with_feats=False)
+
+    # test rebuild and warm start
+    model.save(SAVE_PATH, "svd_model", inference_only=False)
+    train_data, new_data_info = DatasetPure.merge_trainset(
+        pd_data, data_info, merge_behavior=True
+    )
+    if task == "ranking" and not neg_sampling:
+        set_ranking_labels(train_data)
+    for warm_start in (False, True):
+        new_model = SVD(task, new_data_info, embed_size=4, n_epochs=1, backend="cython")
+        if warm_start:
+            new_model.warm_start_from(model)
+        else:
+            new_model.rebuild_model(SAVE_PATH, "svd_model")
+        for param_name, param in model.sgd_params.items():
+            np.testing.assert_array_equal(
+                new_model.sgd_params[param_name][: len(param)], param
+            )
+        new_model.fit(train_data, neg_sampling, verbose=0)
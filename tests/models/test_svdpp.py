@@ -1,5 +1,6 @@
 import sys
 
+import numpy as np
 import pytest
 import tensorflow as tf
 
@@ -125,3 +126,123 @@ def test_svdpp(
             new_model.fit(train_data, neg_sampling)
             with pytest.raises(ValueError):
                 new_model.fit(train_data, neg_sampling, eval_data=eval_data, k=10000)
+
+
+@pytest.mark.parametrize(
+    "task, neg_sampling", [("rating", False), ("ranking", True), ("ranking", False)]
+)
+def test_svdpp_cython(pure_data_small, task, neg_sampling):
+    pd_data, train_data, eval_data, data_info = pure_data_small
+    if task == "ranking" and not neg_sampling:
+        set_ranking_labels(train_data)
+        set_ranking_labels(eval_data)
+    with pytest.raises(ValueError):
+        SVDpp(task, data_info, backend="whatever")
+    with pytest.raises(ValueError):
+        SVDpp("ranking", data_info, loss_type="focal", backend="cython")
+
+    model = SVDpp(
+        task=task,
+        data_info=data_info,
+        embed_size=4,
+        n_epochs=2,
+        lr=0.01,
+        reg=0.01,
+        num_neg=2,
+        recent_num=10,
+        backend="cython",
+        num_threads=2,
+    )
+    model.fit(
+        train_data,
+        neg_sampling,
+        verbose=2,
+        eval_data=eval_data,
+        metrics=get_metrics(task),
+    )
+    assert model.user_embeds_np.shape == (data_info.n_users + 1, 4 + 2)
+    ptest_preds(model, task, pd_data, with_feats=False)
+    ptest_recommends(model, data_info, pd_data, with_feats=False)
+
+    loaded_model, loaded_data_info = save_load_model(SVDpp, model, data_info)
+    ptest_preds(loaded_model, task, pd_data, with_feats=False)
+    ptest_recommends(loaded_model, loaded_data_info, pd_data, with_feats=False)
+
+    # test rebuild and warm start
+    model.save(SAVE_PATH, "svdpp_model", inference_only=False)
+    train_data, new_data_info = DatasetPure.merge_trainset(
+        pd_data, data_info, merge_behavior=True
+    )
+    if task == "ranking" and not neg_sampling:
+        set_ranking_labels(train_data)
+    for warm_start in (False, True):
+        new_model = SVDpp(
+            task,
+            new_data_info,
+            embed_size=4,
+            n_epochs=1,
+            recent_num=10,
+            backend="cython",
+        )
+        if warm_start:
+            new_model.warm_start_from(model)
+        else:
+            new_model.rebuild_model(SAVE_PATH, "svdpp_model")
+        for param_name, param in model.sgd_params.items():
+            np.testing.assert_array_equal(
+                new_model.sgd_params[param_name][: len(param)], param
+            )
+        new_model.fit(train_data, neg_sampling, verbose=0)
+
+
+def test_svdpp_cython_update():
+    from scipy.sparse import csr_matrix
+
+    from libreco.algorithms._svd import svd_update
+
+    np_rng = np.random.default_rng(42)
+    n_users, n_items, embed_size, lr, reg = 20, 30, 4, 0.01, 0.1
+    mask = np_rng.random((n_users, n_items)) < 0.2
+    ratings = np.where(mask, np_rng.integers(1, 6, mask.shape), 0)
+    interaction = csr_matrix(ratings, dtype=np.float32)
+    implicit = csr_matrix(mask, dtype=np.float32)
+    params = {
+        "user_bias": np.zeros(n_users, dtype=np.float32),
+        "item_bias": np.zeros(n_items, dtype=np.float32),
+        "user_factors": np_rng.normal(0, 0.1, (n_users, embed_size)),
+        "item_factors": np_rng.normal(0, 0.1, (n_items, embed_size)),
+        "implicit_factors": np_rng.normal(0, 0.1, (n_items, embed_size)),
+    }
+    params = {k: v.astype(np.float32) for k, v in params.items()}
+    bu, bi, pu, qi, yj = (v.astype(np.float64) for v in params.values())
+
+    svd_update(
+        sparse_interaction=interaction,
+        user_order=np.arange(n_users),
+        lr=lr,
+        reg=reg,
+        task="rating",
+        num_neg=0,
+        num_threads=1,
+        seed=42,
+        implicit_interaction=implicit,
+        **params,
+    )
+
+    # plain SVD++ SGD, which updates every y_j of the user after each rating
+    for u in range(n_users):
+        items = implicit.indices[implicit.indptr[u] : implicit.indptr[u + 1]]
+        norm = 1.0 / np.sqrt(len(items))
+        start, end = interaction.indptr[u], interaction.indptr[u + 1]
+        for i, r in zip(interaction.indices[start:end], interaction.data[start:end]):
+            puj = pu[u] + norm * yj[items].sum(axis=0)
+            err = r - (bu[u] + bi[i] + puj @ qi[i])
+            p, q = pu[u].copy(), qi[i].copy()
+            bu[u] += lr * (err - reg * bu[u])
+            bi[i] += lr * (err - reg * bi[i])
+            pu[u] += lr * (err * q - reg * p)
+            qi[i] += lr * (err * puj - reg * q)
+            yj[items] += lr * (err * norm * q - reg * yj[items])
+
+    for name, expected in zip(params, (bu, bi, pu, qi, yj)):
+        np.testing.assert_allclose(params[name], expected, atol=1e-5)
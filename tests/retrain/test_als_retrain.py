@@ -1,6 +1,9 @@
+import copy
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pytest
 import tensorflow as tf
 
 from libreco.algorithms import ALS
@@ -174,3 +177,100 @@ def test_als_retrain():
     ptest_recommends(new_model, new_data_info, third_data, with_feats=False)
 
     remove_path(SAVE_PATH)
+
+
+@pytest.mark.parametrize("update_neighbors", [False, True])
+def test_als_incremental_retrain(update_neighbors):
+    data_path = Path(__file__).parents[1] / "sample_data" / "sample_movielens_rating.dat"  # fmt: skip
+    all_data = pd.read_csv(
+        data_path, sep="::", names=["user", "item", "label", "time"], engine="python"
+    )
+    first_half_data = all_data[: (len(all_data) // 2)]
+    train_data, data_info = DatasetPure.build_trainset(first_half_data)
+    model = ALS("ranking", data_info, embed_size=16, n_epochs=2, reg=5.0, seed=42)
+    model.fit(train_data, neg_sampling=True, verbose=0)
+    data_info.save(path=SAVE_PATH, model_name="als_model")
+    model.save(path=SAVE_PATH, model_name="als_model")
+
+    new_data_info = DataInfo.load(SAVE_PATH, model_name="als_model")
+    second_data = all_data[(len(all_data) // 2) : (len(all_data) * 3 // 5)]
+    train_data, new_data_info = DatasetPure.merge_trainset(
+        second_data, new_data_info, merge_behavior=True
+    )
+    new_model = ALS("ranking", new_data_info, embed_size=16, n_epochs=2, reg=5.0)
+    new_model.rebuild_model(path=SAVE_PATH, model_name="als_model")
+    new_model.fit(
+        train_data,
+        neg_sampling=True,
+        verbose=0,
+        incremental=True,
+        update_neighbors=update_neighbors,
+    )
+    ptest_preds(new_model, "ranking", second_data, with_feats=False)
+    ptest_recommends(new_model, new_data_info, second_data, with_feats=False)
+
+    n_old_users = data_info.n_users
+    dirty_users = np.unique(train_data.user_indices)
+    if update_neighbors:
+        dirty_items = np.unique(train_data.item_indices)
+        neighbors = [u for i in dirty_items for u in new_data_info.item_consumed[i]]
+        dirty_users = np.union1d(dirty_users, neighbors)
+    clean_users = np.setdiff1d(np.arange(n_old_users), dirty_users)
+    assert len(clean_users) > 0
+    np.testing.assert_array_equal(
+        new_model.user_embeds_np[clean_users], model.user_embeds_np[clean_users]
+    )
+    old_dirty_users = dirty_users[dirty_users < n_old_users]
+    assert not np.allclose(
+        new_model.user_embeds_np[old_dirty_users],
+        model.user_embeds_np[old_dirty_users],
+    )
+
+    rating_model = ALS("rating", new_data_info, embed_size=16, n_epochs=1, reg=5.0)
+    rating_model.rebuild_model(path=SAVE_PATH, model_name="als_model")
+    with pytest.raises(ValueError):
+        rating_model.fit(
+            train_data, neg_sampling=False, incremental=True, update_neighbors=True
+        )
+    remove_path(SAVE_PATH)
+
+
+def test_als_incremental_full_history():
+    data_path = Path(__file__).parents[1] / "sample_data" / "sample_movielens_rating.dat"  # fmt: skip
+    all_data = pd.read_csv(
+        data_path, sep="::", names=["user", "item", "label", "time"], engine="python"
+    )
+    first_half_data = all_data[: (len(all_data) // 2)]
+    train_data, data_info = DatasetPure.build_trainset(first_half_data)
+    model = ALS("ranking", data_info, embed_size=16, n_epochs=2, reg=5.0, use_cg=False)
+    model.fit(train_data, neg_sampling=True, verbose=0)
+    data_info.save(path=SAVE_PATH, model_name="als_model")
+    model.save(path=SAVE_PATH, model_name="als_model")
+
+    # an active user with one new interaction
+    user = first_half_data.user.value_counts().index[0]
+    old_items = first_half_data.item[first_half_data.user == user].unique()
+    new_item = np.setdiff1d(first_half_data.item.unique(), old_items)[0]
+    new_data = pd.DataFrame({"user": [user], "item": [new_item], "label": [1.0]})
+    new_data_info = DataInfo.load(SAVE_PATH, model_name="als_model")
+    train_data, new_data_info = DatasetPure.merge_trainset(
+        new_data, new_data_info, merge_behavior=True
+    )
+    new_model = ALS(
+        "ranking", new_data_info, embed_size=16, n_epochs=1, reg=5.0, use_cg=False
+    )
+    new_model.rebuild_model(path=SAVE_PATH, model_name="als_model")
+    full_model, new_only_model = copy.deepcopy(new_model), copy.deepcopy(new_model)
+    new_model.fit(train_data, neg_sampling=True, verbose=0, incremental=True)
+
+    # users are solved first, so item embeddings are the same as the rebuilt model
+    full_model.fold_in_users([user], [[*old_items, new_item]])
+    new_only_model.fold_in_users([user], [[new_item]])
+    u = new_data_info.user2id[user]
+    np.testing.assert_allclose(
+        new_model.user_embeds_np[u], full_model.user_embeds_np[u], atol=1e-3
+    )
+    assert not np.allclose(
+        new_model.user_embeds_np[u], new_only_model.user_embeds_np[u], atol=1e-3
+    )
+    remove_path(SAVE_PATH)
@@ -26,7 +26,47 @@ def test_gensim_model_retrain_pure():
     retrain("deepwalk", train_data, eval_data, data_info, all_data)
 
 
-def retrain(model_name, train_data, eval_data, data_info, all_data):
+def test_gensim_model_retrain_corpus_file(tmp_path):
+    data_path = (
+        Path(__file__).parents[1].joinpath("sample_data", "sample_movielens_rating.dat")
+    )
+    all_data = pd.read_csv(
+        data_path, sep="::", names=["user", "item", "label", "time"], engine="python"
+    )
+    first_half_data = all_data[: (len(all_data) // 2)]
+    train_data, eval_data = split_by_ratio_chrono(first_half_data, test_size=0.2)
+    train_data, data_info = DatasetPure.build_trainset(train_data)
+    eval_data = DatasetPure.build_evalset(eval_data)
+    for model_name in ("item2vec", "deepwalk"):
+        _, new_model = retrain(
+            model_name,
+            train_data,
+            eval_data,
+            data_info,
+            all_data,
+            str(tmp_path),
+            merge_behavior=True,
+        )
+        # the new corpus is written from the merged data only once
+        with open(new_model.data) as f:
+            lines = f.read().splitlines()
+        if model_name == "item2vec":
+            consumed = new_model.user_consumed.values()
+            assert len(lines) == sum(len(items) > 0 for items in consumed)
+            assert sum(len(line.split()) for line in lines) == sum(map(len, consumed))
+        else:
+            assert len(lines) == new_model.n_walks * new_model.n_items
+
+
+def retrain(
+    model_name,
+    train_data,
+    eval_data,
+    data_info,
+    all_data,
+    corpus_dir=None,
+    merge_behavior=False,
+):
     if model_name == "item2vec":
         model = Item2Vec(
             "ranking",
@@ -36,6 +76,7 @@ def retrain(model_name, train_data, eval_data, data_info, all_data):
             window_size=5,
             n_epochs=2,
             n_threads=0,
+            corpus_dir=corpus_dir,
         )
     else:
         model = DeepWalk(
@@ -47,6 +88,7 @@ def retrain(model_name, train_data, eval_data, data_info, all_data):
             walk_length=3,
             window_size=5,
             n_epochs=2,
+            corpus_dir=corpus_dir,
         )
 
     model.fit(
@@ -88,7 +130,7 @@ def retrain(model_name, train_data, eval_data, data_info, all_data):
         second_half_data, test_size=0.2
     )
     train_data, new_data_info = DatasetPure.merge_trainset(
-        train_data_orig, new_data_info, merge_behavior=False
+        train_data_orig, new_data_info, merge_behavior=merge_behavior
     )
     eval_data = DatasetPure.merge_evalset(eval_data_orig, new_data_info)
 
@@ -101,6 +143,7 @@ def retrain(model_name, train_data, eval_data, data_info, all_data):
             window_size=5,
             n_epochs=2,
             n_threads=0,
+            corpus_dir=corpus_dir,
         )
     else:
         new_model = DeepWalk(
@@ -112,6 +155,7 @@ def retrain(model_name, train_data, eval_data, data_info, all_data):
             walk_length=3,
             window_size=5,
             n_epochs=2,
+            corpus_dir=corpus_dir,
         )
 
     new_model.rebuild_model(path=SAVE_PATH, model_name=model_name)
@@ -148,3 +192,4 @@ def retrain(model_name, train_data, eval_data, data_info, all_data):
     assert new_eval_result["roc_auc"] != eval_result["roc_auc"]
 
     remove_path(SAVE_PATH)
+    return model, new_model
@@ -1,10 +1,11 @@
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 import tensorflow as tf
 
-from libreco.algorithms import DIN
+from libreco.algorithms import DIN, DeepFM, YouTubeRanking
 from libreco.data import DataInfo, DatasetFeat, split_by_ratio_chrono
 from libreco.evaluation import evaluate
 from tests.utils_data import SAVE_PATH, remove_path
@@ -215,3 +216,120 @@ def test_tfmodel_retrain_feat():
     ptest_recommends(new_model, new_data_info, third_half_data, with_feats=False)
 
     remove_path(SAVE_PATH)
+
+
+@pytest.mark.parametrize("model_cls", [DeepFM, DIN, YouTubeRanking])
+def test_tfmodel_retrain_compressed(model_cls):
+    tf.compat.v1.reset_default_graph()
+    data_path = Path(__file__).parents[1] / "sample_data" / "sample_movielens_merged.csv"  # fmt: skip
+    all_data = pd.read_csv(data_path, sep=",", header=0)
+    first_half_data = all_data[: (len(all_data) // 2)]
+    train_data, eval_data = split_by_ratio_chrono(first_half_data, test_size=0.2)
+    train_data, data_info = DatasetFeat.build_trainset(
+        train_data,
+        user_col=["sex", "age", "occupation"],
+        item_col=["genre1", "genre2", "genre3"],
+        sparse_col=["sex", "occupation"],
+        dense_col=["age"],
+        multi_sparse_col=[["genre1", "genre2", "genre3"]],
+        pad_val=["missing"],
+    )
+    eval_data = DatasetFeat.build_evalset(eval_data)
+    embed_compression = {
+        "user": {"method": "hash", "num_buckets": 64, "num_hashes": 2},
+        "item": {"method": "qr", "num_buckets": 16},
+        "occupation": {"method": "hash", "num_buckets": 4},
+        "genre2": {"method": "qr", "num_buckets": 4},
+    }
+    model_kwargs = dict(embed_size=8, n_epochs=1, batch_size=2048)
+    if model_cls is not DeepFM:
+        model_kwargs["recent_num"] = 10
+
+    with pytest.raises(ValueError, match="unknown column"):
+        _ = model_cls("ranking", data_info, embed_compression={"city": {}})
+    with pytest.raises(ValueError):
+        _ = model_cls("ranking", data_info, embed_compression={"user": {"method": "qr"}})  # fmt: skip
+
+    model = model_cls(
+        "ranking", data_info, embed_compression=embed_compression, **model_kwargs
+    )
+    model.fit(train_data, neg_sampling=True, verbose=2, eval_data=eval_data)
+    user_var = tf.compat.v1.trainable_variables("embedding/user_embeds_var")[0]
+    assert user_var.get_shape().as_list() == [64, 8]
+    item_table = model.compressed_tables["item"]
+    assert item_table.n_rows == 16 + -(-(data_info.n_items + 1) // 16)
+    old_item_var = model.sess.run(tf.compat.v1.trainable_variables("embedding/item_embeds_var"))[0]  # fmt: skip
+    data_info.save(path=SAVE_PATH, model_name="compressed_model")
+    model.save(SAVE_PATH, "compressed_model", manual=True, inference_only=False)
+
+    tf.compat.v1.reset_default_graph()
+    new_data_info = DataInfo.load(SAVE_PATH, model_name="compressed_model")
+    second_half_data = all_data[(len(all_data) // 2) :]
+    train_data_orig, eval_data_orig = split_by_ratio_chrono(
+        second_half_data, test_size=0.2
+    )
+    train_data, new_data_info = DatasetFeat.merge_trainset(
+        train_data_orig, new_data_info, merge_behavior=True
+    )
+    eval_data = DatasetFeat.merge_evalset(eval_data_orig, new_data_info)
+    new_model = model_cls(
+        "ranking", new_data_info, embed_compression=embed_compression, **model_kwargs
+    )
+    new_model.rebuild_model(SAVE_PATH, "compressed_model", full_assign=True)
+    # old rows are copied before the new quotient rows
+    new_item_var = new_model.sess.run(
+        tf.compat.v1.trainable_variables("embedding/item_embeds_var")
+    )[0]
+    assert new_item_var.shape[0] >= old_item_var.shape[0]
+    np.testing.assert_array_equal(new_item_var[: len(old_item_var)], old_item_var)
+
+    new_model.fit(train_data, neg_sampling=True, verbose=2, eval_data=eval_data)
+    ptest_preds(new_model, "ranking", second_half_data, with_feats=True)
+    ptest_recommends(new_model, new_data_info, second_half_data, with_feats=True)
+    remove_path(SAVE_PATH)
+
+
+def test_tfmodel_warm_start():
+    tf.compat.v1.reset_default_graph()
+    data_path = Path(__file__).parents[1] / "sample_data" / "sample_movielens_merged.csv"  # fmt: skip
+    all_data = pd.read_csv(data_path, sep=",", header=0)
+    first_half_data = all_data[: (len(all_data) // 2)]
+    train_data, data_info = DatasetFeat.build_trainset(
+        first_half_data,
+        user_col=["sex", "age", "occupation"],
+        item_col=["genre1", "genre2", "genre3"],
+        sparse_col=["sex", "occupation"],
+        dense_col=["age"],
+        multi_sparse_col=[["genre1", "genre2", "genre3"]],
+        pad_val=["missing"],
+    )
+    model_kwargs = dict(embed_size=8, n_epochs=1, batch_size=2048)
+    model = DeepFM("ranking", data_info, **model_kwargs)
+    model.fit(train_data, neg_sampling=True, verbose=0)
+    var_names = ["embedding/user_embeds_var", "embedding/user_embeds_var/Adam"]
+    old_vars = model.sess.run(
+        [tf.compat.v1.global_variables(name)[0] for name in var_names]
+    )
+
+    second_half_data = all_data[(len(all_data) // 2) :]
+    train_data, new_data_info = DatasetFeat.merge_trainset(
+        second_half_data, data_info, merge_behavior=True
+    )
+    with pytest.raises(ValueError, match="new graph"):
+        DeepFM("ranking", new_data_info, **model_kwargs).warm_start_from(model)
+
+    tf.compat.v1.reset_default_graph()
+    new_model = DeepFM("ranking", new_data_info, **model_kwargs)
+    new_model.warm_start_from(model, full_assign=True)
+    new_vars = new_model.sess.run(
+        [tf.compat.v1.global_variables(name)[0] for name in var_names]
+    )
+    for old_var, new_var in zip(old_vars, new_vars):
+        assert len(new_var) == new_data_info.n_users + 1
+        np.testing.assert_array_equal(
+            new_var[: data_info.n_users], old_var[: data_info.n_users]
+        )
+
+    new_model.fit(train_data, neg_sampling=True, verbose=0)
+    ptest_preds(new_model, "ranking", second_half_data, with_feats=True)
+    ptest_recommends(new_model, new_data_info, second_half_data, with_feats=True)
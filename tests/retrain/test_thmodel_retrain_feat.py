@@ -1,7 +1,9 @@
 from pathlib import Path
 
 import pandas as pd
+import pytest
 import tensorflow as tf
+import torch
 
 from libreco.algorithms import GraphSage
 from libreco.data import DataInfo, DatasetFeat, split_by_ratio_chrono
@@ -238,3 +240,49 @@ def test_torchmodel_retrain_feat():
     ptest_recommends(new_model, new_data_info, third_half_data, with_feats=False)
 
     remove_path(SAVE_PATH)
+
+
+def test_torchmodel_warm_start():
+    data_path = Path(__file__).parents[1] / "sample_data" / "sample_movielens_merged.csv"  # fmt: skip
+    all_data = pd.read_csv(data_path, sep=",", header=0)
+    first_half_data = all_data[: (len(all_data) // 2)]
+    train_data, data_info = DatasetFeat.build_trainset(
+        first_half_data,
+        user_col=["sex", "age", "occupation"],
+        item_col=["genre1", "genre2", "genre3"],
+        sparse_col=["sex", "occupation", "genre1", "genre2", "genre3"],
+        dense_col=["age"],
+    )
+    model_kwargs = dict(
+        loss_type="max_margin", embed_size=16, n_epochs=1, batch_size=2048, seed=42
+    )
+    model = GraphSage("ranking", data_info, **model_kwargs)
+    model.fit(train_data, neg_sampling=True, verbose=0)
+    old_item_embeds = model.torch_model.item_embeds.weight.detach().clone()
+
+    second_half_data = all_data[(len(all_data) // 2) :]
+    train_data, new_data_info = DatasetFeat.merge_trainset(
+        second_half_data, data_info, merge_behavior=True
+    )
+    new_model = GraphSage("ranking", new_data_info, **model_kwargs)
+    with pytest.raises(ValueError, match="merged one"):
+        GraphSage("ranking", data_info, **model_kwargs).warm_start_from(model)
+
+    new_model.warm_start_from(model)
+    new_item_embeds = new_model.torch_model.item_embeds.weight.detach()
+    assert len(new_item_embeds) > len(old_item_embeds)
+    torch.testing.assert_close(
+        new_item_embeds[: data_info.n_items], old_item_embeds[: data_info.n_items]
+    )
+    # optimizer states of the new model don't share memory with the old model
+    old_states = model.trainer.optimizer.state_dict()["state"]
+    new_states = new_model.trainer.optimizer.state_dict()["state"]
+    for i, state in new_states.items():
+        assert state["exp_avg"].data_ptr() != old_states[i]["exp_avg"].data_ptr()
+
+    new_model.fit(train_data, neg_sampling=True, verbose=0)
+    torch.testing.assert_close(
+        model.torch_model.item_embeds.weight.detach(), old_item_embeds
+    )
+    ptest_preds(new_model, "ranking", second_half_data, with_feats=False)
+    ptest_recommends(new_model, new_data_info, second_half_data, with_feats=False)
@@ -1,4 +1,6 @@
+import os
 from io import StringIO
+from multiprocessing.reduction import ForkingPickler
 
 import numpy as np
 import pandas as pd
@@ -6,7 +8,7 @@ import pytest
 import torch
 
 from libreco.algorithms import DIN, LightGCN, PinSageDGL, RNN4Rec
-from libreco.batch.batch_data import BatchData
+from libreco.batch.batch_data import BatchData, BlockBatchSampler, get_batch_loader
 from libreco.batch.batch_unit import (
     PairFeats,
     PairwiseBatch,
@@ -23,10 +25,33 @@ from libreco.batch.collators import (
     SparseCollator,
 )
 from libreco.batch.enums import Backend
+from libreco.batch.shared import SharedArrays
+from libreco.batch.sequence import (
+    build_seq_history,
+    get_dual_seqs,
+    get_interacted_seqs,
+    get_sparse_interacted,
+)
 from libreco.data import DatasetFeat
 from libreco.graph.message import ItemMessageDGL, UserMessage
-from libreco.sampling.negatives import negatives_from_unconsumed
+from libreco.sampling import AliasSampler
+from libreco.sampling.negatives import (
+    build_consumed_csr,
+    item_frequency,
+    neg_probs_from_frequency,
+    negatives_from_unconsumed,
+    negatives_from_unconsumed_csr,
+)
+from libreco.sampling.random_walks import (
+    bipartite_neighbors,
+    bipartite_neighbors_with_weights,
+    build_bipartite_graph,
+    build_transition_csr,
+    item_random_walks,
+    pairs_from_random_walk,
+)
 from libreco.tfops import tf
+from libreco.utils.sparse import build_sorted_csr, csr_contains
 
 raw_data = """
 user,item,label,time,sex,age,occupation,genre1,genre2,genre3
@@ -395,6 +420,14 @@ def test_graph_dgl_collator(config_feat_data):
     item_data, *_ = collator(original_data)
     assert isinstance(item_data, ItemMessageDGL)
 
+    # workers started with `spawn` receive a pickled collator
+    collator.share_memory(SharedArrays())
+    worker_collator = ForkingPickler.loads(ForkingPickler.dumps(collator))
+    assert worker_collator.dgl is collator.dgl
+    item_data, *_ = worker_collator(original_data)
+    assert isinstance(item_data, ItemMessageDGL)
+    assert torch.all(item_data.items < data_info.n_items)
+
 
 def test_negatives_exceed_sampling_tolerance():
     users = [0, 1, 2]
@@ -412,3 +445,339 @@ def test_negatives_exceed_sampling_tolerance():
     assert 1 not in negatives[0][:4]
     assert 2 not in negatives[1][:4]
     assert 4 not in negatives[2][:4]
+
+
+def test_negatives_from_unconsumed_csr():
+    np_rng = np.random.default_rng(42)
+    users = np_rng.integers(0, 100, 2000)
+    items = np_rng.integers(0, 300, 2000)
+    indptr, indices = build_sorted_csr(users, items, 100, 300)
+    consumed = set(zip(users.tolist(), items.tolist()))
+    query_items = np_rng.integers(0, 300, (2000, 3))
+    mask = csr_contains(
+        indptr, indices, np.repeat(users, 3).reshape(-1, 3), query_items
+    )
+    expected = [
+        [(u, i) in consumed for i in row] for u, row in zip(users, query_items.tolist())
+    ]
+    np.testing.assert_array_equal(mask, expected)
+
+    negatives = negatives_from_unconsumed_csr(
+        np_rng, indptr, indices, users, items, 300, num_neg=3
+    ).reshape(-1, 3)
+    assert negatives.shape == (2000, 3)
+    for u, i, negs in zip(users.tolist(), items.tolist(), negatives.tolist()):
+        assert len(set(negs)) == 3
+        assert i not in negs
+        assert all((u, n) not in consumed for n in negs)
+
+
+def test_build_consumed_csr():
+    user_consumed = {0: [3, 1, 3], 1: [], 2: [0, 2, 1]}
+    indptr, indices = build_consumed_csr(user_consumed, 3, 4)
+    np.testing.assert_array_equal(indptr, [0, 2, 2, 5])
+    np.testing.assert_array_equal(indices, [1, 3, 0, 1, 2])
+
+
+def test_bipartite_random_walks():
+    np_rng = np.random.default_rng(42)
+    # item 3 only reaches itself, item 4 has no user
+    user_consumed = {0: [0, 1, 1], 1: [1, 2], 2: [3]}
+    item_consumed = {0: [0], 1: [0, 0, 1], 2: [1], 3: [2]}
+    graph = build_bipartite_graph(user_consumed, item_consumed, 3, 5)
+    np.testing.assert_array_equal(graph.user_indptr, [0, 3, 5, 6])
+    np.testing.assert_array_equal(graph.item_indptr, [0, 1, 4, 5, 6, 6])
+    np.testing.assert_array_equal(graph.has_neighbor, [True, True, True, False, False])
+    edges = {(i, j) for items in user_consumed.values() for i in items for j in items}
+
+    src, dst = pairs_from_random_walk(np_rng, graph, [0, 3, 2], 5, 3, False)
+    assert (3, 3) in set(zip(src.tolist(), dst.tolist()))
+    assert all((i, j) in edges for i, j in zip(src.tolist(), dst.tolist()) if i != 3)
+
+    nodes = np.array([0, 1, 3, 4])
+    neighbors, offsets = bipartite_neighbors(np_rng, graph, nodes, 2)
+    np.testing.assert_array_equal(offsets, [0, 2, 4, 6])
+    neighbors = neighbors.reshape(4, 2)
+    assert set(neighbors[0]) == {1} and set(neighbors[1]) == {0, 2}
+    np.testing.assert_array_equal(neighbors[2:], [[3, 3], [4, 4]])
+
+    neighbors, weights, offsets, _ = bipartite_neighbors_with_weights(
+        np_rng, graph, nodes, 3, 10, 3
+    )
+    splits = np.split(np.arange(len(neighbors)), offsets[1:])
+    assert [set(neighbors[s]) for s in splits] == [{1}, {0, 2}, {3}, {4}]
+    assert all(np.isclose(weights[s].sum(), 1.0) for s in splits)
+
+    # positive item is removed unless it is the only neighbor
+    items, items_pos = np.array([0, 2]), np.array([1, 0])
+    neighbors, weights, offsets, original_indices = bipartite_neighbors_with_weights(
+        np_rng, graph, [0, 1, 2], 3, 50, 1, items, [0, 0, 1], items_pos
+    )
+    splits = np.split(np.arange(len(neighbors)), offsets[1:])
+    assert [set(neighbors[s]) for s in splits] == [{1}, {0, 2}, {1}]
+    np.testing.assert_array_equal(original_indices, [0, 0, 0, 1])
+
+
+def test_item_random_walks():
+    np_rng = np.random.default_rng(42)
+    user_consumed = {0: [0, 1, 2], 1: [], 2: [1, 0, 1, 3]}
+    indptr, indices = build_transition_csr(user_consumed, 3, 5)
+    np.testing.assert_array_equal(indptr, [0, 2, 5, 5, 5, 5])
+    np.testing.assert_array_equal(indices, [1, 1, 2, 0, 3])
+
+    walks = item_random_walks(np_rng, indptr, indices, [0, 1, 3, 4], 5)
+    assert walks.dtype == np.int32 and walks.shape == (4, 5)
+    np.testing.assert_array_equal(walks[2:], [[3, -1, -1, -1, -1], [4, -1, -1, -1, -1]])
+    edges = {(0, 1), (1, 2), (1, 0), (1, 3)}
+    for walk in walks[:2].tolist():
+        walk = [i for i in walk if i >= 0]
+        assert all(pair in edges for pair in zip(walk, walk[1:]))
+        # a walk only stops at items without next items
+        assert len(walk) == 5 or walk[-1] in (2, 3)
+
+
+@pytest.mark.parametrize("n", [1, 7, 100])
+def test_alias_sampler(n):
+    np_rng = np.random.default_rng(42)
+    for weights in (
+        np_rng.random(n) ** 3,
+        np.ones(n),
+        np.eye(n)[n // 2],
+        np.where(np_rng.random(n) < 0.3, 0.0, np_rng.random(n)),
+    ):
+        if weights.sum() == 0:
+            weights[0] = 1.0
+        sampler = AliasSampler(weights)
+        # probability mass implied by the alias table must match the weights exactly
+        mass = sampler.prob / n
+        np.add.at(mass, sampler.alias, (1 - sampler.prob) / n)
+        np.testing.assert_allclose(mass, weights / weights.sum(), atol=1e-12)
+
+        samples = sampler.sample(np_rng, 20000)
+        assert samples.shape == (20000,)
+        assert np.all(weights[samples] > 0)
+
+    with pytest.raises(AssertionError):
+        AliasSampler(np.zeros(3))
+
+
+def test_item_frequency():
+    item_consumed = {0: [1, 2, 1], 1: [], 2: [0], 3: [3, 3, 3]}
+    np.testing.assert_array_equal(item_frequency(item_consumed, 4), [2, 0, 1, 1])
+    probs = neg_probs_from_frequency(item_consumed, 4, temperature=0.75)
+    expected = np.array([2, 0, 1, 1]) ** 0.75
+    np.testing.assert_allclose(probs, expected / expected.sum())
+
+
+def test_seq_history_gather():
+    np_rng = np.random.default_rng(42)
+    n_users, n_items = 20, 30
+    user_consumed = {
+        u: np_rng.integers(0, n_items, np_rng.integers(1, 40)).tolist()
+        for u in range(n_users)
+    }
+    seq_history = build_seq_history(user_consumed, n_users)
+    users = np_rng.integers(0, n_users, 200)
+    items = np.array([np_rng.choice(user_consumed[u]) for u in users])
+    positions = seq_history.get_positions(users, items)
+    expected_positions = [user_consumed[u].index(i) for u, i in zip(users, items)]
+    np.testing.assert_array_equal(positions, expected_positions)
+    assert positions.dtype == np.int32
+    assert np.all(seq_history.get_positions([0, 1], [n_items, n_items + 1]) == -1)
+
+    max_len = 5
+    seqs, seq_lens = get_interacted_seqs(
+        users, items, seq_history, n_items, "recent", max_len, np_rng
+    )
+    indices, values, _ = get_sparse_interacted(
+        users, items, seq_history, "recent", max_len, np_rng
+    )
+    long_seqs, long_lens, short_seqs, short_lens = get_dual_seqs(
+        users, items, seq_history, n_items, 4, 3, positions
+    )
+    values_start = 0
+    for j, (u, p) in enumerate(zip(users, expected_positions)):
+        recent = user_consumed[u][max(0, p - max_len) : p]
+        assert seq_lens[j] == max(1, len(recent))
+        assert seqs[j, : len(recent)].tolist() == recent
+        assert np.all(seqs[j, len(recent) :] == n_items)
+        assert values[values_start : values_start + len(recent)].tolist() == recent
+        assert np.all(indices[values_start : values_start + len(recent), 0] == j)
+        values_start += len(recent)
+
+        short = user_consumed[u][max(0, p - 3) : p]
+        long = user_consumed[u][max(0, p - 7) : max(0, p - 3)]
+        assert short_seqs[j, : len(short)].tolist() == short
+        assert long_seqs[j, : len(long)].tolist() == long
+        assert short_lens[j] == max(1, len(short))
+        assert long_lens[j] == max(1, len(long))
+    assert values_start == len(values)
+
+
+@pytest.mark.parametrize(
+    "config_feat_data",
+    [
+        {
+            "sparse_col": ["sex", "genre1"],
+            "dense_col": ["age", "item_dense_col"],
+            "user_col": ["sex", "age"],
+            "item_col": ["genre1", "item_dense_col"],
+        },
+    ],
+    indirect=True,
+)
+def test_shared_collator_state(config_feat_data):
+    train_data, data_info = config_feat_data
+    model = DIN("ranking", data_info, "cross_entropy", sampler="popular", num_neg=2)
+    collator = PointwiseCollator(model, data_info, Backend.TF)
+    collator._set_consumed_csr()
+    batch_data = BatchData(train_data, use_features=True)
+    shared_arrays = SharedArrays()
+    batch_data.share_memory(shared_arrays)
+    collator.share_memory(shared_arrays)
+    assert isinstance(collator.consumed_indices, np.memmap)
+    assert isinstance(collator.seq_history.items, np.memmap)
+    assert isinstance(collator.neg_sampler.prob, np.memmap)
+    assert not collator.item_sparse_unique.flags.writeable
+    np.testing.assert_array_equal(
+        collator.item_sparse_unique, data_info.item_sparse_unique
+    )
+
+    # workers receive file paths instead of the array contents
+    payload = ForkingPickler.dumps((batch_data, collator))
+    assert len(payload) < shared_arrays.nbytes
+    worker_data, worker_collator = ForkingPickler.loads(payload)
+    assert worker_collator.shared_arrays is None
+    assert worker_collator.user_consumed is None
+    assert isinstance(worker_collator.seq_history.sorted_items, np.memmap)
+    np.testing.assert_array_equal(worker_data.labels, train_data.labels)
+    np.testing.assert_array_equal(
+        worker_collator.consumed_indptr, collator.consumed_indptr
+    )
+    original_batch = collator(batch_data[[11, 7, 2]])
+    worker_batch = worker_collator(worker_data[[11, 7, 2]])
+    np.testing.assert_array_equal(worker_batch.items, original_batch.items)
+    np.testing.assert_array_equal(
+        worker_batch.seqs.interacted_seq, original_batch.seqs.interacted_seq
+    )
+    tf.reset_default_graph()
+
+    shared_dir = shared_arrays.dir
+    del batch_data, collator, worker_collator, shared_arrays
+    assert not os.path.exists(shared_dir)
+
+
+def test_shared_arrays_fallback(monkeypatch, tmp_path):
+    shared_arrays = SharedArrays()
+    array = np.arange(100)
+    shared = shared_arrays.share("a", array)
+    assert shared_arrays.share("a", shared) is shared
+    # only the attached arrays are pickled as paths
+    assert len(ForkingPickler.dumps(shared)) < array.nbytes
+    np.testing.assert_array_equal(ForkingPickler.loads(ForkingPickler.dumps(shared[5:])), array[5:])  # fmt: skip
+    assert type(shared[[1, 2]]) is np.ndarray
+    memmap = np.memmap(tmp_path / "memmap.dat", np.int64, mode="w+", shape=(100,))
+    assert len(ForkingPickler.dumps(memmap)) > memmap.nbytes
+
+    def no_space(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(np, "save", no_space)
+    assert shared_arrays.share("b", array) is array
+    assert os.listdir(shared_arrays.dir) == ["a.npy"]
+
+
+@pytest.mark.parametrize(
+    "config_feat_data",
+    [
+        {
+            "sparse_col": ["sex", "genre1"],
+            "dense_col": ["age"],
+            "user_col": ["sex", "age"],
+            "item_col": ["genre1"],
+        }
+    ],
+    indirect=True,
+)
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_shared_loader_start_method(monkeypatch, config_feat_data, start_method):
+    train_data, data_info = config_feat_data
+    model = DIN("ranking", data_info, "cross_entropy", sampler="popular", num_neg=1)
+    monkeypatch.setattr(torch.multiprocessing, "get_start_method", lambda: start_method)
+    loader = get_batch_loader(model, train_data, True, 4, True, 1, 42)
+    if start_method == "fork":
+        assert loader.collate_fn.shared_arrays is None
+        assert not isinstance(loader.dataset.labels, np.memmap)
+    else:
+        assert loader.collate_fn.shared_arrays is not None
+        assert isinstance(loader.dataset.labels, np.memmap)
+    tf.reset_default_graph()
+
+
+@pytest.mark.parametrize("n_rows, batch_size", [(10, 3), (12, 4), (5, 8), (1000, 64)])
+def test_block_batch_sampler(n_rows, batch_size):
+    sampler = BlockBatchSampler(n_rows, batch_size)
+    rows = np.arange(n_rows)
+    batches = [rows[idx] for idx in sampler]
+    assert len(batches) == len(sampler) == -(-n_rows // batch_size)
+    assert all(isinstance(idx, slice) for idx in sampler)
+    assert all(len(b) <= batch_size for b in batches)
+    np.testing.assert_array_equal(np.concatenate(batches), rows)
+
+
+@pytest.mark.parametrize(
+    "config_feat_data",
+    [
+        {
+            "sparse_col": ["sex", "genre1"],
+            "dense_col": ["age"],
+            "user_col": ["sex", "age"],
+            "item_col": ["genre1"],
+        }
+    ],
+    indirect=True,
+)
+def test_block_shuffle_loader(monkeypatch, config_feat_data):
+    train_data, data_info = config_feat_data
+    model = DIN("ranking", data_info, "cross_entropy", sampler="random", num_neg=1)
+    loader = get_batch_loader(model, train_data, True, 4, "block", 0, 42)
+    epoch_users = []
+    for _ in range(2):
+        users, items, labels = [], [], []
+        for batch in loader:
+            labels.append(batch.labels[::2])
+            users.append(batch.users[::2])
+            items.append(batch.items[::2])
+        assert len(labels) == 4
+        assert np.all(np.concatenate(labels) == 1.0)
+        pairs = sorted(zip(np.concatenate(users), np.concatenate(items)))
+        assert pairs == sorted(zip(train_data.user_indices, train_data.item_indices))
+        epoch_users.append(np.concatenate(users))
+    # rows are reshuffled in every epoch
+    assert not np.array_equal(epoch_users[0], epoch_users[1])
+    # positions follow the permuted rows
+    batch_data = loader.dataset
+    np.testing.assert_array_equal(
+        batch_data.seq_positions,
+        loader.collate_fn.seq_history.get_positions(
+            batch_data.user_indices, batch_data.item_indices
+        ),
+    )
+
+    # reshuffled rows replace the shared files for spawned workers
+    monkeypatch.setattr(torch.multiprocessing, "get_start_method", lambda: "spawn")
+    loader = get_batch_loader(model, train_data, True, 4, "block", 1, 42)
+    batch_data = loader.dataset
+    for _ in range(2):
+        batch_data.permute(torch.randperm(len(batch_data.labels)).numpy())
+        assert isinstance(batch_data.user_indices, np.memmap)
+        worker_data = ForkingPickler.loads(ForkingPickler.dumps(batch_data))
+        assert worker_data.shared_arrays is None
+        np.testing.assert_array_equal(worker_data.user_indices, batch_data.user_indices)
+        np.testing.assert_array_equal(
+            worker_data.seq_positions, batch_data.seq_positions
+        )
+    tf.reset_default_graph()
+
+    with pytest.raises(ValueError, match="`shuffle` must be bool or `block`"):
+        get_batch_loader(model, train_data, True, 4, "all", 0, 42)
@@ -11,11 +11,14 @@ from libreco.data import (
     DataInfo,
     DatasetFeat,
     DatasetPure,
+    DtypePolicy,
+    StreamingProcessor,
     TransformedEvalSet,
     TransformedSet,
     process_data,
+    split_multi_value,
 )
-from libreco.data.data_info import OldInfo, store_old_info
+from libreco.data.data_info import OldInfo, _insert_before_oov, store_old_info
 
 sparse_col = ["sex", "occupation", "genre1", "genre2", "genre3"]
 dense_col = ["age"]
@@ -206,3 +209,191 @@ def test_transformed_evalset():
     assert np.sort(data5.positive_consumed[1]).tolist() == [1, 2, 8]
     assert data5.positive_consumed[2] == [3]
     assert data5.positive_consumed[4] == [6]
+
+
+def test_transformed_evalset_sampling_mode():
+    np_rng = np.random.default_rng(42)
+    user_indices = np_rng.integers(0, 20, 200)
+    item_indices = np_rng.integers(0, 50, 200)
+    labels = np.ones(200)
+    user_consumed = {u: set() for u in user_indices.tolist()}
+    for u, i in zip(user_indices.tolist(), item_indices.tolist()):
+        user_consumed[u].add(i)
+
+    for vectorized in (True, False):
+        data1 = TransformedEvalSet(user_indices, item_indices, labels)
+        data1.build_negatives(50, num_neg=3, seed=2222, vectorized=vectorized)
+        data2 = TransformedEvalSet(user_indices, item_indices, labels)
+        data2.build_negatives(50, num_neg=3, seed=2222, vectorized=vectorized)
+        assert_array_equal(data1.item_indices, data2.item_indices)
+        assert_array_equal(data1.labels[::4], np.ones(200))
+        assert_array_equal(data1.item_indices[::4], item_indices)
+        for u, i, lb in zip(data1.user_indices, data1.item_indices, data1.labels):
+            if lb == 0:
+                assert i not in user_consumed[u]
+
+    item_weights = np.zeros(50)
+    item_weights[25:] = np.arange(1, 26)
+    data3 = TransformedEvalSet(user_indices, item_indices, labels)
+    data3.build_negatives(50, num_neg=3, seed=2222, item_weights=item_weights)
+    assert np.all(data3.item_indices[data3.labels == 0] >= 25)
+
+
+def test_dtype_policy():
+    with pytest.raises(ValueError):
+        DatasetPure.build_trainset(pd_data, dtype_policy="unknown")
+    with pytest.raises(ValueError):
+        DtypePolicy(index="int8")
+    with pytest.raises(ValueError):
+        DtypePolicy(dense="float64")
+
+    data, data_info = DatasetPure.build_trainset(pd_data, dtype_policy="compact")
+    assert data.user_indices.dtype == np.int32
+    assert data.item_indices.dtype == np.int32
+    assert data.labels.dtype == np.float32
+    assert data_info.dtype_report.bytes_saved > 0
+
+    policy = DtypePolicy(index="auto", dense="float16")
+    data, data_info = DatasetFeat.build_trainset(
+        pd_data, user_col, item_col, sparse_col, dense_col, dtype_policy=policy
+    )
+    assert data.user_indices.dtype == np.uint16
+    assert data.item_indices.dtype == np.uint16
+    assert data.sparse_indices.dtype == np.uint16
+    assert data.dense_values.dtype == np.float16
+    assert data_info.user_sparse_unique.dtype == np.uint16
+    assert data_info.item_sparse_unique.dtype == np.uint16
+    assert data_info.user_dense_unique.dtype == np.float16
+    # oov row
+    assert len(data_info.user_sparse_unique) == data_info.n_users + 1
+    assert data_info.dtype_report.bytes_saved > 0
+
+    data_info.save(os.path.curdir, "dtype")
+    data_info2 = DataInfo.load(os.path.curdir, "dtype")
+    for suffix in (
+        "data_info.npz",
+        "data_info_name_mapping.json",
+        "user_consumed.pkl",
+        "item_consumed.pkl",
+    ):
+        os.remove(os.path.join(os.path.curdir, f"dtype_{suffix}"))
+    assert data_info2.user_sparse_unique.dtype == np.uint16
+    assert data_info2.user_dense_unique.dtype == np.float16
+    assert_array_equal(data_info2.item_sparse_unique, data_info.item_sparse_unique)
+
+
+@pytest.mark.parametrize("merge_policy", [None, DtypePolicy(index="auto")])
+def test_dtype_policy_merge_large_vocab(merge_policy):
+    policy = DtypePolicy(index="auto")
+    _, data_info = DatasetFeat.build_trainset(
+        pd_data, user_col, item_col, sparse_col, dense_col, dtype_policy=policy
+    )
+    assert data_info.user_sparse_unique.dtype == np.uint16
+    # new occupations push the sparse vocabulary past the range of uint16
+    n_new = np.iinfo(np.uint16).max + 10
+    new_data = pd_data.sample(n_new, replace=True, random_state=42).assign(
+        user=np.arange(n_new) + 10000, occupation=np.arange(n_new) + 100
+    )
+    _, new_data_info = DatasetFeat.merge_trainset(
+        new_data, data_info, merge_behavior=True, dtype_policy=merge_policy
+    )
+    sparse_oov = new_data_info.sparse_oov
+    assert np.max(sparse_oov) > np.iinfo(np.uint16).max
+    new_data_info.add_users([-1])
+    new_data_info.add_items([-1])
+    user_oov = sparse_oov[new_data_info.user_sparse_col.index]
+    item_oov = sparse_oov[new_data_info.item_sparse_col.index]
+    # the last two rows are the added user/item and oov
+    assert_array_equal(new_data_info.user_sparse_unique[-2:], [user_oov, user_oov])
+    assert_array_equal(new_data_info.item_sparse_unique[-2:], [item_oov, item_oov])
+    assert np.max(new_data_info.user_sparse_unique) == np.max(user_oov)
+
+    # compact matrices are widened instead of wrapping the oov values
+    uint16_uniques = np.zeros((2, 1), dtype=np.uint16)
+    inserted = _insert_before_oov(
+        uint16_uniques, 1, sparse_oov, [np.argmax(sparse_oov)]
+    )
+    assert inserted[1, 0] == np.max(sparse_oov)
+
+
+@pytest.mark.parametrize("dtype_policy", ["compact", DtypePolicy(index="auto")])
+def test_dtype_policy_model_outputs(make_synthetic_data, dtype_policy):
+    import tensorflow as tf
+
+    from libreco.algorithms import DeepFM
+
+    tf.compat.v1.reset_default_graph()
+
+    def fit_predict(policy):
+        tf.compat.v1.reset_default_graph()
+        train_data, data_info = DatasetFeat.build_trainset(
+            make_synthetic_data,
+            user_col=["sex", "age", "occupation"],
+            item_col=["genre1", "genre2", "genre3", "profit"],
+            sparse_col=["sex", "occupation", "genre1", "genre2", "genre3"],
+            dense_col=["age", "profit"],
+            dtype_policy=policy,
+        )
+        model = DeepFM("rating", data_info, embed_size=4, n_epochs=2, seed=42)
+        model.fit(train_data, neg_sampling=False, verbose=0)
+        return model.predict(
+            make_synthetic_data.user.tolist(), make_synthetic_data.item.tolist()
+        )
+
+    np.testing.assert_array_equal(fit_predict(None), fit_predict(dtype_policy))
+    tf.compat.v1.reset_default_graph()
+
+
+@pytest.mark.parametrize("normalizer", ["min_max", "standard"])
+def test_streaming_processor(normalizer):
+    with pytest.raises(ValueError):
+        StreamingProcessor(dense_col=["age"], normalizer="robust")
+    with pytest.raises(ValueError):
+        StreamingProcessor(multi_value_col=["genre"])
+
+    data = pd_data.copy()
+    data["genre"] = data["genre1"] + " | " + data["genre2"] + "|"
+    data.loc[0, "genre"] = data.loc[0, "genre"] + "|comedy"
+    data = data.drop(columns=["genre1", "genre2", "genre3"])
+    processor = StreamingProcessor(
+        dense_col=["age", "time"],
+        normalizer=normalizer,
+        multi_value_col=["genre"],
+        sep="|",
+        item_col=["genre"],
+    )
+    with pytest.raises(RuntimeError):
+        processor.transform(data.copy())
+
+    chunks = [data.iloc[i : i + 3].copy() for i in range(0, len(data), 3)]
+    processor.fit(chunks)
+    transformed = pd.concat(processor.transform_chunks(chunks))
+
+    expected, dense_col_transformed = process_data(
+        data.copy(), dense_col=["age", "time"], normalizer=normalizer
+    )
+    expected, multi_sparse_col, _, item_sparse_col = split_multi_value(
+        expected, ["genre"], sep="|", item_col=["genre"]
+    )
+    assert processor.dense_col_transformed == dense_col_transformed
+    assert processor.multi_sparse_col == multi_sparse_col
+    assert processor.item_sparse_col == item_sparse_col
+    assert len(item_sparse_col) == 4
+    assert processor.user_sparse_col == []
+    np.testing.assert_allclose(
+        transformed[dense_col_transformed].to_numpy(dtype=np.float64),
+        expected[dense_col_transformed].to_numpy(dtype=np.float64),
+        rtol=1e-5,
+        atol=1e-6,
+    )
+    assert_array_equal(transformed[item_sparse_col], expected[item_sparse_col])
+
+    processor.save(os.path.curdir, "test")
+    processor2 = StreamingProcessor.load(os.path.curdir, "test")
+    os.remove(os.path.join(os.path.curdir, "test_processor.json"))
+    os.remove(os.path.join(os.path.curdir, "test_processor.npz"))
+    transformed2 = processor2.transform(data.copy())
+    assert processor2.dense_col_transformed == dense_col_transformed
+    pd.testing.assert_frame_equal(
+        transformed2.reset_index(drop=True), transformed.reset_index(drop=True)
+    )
@@ -546,8 +546,17 @@ def test_assign_features(feature_data_pair):
     assert "sex" not in new_df
 
     new_df.loc[1, "actor1"] = 77
-    data_info.assign_user_features(new_df)
-    data_info.assign_item_features(new_df)
+    old_user_sparse = data_info.user_sparse_unique.copy()
+    old_item_sparse = data_info.item_sparse_unique.copy()
+    changed_users = data_info.assign_user_features(new_df)
+    changed_items = data_info.assign_item_features(new_df)
+    user_diff = np.any(old_user_sparse != data_info.user_sparse_unique, axis=1)
+    item_diff = np.any(old_item_sparse != data_info.item_sparse_unique, axis=1)
+    assert len(changed_users) > 0 and len(changed_items) > 0
+    assert_array_equal(changed_users, np.flatnonzero(user_diff))
+    assert_array_equal(changed_items, np.flatnonzero(item_diff))
+    assert len(data_info.assign_user_features(new_df)) == 0
+    assert len(data_info.assign_item_features(new_df)) == 0
     assert_array_equal(
         data_info.user_sparse_unique,
         np.array(
@@ -572,6 +581,28 @@ def test_assign_features(feature_data_pair):
     )
 
 
+def test_add_users_items(feature_data_pair):
+    _, _, data_info, _ = feature_data_pair
+    old_user_sparse = data_info.user_sparse_unique.copy()
+    old_user_dense = data_info.user_dense_unique.copy()
+    old_item_sparse = data_info.item_sparse_unique.copy()
+    assert_array_equal(data_info.add_users([4, 20, 21, 20]), [3, 4])
+    assert data_info.n_users == 5
+    assert data_info.user2id[21] == 4
+    assert data_info.user_consumed[3] == []
+    assert_array_equal(data_info.user_sparse_unique[:3], old_user_sparse[:-1])
+    assert_array_equal(
+        data_info.user_sparse_unique[3:], np.repeat(old_user_sparse[-1:], 3, 0)
+    )
+    assert_array_equal(data_info.user_dense_unique[3:5], np.zeros((2, 1)))
+    assert_array_equal(data_info.user_dense_unique[-1], old_user_dense[-1])
+    assert len(data_info.add_users([1, 20])) == 0
+
+    assert_array_equal(data_info.add_items([30]), [3])
+    assert data_info.id2item[3] == 30
+    assert data_info.item_sparse_unique.shape == (5, old_item_sparse.shape[1])
+
+
 def test_get_features_from_data_info(feature_data_pair):
     _, _, data_info, _ = feature_data_pair
     _, _, sparse_indices, dense_values = get_original_feats(
@@ -2,6 +2,7 @@ import time
 
 import pytest
 
+from libreco.training.prefetch import prefetch
 from libreco.utils.misc import colorize, time_block, time_func
 
 
@@ -18,3 +19,21 @@ def test_misc():
     with pytest.raises(RuntimeError):
         with time_block("long work2", verbose=0):
             raise RuntimeError
+
+
+@pytest.mark.parametrize("num_batches", [0, 1, 3])
+def test_prefetch(num_batches):
+    batches = list(prefetch(range(10), num_batches, lambda x: x * 2))
+    assert batches == list(range(0, 20, 2))
+
+    def failing_batches():
+        yield 1
+        raise ValueError("broken batch")
+
+    with pytest.raises(ValueError, match="broken batch"):
+        list(prefetch(failing_batches(), num_batches))
+
+    # stop consuming early, the producer thread should exit
+    feeds = prefetch(iter(range(1000)), num_batches)
+    assert next(feeds) == 0
+    feeds.close()
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+import tensorflow as tf
+
+from libreco.algorithms import (
+    ALS,
+    DIN,
+    NGCF,
+    DeepFM,
+    GraphSage,
+    RNN4Rec,
+    TwoTower,
+    YouTubeRetrieval,
+)
+from libreco.bases import EmbedBase
+from libreco.data import DatasetFeat
+from tests.utils_pred import ptest_preds
+from tests.utils_reco import ptest_recommends
+
+
+@pytest.mark.parametrize("model_cls", [DeepFM, DIN, TwoTower, RNN4Rec, NGCF, GraphSage])
+def test_partial_fit(prepare_feat_data, model_cls):
+    tf.compat.v1.reset_default_graph()
+    pd_data, train_data, _, data_info = prepare_feat_data
+    model = model_cls("ranking", data_info, embed_size=8, n_epochs=1, batch_size=256)
+    with pytest.raises(RuntimeError, match="before `partial_fit`"):
+        model.partial_fit(pd_data[:10], neg_sampling=True)
+
+    model.fit(train_data, neg_sampling=True, verbose=0)
+    with pytest.raises(ValueError, match="misses columns"):
+        model.partial_fit(pd_data[["user", "item"]], neg_sampling=True)
+    unknown_data = pd.DataFrame(
+        {"user": [-1, pd_data.user[0]], "item": [pd_data.item[0], -1], "label": 1}
+    )
+    assert model.partial_fit(unknown_data, neg_sampling=True) is None
+
+    batch = pd_data[-500:]
+    user, item = batch.user.iloc[0], batch.item.iloc[0]
+    old_pred = model.predict(user, item)
+    loss = model.partial_fit(batch, neg_sampling=True, max_steps=1)
+    assert np.isfinite(loss)
+    if isinstance(model, EmbedBase):
+        # embeddings are refreshed on the next prediction
+        assert model.embeds_stale
+    assert model.predict(user, item) != old_pred
+    if isinstance(model, EmbedBase):
+        assert not model.embeds_stale
+
+    for i in range(0, len(batch), 100):
+        model.partial_fit(batch[i : i + 100], neg_sampling=True)
+    assert np.isfinite(partial_fit_unseen(model, pd_data))
+    ptest_preds(model, "ranking", pd_data, with_feats=False)
+    ptest_recommends(model, data_info, pd_data, with_feats=False)
+    tf.compat.v1.reset_default_graph()
+
+
+def test_partial_fit_youtube_retrieval(read_feat_data):
+    tf.compat.v1.reset_default_graph()
+    pd_data, (train_data, _) = read_feat_data
+    train_data, data_info = DatasetFeat.build_trainset(
+        train_data=train_data,
+        sparse_col=["sex", "occupation"],
+        dense_col=["age"],
+        user_col=["sex", "age", "occupation"],
+        item_col=[],
+    )
+    model = YouTubeRetrieval(
+        "ranking", data_info, embed_size=8, n_epochs=1, num_sampled_per_batch=10
+    )
+    model.fit(train_data, neg_sampling=True, verbose=0)
+    # new clicks that are not in the consumed sequences of users
+    assert np.isfinite(partial_fit_unseen(model, pd_data))
+    known_data = pd_data[-500:]
+    known_data = known_data[known_data.user.isin(data_info.user2id)]
+    assert np.isfinite(model.partial_fit(known_data, neg_sampling=True))
+    ptest_preds(model, "ranking", pd_data, with_feats=False)
+    ptest_recommends(model, data_info, pd_data, with_feats=False)
+    tf.compat.v1.reset_default_graph()
+
+
+def partial_fit_unseen(model, pd_data):
+    """Train on a click of a known user on a known item the user hasn't consumed."""
+    data_info = model.data_info
+    user = pd_data.user[0]
+    consumed = set(data_info.user_consumed[data_info.user2id[user]])
+    item = next(i for i in data_info.item2id if data_info.item2id[i] not in consumed)
+    unseen_data = pd.DataFrame({"user": [user], "item": [item], "label": [1]})
+    return model.partial_fit(unseen_data, neg_sampling=True)
+
+
+def test_partial_fit_unsupported(prepare_feat_data):
+    pd_data, train_data, _, data_info = prepare_feat_data
+    model = ALS("ranking", data_info, embed_size=8, n_epochs=1, reg=0.1)
+    model.fit(train_data, neg_sampling=True, verbose=0)
+    with pytest.raises(ValueError, match="doesn't support `partial_fit`"):
+        model.partial_fit(pd_data[:10], neg_sampling=True)
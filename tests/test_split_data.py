@@ -1,6 +1,8 @@
 from io import StringIO
 
+import numpy as np
 import pandas as pd
+import pytest
 
 from libreco.data import (
     random_split,
@@ -106,3 +108,61 @@ def test_split_by_num_chrono():
     train_data, eval_data = split_by_num_chrono(pd_data, test_size=1)
     assert len(train_data) == 11
     assert len(eval_data) == 1
+
+
+def _loop_split_indices(users, order, ratios=None, test_size=None):
+    """Per-user split used in previous versions, served as the reference."""
+    sort_kind = "mergesort" if order else "quicksort"
+    _, user_position, user_counts = np.unique(
+        users, return_inverse=True, return_counts=True
+    )
+    user_split_indices = np.split(
+        np.argsort(user_position, kind=sort_kind), np.cumsum(user_counts)[:-1]
+    )
+    n_splits = len(ratios) if ratios else 2
+    split_indices_all = [[] for _ in range(n_splits)]
+    for u_data in user_split_indices:
+        u_data_len = len(u_data)
+        if u_data_len <= 3:
+            split_indices_all[0].extend(u_data)
+        elif ratios:
+            cum_ratios = np.cumsum(ratios).tolist()[:-1]
+            u_split_data = np.split(
+                u_data, [round(cum * u_data_len) for cum in cum_ratios]
+            )
+            for i in range(n_splits):
+                split_indices_all[i].extend(u_split_data[i])
+        else:
+            k = 1 if u_data_len <= test_size else test_size
+            split_indices_all[0].extend(u_data[:-k])
+            split_indices_all[1].extend(u_data[-k:])
+    return split_indices_all
+
+
+@pytest.mark.parametrize("order", [True, False])
+def test_vectorized_split_consistency(order):
+    np_rng = np.random.default_rng(42)
+    users = np_rng.integers(0, 300, 5000)
+    data = pd.DataFrame({"user": users, "item": np_rng.integers(0, 50, 5000)})
+    for ratios in ([0.8, 0.2], [0.7, 0.1, 0.2], [0.5, 0.5]):
+        expected = _loop_split_indices(users, order, ratios=ratios)
+        split_data = split_by_ratio(
+            data, order=order, multi_ratios=ratios, filter_unknown=False
+        )
+        for idx, d in zip(expected, split_data):
+            np.testing.assert_array_equal(d.index, idx)
+
+        split_data = split_by_ratio(
+            data, order=order, multi_ratios=ratios, shuffle=True, filter_unknown=False
+        )
+        np_rng = np.random.default_rng(42)
+        for idx, d in zip(expected, split_data):
+            np.testing.assert_array_equal(d.index, np_rng.permutation(idx))
+
+    for test_size in (1, 3, 20):
+        expected = _loop_split_indices(users, order, test_size=test_size)
+        split_data = split_by_num(
+            data, order=order, test_size=test_size, filter_unknown=False
+        )
+        for idx, d in zip(expected, split_data):
+            np.testing.assert_array_equal(d.index, idx)
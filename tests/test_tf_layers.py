@@ -16,6 +16,13 @@ from libreco.layers import (
     tf_rnn,
 )
 from libreco.layers.activation import gelu, swish
+from libreco.layers.compression import (
+    HASH_PARAMS,
+    HASH_PRIME,
+    build_compressed_table,
+    compressed_embedding_lookup,
+    compressed_row_mapping,
+)
 from libreco.layers.transformer import (
     positional_encoding,
     transformer_decoder_layer,
@@ -254,3 +261,49 @@ def test_config():
 
     with pytest.raises(ValueError):
         dropout_config(1.1)
+
+
+def test_compressed_embedding_lookup():
+    table = build_compressed_table(
+        [3, 10, 7],
+        [
+            None,
+            {"method": "hash", "num_buckets": 4, "num_hashes": 3},
+            {"method": "qr", "num_buckets": 3},
+        ],
+    )
+    assert table.n_rows == 3 + 4 + 3 + 3
+    weights = np.random.default_rng(42).normal(size=(table.n_rows, 2))
+    weights = weights.astype(np.float32)
+
+    def expected_embed(i):
+        if i < 3:
+            return weights[i]
+        elif i < 13:
+            a, b = HASH_PARAMS
+            rows = (a[:3] * (i - 3) + b[:3]) % HASH_PRIME % 4
+            return weights[3 + rows].sum(axis=0)
+        q, r = divmod(i - 13, 3)
+        return weights[7 + r] * weights[10 + q]
+
+    indices = np.arange(20).reshape(4, 5)
+    with tf.Session() as sess:
+        embeds = compressed_embedding_lookup(tf.constant(weights), indices, table)
+        linear = compressed_embedding_lookup(tf.constant(weights[:, 0]), indices, table)
+        embeds, linear = sess.run([embeds, linear])
+    expected = np.array([[expected_embed(i) for i in row] for row in indices])
+    assert_allclose(embeds, expected, rtol=1e-5)
+    assert linear.shape == (4, 5)
+
+    # new indices are appended to each block
+    new_table = build_compressed_table(
+        [5, 12, 10],
+        [
+            None,
+            {"method": "hash", "num_buckets": 4, "num_hashes": 3},
+            {"method": "qr", "num_buckets": 3},
+        ],
+    )
+    old_rows, new_rows = compressed_row_mapping(table, new_table)
+    assert_array_equal(old_rows, [0, 1, *range(3, 13)])
+    assert_array_equal(new_rows, [0, 1, *range(5, 15)])